@@ -0,0 +1,4 @@
+"""
+Benchmarks for the Half-Life VOX TimeLEFT application.
+Each module runs standalone, e.g. python -m benchmarks.track_event
+"""
@@ -0,0 +1,93 @@
+"""
+Benchmark for EventBus dispatch.
+
+Measures what publish() costs the timer thread with a growing number of
+subscribers, and shows that a subscriber much slower than the publish rate
+only loses its own oldest events while publish latency stays flat.
+
+Usage:
+    python -m benchmarks.event_bus [--events N] [--slow-ms MS]
+"""
+
+import argparse
+import statistics
+import time
+
+from libs.event_bus import DELIVERY_AUDIO, DELIVERY_RENDER, TICK, EventBus, TimerEvent
+
+
+def _publish_us(bus: EventBus, events: int) -> float:
+    """Publish events ticks and return the mean microseconds per publish."""
+    started = time.perf_counter()
+    for i in range(events):
+        bus.publish(TimerEvent(TICK, i, "00:00:00", time.monotonic()))
+    return (time.perf_counter() - started) * 1e6 / events
+
+
+def run(events: int = 20000, slow_ms: float = 50.0) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        events: Events published per measurement
+        slow_ms: Handler time of the slow subscriber
+
+    Returns:
+        Dictionary with publish cost per subscriber count and the slow
+        subscriber scenario
+    """
+    publish_us = {}
+    for subscribers in (0, 1, 3, 8):
+        bus = EventBus()
+        for i in range(subscribers):
+            bus.subscribe((TICK,), lambda event: None, delivery=DELIVERY_RENDER, name=f"sub{i}")
+        publish_us[subscribers] = statistics.median(_publish_us(bus, events) for _ in range(5))
+        bus.pump(DELIVERY_RENDER)
+        bus.shutdown()
+
+    # A worker subscriber far slower than the publish rate
+    bus = EventBus()
+    bus.subscribe((TICK,), lambda event: time.sleep(slow_ms / 1000),
+                  delivery=DELIVERY_AUDIO, capacity=8, name="slow")
+    bus.subscribe((TICK,), lambda event: None, delivery=DELIVERY_RENDER, name="render")
+    gaps = []
+    for i in range(200):
+        started = time.perf_counter()
+        bus.publish(TimerEvent(TICK, i, "00:00:00", time.monotonic()))
+        gaps.append((time.perf_counter() - started) * 1e6)
+        bus.pump(DELIVERY_RENDER)
+        time.sleep(0.001)
+    stats = bus.get_stats()
+    bus.shutdown()
+
+    gaps.sort()
+    return {
+        "publish_us": publish_us,
+        "slow_publish_p99_us": gaps[int(len(gaps) * 0.99) - 1],
+        "slow_publish_max_us": gaps[-1],
+        "slow_delivered": stats["subscribers"]["slow"]["delivered"],
+        "slow_overwritten": stats["subscribers"]["slow"]["overwritten"],
+        "render_delivered": stats["subscribers"]["render"]["delivered"],
+    }
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000, help="events per measurement")
+    parser.add_argument("--slow-ms", type=float, default=50.0, help="slow handler time")
+    args = parser.parse_args(argv)
+
+    result = run(args.events, args.slow_ms)
+    for subscribers, us in result["publish_us"].items():
+        print(f"publish with {subscribers} subscriber(s): {us:.2f} us")
+    print(f"with a {args.slow_ms:.0f} ms subscriber: publish p99 "
+          f"{result['slow_publish_p99_us']:.1f} us, max {result['slow_publish_max_us']:.1f} us")
+    print(f"  slow subscriber: {result['slow_delivered']} delivered, "
+          f"{result['slow_overwritten']} overwritten; "
+          f"render subscriber: {result['render_delivered']} delivered")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,297 @@
+"""
+Load generator for ClickstreamTracker.
+
+Several producer threads replay a realistic click mix through track_event
+while the worker spools and the uploader inserts into a FakeSink with
+injected latency and failures. Reports sustained throughput, enqueue
+latency percentiles, memory growth, idle cost of the worker loop and the
+time shutdown takes to flush.
+
+Usage:
+    python -m benchmarks.load_generator [--producers N] [--duration S]
+        [--rate EPS] [--latency S] [--failure-rate P] [--json]
+        [--min-throughput EPS] [--max-p99-us US]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from libs.clickstream_sinks import FakeSink
+from libs.clickstream_tracker import ClickstreamTracker
+from libs.config import Config
+from libs.event_sampler import EventSampler
+from libs.tracker_metrics import Histogram
+
+# (weight, event_type, component, metadata) in the proportions of a real session
+CLICK_MIX = [
+    (60, "button_click", "shoot_gun_button", [{"weapon": "glock18"}, {"weapon": "mp5"}]),
+    (8, "weapon_select", "weapon_dropdown", [{"weapon": "mp5"}, {"weapon": "shotgun"}]),
+    (8, "background_select", "background_dropdown", [{"background": "c1a0"}, {"background": "c2a5"}]),
+    (6, "panorama_toggle", "panorama_checkbox", [{"enabled": True}, {"enabled": False}]),
+    (6, "button_click", "timeleft_button", [{"remaining_time": 754}]),
+    (5, "button_click", "pause_button", [{"is_paused": True}, {"is_paused": False}]),
+    (4, "button_click", "start_button", [{"time_input": "00:25:00"}]),
+    (3, "button_click", "reset_button", [None]),
+]
+
+# Latency histogram bounds in microseconds
+LATENCY_BOUNDS_US = [m * 10 ** e for e in range(-1, 6) for m in (1, 1.5, 2, 3, 5, 7)]
+
+
+def click_sequence(length: int, seed: int) -> List[tuple]:
+    """
+    Build a random sequence of events drawn from CLICK_MIX.
+
+    Args:
+        length: Number of events
+        seed: Random seed
+
+    Returns:
+        List of (event_type, component, metadata)
+    """
+    rng = random.Random(seed)
+    weights = [entry[0] for entry in CLICK_MIX]
+    picks = rng.choices(CLICK_MIX, weights=weights, k=length)
+    return [(event_type, component, rng.choice(metadata))
+            for _, event_type, component, metadata in picks]
+
+
+def rss_bytes() -> int:
+    """Get the current resident set size (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _producer(tracker: ClickstreamTracker, sequence: List[tuple], rate: float,
+              stop: threading.Event, latency: Histogram, counts: List[int], index: int):
+    """Replay sequence until stopped, timing every track_event call."""
+    track_event = tracker.track_event
+    observe = latency.observe
+    clock = time.perf_counter_ns
+    interval = 1.0 / rate if rate > 0 else 0.0
+    next_at = time.perf_counter()
+    sent = 0
+
+    while not stop.is_set():
+        for event_type, component, metadata in sequence:
+            started = clock()
+            track_event(event_type, component, metadata)
+            observe((clock() - started) / 1000)
+            sent += 1
+            if interval:
+                next_at += interval
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if sent % 256 == 0 and stop.is_set():
+                break
+    counts[index] = sent
+
+
+def _merge(histograms: List[Histogram]) -> Histogram:
+    merged = Histogram(LATENCY_BOUNDS_US)
+    for histogram in histograms:
+        merged.buckets = [a + b for a, b in zip(merged.buckets, histogram.buckets)]
+        merged.count += histogram.count
+        merged.total += histogram.total
+        merged.max = max(merged.max, histogram.max)
+    return merged
+
+
+def _idle_cpu_ms(seconds: float) -> float:
+    """CPU milliseconds per second used by an idle tracker's threads."""
+    with tempfile.TemporaryDirectory() as spool_dir:
+        tracker = ClickstreamTracker(spool_dir=spool_dir, sink=FakeSink(keep_rows=False))
+        tracker.spool_ready.wait()
+        before = time.process_time()
+        time.sleep(seconds)
+        used = time.process_time() - before
+        tracker.shutdown()
+    return used * 1000 / seconds
+
+
+def run(
+    producers: int = 4,
+    duration: float = 10.0,
+    rate: float = 0.0,
+    latency: float = 0.05,
+    failure_rate: float = 0.0,
+    sampling: bool = False,
+    idle: float = 2.0,
+    seed: int = 1
+) -> dict:
+    """
+    Run the load test.
+
+    Args:
+        producers: Producer threads
+        duration: Seconds to generate load
+        rate: Events per second per producer (0 = as fast as possible)
+        latency: Seconds each sink insert takes
+        failure_rate: Probability that an insert fails
+        sampling: Apply the configured sampling policies (off measures the
+            raw pipeline; on, most shoot events are collapsed)
+        idle: Seconds to measure the idle worker loop (0 = skip)
+        seed: Random seed for the click mix and failures
+
+    Returns:
+        Dictionary of results
+    """
+    idle_cpu = _idle_cpu_ms(idle) if idle > 0 else None
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        sink = FakeSink(latency=latency, failure_rate=failure_rate, seed=seed, keep_rows=False)
+        tracker = ClickstreamTracker(spool_dir=spool_dir, sink=sink)
+        if not sampling:
+            tracker.sampler = EventSampler(tracker.session_id, policies={})
+        tracker.spool_ready.wait()
+
+        stop = threading.Event()
+        histograms = [Histogram(LATENCY_BOUNDS_US) for _ in range(producers)]
+        counts = [0] * producers
+        threads = [
+            threading.Thread(
+                target=_producer,
+                args=(tracker, click_sequence(4096, seed + i), rate, stop, histograms[i], counts, i),
+                name=f"load-producer-{i}",
+                daemon=True
+            )
+            for i in range(producers)
+        ]
+
+        rss_start = rss_bytes()
+        rss_samples = []
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        while time.perf_counter() - started < duration:
+            time.sleep(min(0.25, duration))
+            rss_samples.append(rss_bytes())
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        delivered_during_run = sink.delivered
+        spooled_during_run = tracker._spooled_total
+        stats = tracker.get_stats()
+
+        shutdown_started = time.perf_counter()
+        tracker.shutdown()
+        shutdown_seconds = time.perf_counter() - shutdown_started
+        left_spooled = tracker.spool.pending_count() if tracker.spool else 0
+        shutdown_dropped = tracker.get_stats()["shutdown_dropped"]
+
+    enqueue = _merge(histograms)
+    generated = sum(counts)
+    dropped = sum(stats["dropped"].values()) + stats["spool_dropped"]
+    half = rss_samples[len(rss_samples) // 2:] or [rss_start]
+    return {
+        "producers": producers,
+        "duration_s": elapsed,
+        "generated": generated,
+        "generated_per_s": generated / elapsed,
+        "spooled_per_s": spooled_during_run / elapsed,
+        "delivered_during_run": delivered_during_run,
+        "delivered_per_s": delivered_during_run / elapsed,
+        "delivered_total": sink.delivered,
+        "dropped": dropped,
+        "spilled": stats["spilled"],
+        "left_spooled": left_spooled,
+        "shutdown_dropped": shutdown_dropped,
+        "inserts": len(sink.calls),
+        "failed_inserts": sum(1 for _, _, ok in sink.calls if not ok),
+        "enqueue_us": enqueue.snapshot(),
+        "rss_start_mib": rss_start / 2 ** 20,
+        "rss_peak_mib": max(rss_samples or [rss_start]) / 2 ** 20,
+        "rss_growth_mib": (max(rss_samples or [rss_start]) - rss_start) / 2 ** 20,
+        "rss_second_half_growth_mib": (half[-1] - half[0]) / 2 ** 20,
+        "shutdown_s": shutdown_seconds,
+        "idle_cpu_ms_per_s": idle_cpu,
+    }
+
+
+def print_report(result: dict):
+    """Print results as text."""
+    enqueue = result["enqueue_us"]
+    print(f"Producers:          {result['producers']} for {result['duration_s']:.1f} s "
+          f"(queue capacity {Config.CLICKSTREAM_QUEUE_CAPACITY}, "
+          f"overflow policy {Config.CLICKSTREAM_OVERFLOW_POLICY})")
+    print(f"Generated:          {result['generated']} events ({result['generated_per_s']:,.0f}/s)")
+    print(f"Spooled by worker:  {result['spooled_per_s']:,.0f}/s")
+    print(f"Delivered:          {result['delivered_during_run']} during run "
+          f"({result['delivered_per_s']:,.0f}/s), {result['delivered_total']} after shutdown")
+    print(f"Inserts:            {result['inserts']} ({result['failed_inserts']} failed)")
+    print(f"Spilled / dropped:  {result['spilled']} / {result['dropped']}, "
+          f"{result['left_spooled']} left spooled")
+    print(f"Enqueue latency:    p50 {enqueue['p50']:.1f} us  p99 {enqueue['p99']:.1f} us  "
+          f"max {enqueue['max']:.0f} us")
+    print(f"Memory (RSS):       {result['rss_start_mib']:.1f} MiB at start, "
+          f"+{result['rss_growth_mib']:.1f} MiB peak, "
+          f"{result['rss_second_half_growth_mib']:+.1f} MiB over the second half")
+    print(f"Shutdown flush:     {result['shutdown_s'] * 1000:.0f} ms "
+          f"({result['shutdown_dropped']} events dropped)")
+    if result["idle_cpu_ms_per_s"] is not None:
+        print(f"Idle worker loop:   {result['idle_cpu_ms_per_s']:.2f} ms CPU per second")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--producers", type=int, default=4, help="producer threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="events per second per producer (0 = unthrottled)")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per sink insert")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="probability that an insert fails")
+    parser.add_argument("--sampling", action="store_true",
+                        help="apply CLICKSTREAM_EVENT_POLICIES")
+    parser.add_argument("--idle", type=float, default=2.0,
+                        help="seconds to measure the idle worker loop (0 = skip)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--min-throughput", type=float, default=0.0,
+                        help="fail if fewer events per second are generated")
+    parser.add_argument("--max-p99-us", type=float, default=0.0,
+                        help="fail if p99 enqueue latency is higher")
+    args = parser.parse_args(argv)
+
+    # The tracker's own messages would corrupt JSON output
+    with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+        result = run(args.producers, args.duration, args.rate, args.latency,
+                     args.failure_rate, args.sampling, args.idle, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+    failures = []
+    if args.min_throughput and result["generated_per_s"] < args.min_throughput:
+        failures.append(f"throughput {result['generated_per_s']:,.0f}/s < {args.min_throughput:,.0f}/s")
+    if args.max_p99_us and result["enqueue_us"]["p99"] > args.max_p99_us:
+        failures.append(f"p99 enqueue {result['enqueue_us']['p99']:.1f} us > {args.max_p99_us} us")
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
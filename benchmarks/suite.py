@@ -0,0 +1,338 @@
+"""
+Benchmark suite for the application's hot paths.
+
+Runs headless (dummy SDL audio driver, no viewport) and measures:
+
+- time_to_words: AudioManager.time_to_words per announcement
+- sound: pygame.mixer.Sound construction per sound directory
+- assets: AssetManager construction and directory lookups
+- load_image: dpg.load_image per background texture
+- timer: Timer tick accuracy and CPU use while counting down
+- track_event: ClickstreamTracker.track_event throughput
+
+Results can be saved as a JSON baseline and later compared against it;
+compare mode exits with status 1 when a metric is worse than the baseline
+by more than the threshold.
+
+Usage:
+    python -m benchmarks.suite [--only NAME ...] [--quick] [--save PATH]
+        [--compare PATH] [--threshold FRACTION] [--json]
+"""
+
+import os
+
+# Must be set before pygame initializes SDL
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import contextlib
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from libs.asset_manager import AssetManager
+from libs.config import Config
+from libs.version import get_version
+
+# Which direction is better, per metric unit
+LOWER_IS_BETTER = "lower"
+HIGHER_IS_BETTER = "higher"
+
+SAMPLE_TIMES = ["00:25:00", "01:00:00", "00:00:05", "12:34:56", "00:59:59", "10:10:10"]
+
+
+def _metric(value: float, unit: str, better: str = LOWER_IS_BETTER) -> dict:
+    return {"value": value, "unit": unit, "better": better}
+
+
+def _median_us(func: Callable, calls: int, rounds: int) -> float:
+    """Run func calls times per round and return the median microseconds per call."""
+    per_round = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        per_round.append((time.perf_counter() - started) * 1e6 / calls)
+    return statistics.median(per_round)
+
+
+def bench_time_to_words(quick: bool) -> dict:
+    """Measure converting HH:MM:SS strings to VOX words."""
+    from libs.audio_manager import AudioManager
+
+    times = iter(SAMPLE_TIMES * 1000)
+    calls = 2000 if quick else 20000
+    us = _median_us(lambda: AudioManager.time_to_words(next(times, "00:25:00")), calls, 5)
+    return {"metrics": {"time_to_words.us": _metric(us, "us")}}
+
+
+def bench_sound(quick: bool) -> dict:
+    """Measure pygame.mixer.Sound construction for each sound directory."""
+    import pygame
+
+    pygame.mixer.init(
+        frequency=Config.MIXER_FREQUENCY,
+        size=Config.MIXER_SIZE,
+        channels=Config.MIXER_CHANNELS,
+        buffer=Config.MIXER_BUFFER
+    )
+    assets = AssetManager()
+    per_class = 5 if quick else 20
+
+    metrics = {}
+    details = {}
+    for rel_dir in sorted(assets.manifest.directories):
+        if not rel_dir.startswith("sounds/"):
+            continue
+        files = [f for f in assets.list_files(rel_dir) if f.endswith(".wav")][:per_class]
+        if not files:
+            continue
+        samples = []
+        for filename in files:
+            path = assets.build_path(rel_dir, filename)
+            started = time.perf_counter()
+            try:
+                pygame.mixer.Sound(path)
+            except pygame.error:
+                continue
+            samples.append((time.perf_counter() - started) * 1000)
+        if samples:
+            asset_class = rel_dir[len("sounds/"):]
+            metrics[f"sound.{asset_class}.ms"] = _metric(statistics.median(samples), "ms")
+            details[asset_class] = {"files": len(samples), "max_ms": max(samples)}
+    pygame.mixer.quit()
+    return {"metrics": metrics, "details": details}
+
+
+def bench_assets(quick: bool) -> dict:
+    """Measure AssetManager construction and the lookups made on clicks."""
+    init_ms = statistics.median(_median_us(AssetManager, 1, 1) / 1000 for _ in range(5))
+    assets = AssetManager()
+
+    calls = 2000 if quick else 20000
+    guns = assets.load_gun_names()
+    shoot_dir = assets.build_path("sounds/cs_weapons/shoot")
+    known_file = assets.build_path("sounds/UI", "buttonclick.wav")
+
+    def cold_gun_sounds():
+        assets._gun_sounds.clear()
+        assets.get_gun_sounds(guns[0])
+
+    return {"metrics": {
+        "assets.init.ms": _metric(init_ms, "ms"),
+        "assets.list_files.us": _metric(
+            _median_us(lambda: assets.list_files("sounds/vox"), calls, 5), "us"),
+        "assets.has_file.us": _metric(
+            _median_us(lambda: assets.has_file(known_file), calls, 5), "us"),
+        "assets.random_file.us": _metric(
+            _median_us(lambda: assets.get_random_file(shoot_dir), calls, 5), "us"),
+        "assets.gun_sounds_cold.us": _metric(
+            _median_us(cold_gun_sounds, calls // 10, 5), "us"),
+        "assets.gun_sounds_warm.us": _metric(
+            _median_us(lambda: assets.get_gun_sounds(guns[0]), calls, 5), "us"),
+    }}
+
+
+def bench_load_image(quick: bool) -> dict:
+    """Measure dpg.load_image for every background texture."""
+    import dearpygui.dearpygui as dpg
+
+    assets = AssetManager()
+    names = assets.get_background_names()
+    if quick:
+        names = names[::10]
+
+    by_file = {}
+    for name in names:
+        started = time.perf_counter()
+        loaded = dpg.load_image(assets.get_background_texture_path(name))
+        if loaded is not None:
+            by_file[name] = (time.perf_counter() - started) * 1000
+
+    metrics = {}
+    by_format: Dict[str, List[float]] = {}
+    for name, ms in by_file.items():
+        by_format.setdefault(os.path.splitext(name)[1].lstrip(".").lower(), []).append(ms)
+    for extension, samples in sorted(by_format.items()):
+        metrics[f"load_image.{extension}.ms"] = _metric(statistics.mean(samples), "ms")
+    if by_file:
+        metrics["load_image.max.ms"] = _metric(max(by_file.values()), "ms")
+    return {"metrics": metrics, "details": {"by_file_ms": by_file}}
+
+
+def bench_timer(quick: bool) -> dict:
+    """Measure how close Timer ticks are to one second and the CPU they cost."""
+    from libs.event_bus import TICK, EventBus
+    from libs.timer import Timer
+
+    seconds = 3 if quick else 6
+    bus = EventBus()
+    ticks = []
+    bus.subscribe((TICK,), lambda event: ticks.append(event.monotonic), delivery="benchmark")
+    timer = Timer(event_bus=bus)
+
+    cpu_started = time.process_time()
+    wall_started = time.monotonic()
+    timer.start(f"00:00:{seconds:02}")
+    while timer.current_time > 0 or not ticks:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    cpu_ms = (time.process_time() - cpu_started) * 1000
+    wall = time.monotonic() - wall_started
+    timer.reset()
+    bus.shutdown()
+
+    errors = [abs(b - a - 1.0) * 1000 for a, b in zip(ticks, ticks[1:])]
+    drift = (ticks[-1] - ticks[0] - (len(ticks) - 1)) * 1000 if len(ticks) > 1 else 0.0
+    return {"metrics": {
+        "timer.tick_error_mean.ms": _metric(statistics.mean(errors) if errors else 0.0, "ms"),
+        "timer.tick_error_max.ms": _metric(max(errors) if errors else 0.0, "ms"),
+        "timer.drift.ms": _metric(abs(drift), "ms"),
+        "timer.cpu.ms_per_s": _metric(cpu_ms / wall, "ms/s"),
+    }, "details": {"ticks": len(ticks)}}
+
+
+def bench_track_event(quick: bool) -> dict:
+    """Measure ClickstreamTracker.track_event throughput on the calling thread."""
+    from benchmarks import track_event
+
+    result = track_event.run(events=5000 if quick else 20000, rounds=3 if quick else 7)
+    us = result["track_event_us"]
+    return {"metrics": {
+        "track_event.us": _metric(us, "us"),
+        "track_event.events_per_s": _metric(1e6 / us, "events/s", HIGHER_IS_BETTER),
+    }}
+
+
+BENCHMARKS = {
+    "time_to_words": bench_time_to_words,
+    "sound": bench_sound,
+    "assets": bench_assets,
+    "load_image": bench_load_image,
+    "timer": bench_timer,
+    "track_event": bench_track_event,
+}
+
+
+def run(only: Optional[List[str]] = None, quick: bool = False) -> dict:
+    """
+    Run the benchmarks.
+
+    Args:
+        only: Benchmark names to run (defaults to all of BENCHMARKS)
+        quick: Use fewer iterations (noisier, for smoke runs)
+
+    Returns:
+        Dictionary with run metadata, flat metrics and per-benchmark details
+    """
+    metrics = {}
+    details = {}
+    for name in only or BENCHMARKS:
+        result = BENCHMARKS[name](quick)
+        metrics.update(result["metrics"])
+        if result.get("details"):
+            details[name] = result["details"]
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "app_version": get_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "metrics": metrics,
+        "details": details,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[dict]:
+    """
+    Compare metrics with a baseline.
+
+    Args:
+        baseline: Earlier result of run()
+        current: New result of run()
+        threshold: Relative change treated as a regression (0.2 = 20% worse)
+
+    Returns:
+        One row per metric present in both, with the relative change
+        (positive = worse) and whether it is a regression
+    """
+    rows = []
+    for name, metric in current["metrics"].items():
+        before = baseline["metrics"].get(name)
+        if before is None or not before["value"]:
+            continue
+        change = (metric["value"] - before["value"]) / before["value"]
+        if metric["better"] == HIGHER_IS_BETTER:
+            change = -change
+        rows.append({
+            "metric": name,
+            "baseline": before["value"],
+            "current": metric["value"],
+            "unit": metric["unit"],
+            "change": change,
+            "regression": change > threshold,
+        })
+    return rows
+
+
+def print_metrics(result: dict):
+    """Print metrics as text."""
+    for name, metric in result["metrics"].items():
+        print(f"{name:<32} {metric['value']:>12.3f} {metric['unit']}")
+
+
+def print_comparison(rows: List[dict], threshold: float):
+    """Print a comparison as text."""
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(f"{row['metric']:<32} {row['baseline']:>12.3f} -> {row['current']:>12.3f} "
+              f"{row['unit']:<9} {row['change']:>+7.1%} {flag}")
+    regressions = sum(1 for row in rows if row["regression"])
+    print(f"{len(rows)} metrics compared, {regressions} worse by more than {threshold:.0%}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS),
+                        help="benchmarks to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative change flagged as a regression (default 0.2)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    # Messages from the components would corrupt JSON output
+    with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+        result = run(args.only, args.quick)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+
+    rows = compare(baseline, result, args.threshold) if baseline else []
+    if args.json:
+        print(json.dumps({**result, "comparison": rows} if baseline else result, indent=2))
+    elif baseline:
+        print_comparison(rows, args.threshold)
+    else:
+        print_metrics(result)
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark for ClickstreamTracker.track_event.
+
+Measures the per-event cost on the calling (UI) thread, with the worker
+draining the queue into a spool and a fake sink as in a real session, and
+compares it with building a full row dictionary on the calling thread.
+
+Usage:
+    python -m benchmarks.track_event [--events N] [--rounds N]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from libs.clickstream_sinks import FakeSink
+from libs.clickstream_tracker import ClickstreamTracker
+
+METADATA = {"weapon": "glock18"}
+
+
+def _full_row(tracker: ClickstreamTracker, event_type: str, component: str, metadata: dict) -> dict:
+    """Build a complete row on the calling thread, as track_event used to."""
+    return {
+        "user_id": tracker.user_id,
+        "session_id": tracker.session_id,
+        "app_version": tracker.app_version,
+        "timestamp": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+        "event_type": event_type,
+        "component": component,
+        "metadata": str(metadata) if metadata else None
+    }
+
+
+def _time_per_call(func, events: int) -> float:
+    """Run func events times and return the mean microseconds per call."""
+    started = time.perf_counter()
+    for _ in range(events):
+        func("button_click", "shoot_gun_button", METADATA)
+    return (time.perf_counter() - started) * 1e6 / events
+
+
+def run(events: int = 20000, rounds: int = 7) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        events: Events tracked per round
+        rounds: Number of rounds (the median is reported)
+
+    Returns:
+        Dictionary with median microseconds per event for each variant
+    """
+    with tempfile.TemporaryDirectory() as spool_dir:
+        tracker = ClickstreamTracker(
+            spool_dir=spool_dir,
+            sink=FakeSink(),
+            queue_capacity=events * rounds + 1
+        )
+        tracker.spool_ready.wait()
+
+        track_us = [_time_per_call(tracker.track_event, events) for _ in range(rounds)]
+        row_us = [
+            _time_per_call(lambda *args: _full_row(tracker, *args), events)
+            for _ in range(rounds)
+        ]
+        tracker.shutdown()
+
+    return {
+        "track_event_us": statistics.median(track_us),
+        "full_row_us": statistics.median(row_us),
+    }
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000, help="events per round")
+    parser.add_argument("--rounds", type=int, default=7, help="number of rounds")
+    args = parser.parse_args(argv)
+
+    result = run(args.events, args.rounds)
+    print(f"track_event (compact record + enqueue): {result['track_event_us']:.2f} us/event")
+    print(f"full row dict on calling thread:        {result['full_row_us']:.2f} us/event")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,22 +1,46 @@
 """
 HL-VOX-TimeLEFT Library
 Contains all core classes for the Half-Life themed Pomodoro timer.
+
+Classes are imported lazily on first access, so importing a light class
+such as Timer or Config does not pull in pygame, dearpygui or BigQuery.
 """
 
-from libs.config import Config
-from libs.asset_manager import AssetManager
-from libs.timer import Timer
-from libs.audio_manager import AudioManager
-from libs.ui_manager import UIManager
-from libs.clickstream_tracker import ClickstreamTracker
-from libs.application import Application
-
-__all__ = [
-    'Config',
-    'AssetManager',
-    'Timer',
-    'AudioManager',
-    'UIManager',
-    'ClickstreamTracker',
-    'Application',
-]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from libs.config import Config
+    from libs.asset_manager import AssetManager
+    from libs.timer import Timer
+    from libs.audio_manager import AudioManager
+    from libs.ui_manager import UIManager
+    from libs.clickstream_tracker import ClickstreamTracker
+    from libs.timer_engine import TimerEngine
+    from libs.application import Application
+
+_LAZY_IMPORTS = {
+    'Config': 'libs.config',
+    'AssetManager': 'libs.asset_manager',
+    'Timer': 'libs.timer',
+    'AudioManager': 'libs.audio_manager',
+    'UIManager': 'libs.ui_manager',
+    'ClickstreamTracker': 'libs.clickstream_tracker',
+    'TimerEngine': 'libs.timer_engine',
+    'Application': 'libs.application',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    """Import exported classes on first access."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,52 +3,59 @@ Application class for Half-Life VOX TimeLEFT.
 Orchestrates all components and manages the application lifecycle.
 """
 
-import dearpygui.dearpygui as dpg
+import time
+from typing import Optional
 
 from libs.config import Config
-from libs.asset_manager import AssetManager
-from libs.timer import Timer
-from libs.audio_manager import AudioManager
+from libs.event_bus import DELIVERY_RENDER, FINISHED, RESET, TICK
+from libs.timer_engine import TimerEngine
 from libs.ui_manager import UIManager
-from libs.clickstream_tracker import ClickstreamTracker
+from libs.startup_profiler import StartupProfiler
 
 
 class Application:
     """Main application class that orchestrates all components."""
 
-    def __init__(self):
-        """Initialize the application and all its components."""
-        # Initialize components
-        self.asset_manager = AssetManager()
-        self.timer = Timer(countdown_threshold=Config.COUNTDOWN_THRESHOLD)
-        self.audio_manager = AudioManager(self.asset_manager)
-
-        # Initialize clickstream tracker
-        self.clickstream_tracker = ClickstreamTracker(
-            project_id=Config.CLICKSTREAM_PROJECT_ID,
-            dataset_id=Config.CLICKSTREAM_DATASET_ID,
-            table_id=Config.CLICKSTREAM_TABLE_ID,
-            batch_size=Config.CLICKSTREAM_BATCH_SIZE,
-            enabled=Config.CLICKSTREAM_ENABLED
-        )
-
-        self.ui_manager = UIManager(
-            self.asset_manager,
-            self.audio_manager,
-            self.timer,
-            self.clickstream_tracker
-        )
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
+        """
+        Initialize the application and all its components.
+
+        Args:
+            profiler: StartupProfiler recording init phases (optional)
+        """
+        self.profiler = profiler or StartupProfiler()
+
+        # Timer, audio and tracking, or a running daemon's timer when one is listening
+        self.engine = TimerEngine(attach=Config.DAEMON_ATTACH, profiler=self.profiler)
+        self.runtime = self.engine.runtime
+        self.asset_manager = self.engine.asset_manager
+        self.event_bus = self.engine.event_bus
+        self.timer = self.engine.timer
+        self.audio_manager = self.engine.audio_manager
+        self.clickstream_tracker = self.engine.clickstream_tracker
+
+        with self.profiler.phase("ui_manager"):
+            self.ui_manager = UIManager(
+                self.asset_manager,
+                self.audio_manager,
+                self.timer,
+                self.clickstream_tracker,
+                self.event_bus
+            )
 
         # Wire up callbacks
-        self._setup_callbacks()
+        with self.profiler.phase("callbacks"):
+            self._setup_callbacks()
 
     def _setup_callbacks(self):
-        """Setup callbacks between components."""
-        # Timer update callback
-        self.timer.set_update_callback(self.ui_manager.update_timer_display)
-
-        # Timer countdown callback
-        self.timer.set_countdown_callback(self.audio_manager.play_countdown_async)
+        """Subscribe the timer display, updated by the render loop."""
+        self.event_bus.subscribe(
+            (TICK, RESET, FINISHED),
+            lambda event: self.ui_manager.update_timer_display(event.time_str),
+            delivery=DELIVERY_RENDER,
+            capacity=4,
+            name="timer_display"
+        )
 
     def run(self):
         """Run the application."""
@@ -62,10 +69,11 @@ class Application:
         self.ui_manager.initialize_gui()
         self.ui_manager.start()
 
-        # Cleanup
+        # Cleanup, producers first: nothing submits work once its source has stopped.
+        # Every step shares one deadline, so closing never waits on the network.
+        deadline = time.monotonic() + Config.SHUTDOWN_TIMEOUT
         self.ui_manager.shutdown()
-        self.clickstream_tracker.shutdown()
-
+        self.engine.shutdown(timeout=max(0.0, deadline - time.monotonic()))
 
 def main():
     """Main entry point for the application."""
@@ -6,6 +6,9 @@ Handles all file operations, path building, and asset loading.
 import os
 import random
 from pathlib import Path
+from typing import Optional, Tuple
+
+from libs.asset_manifest import AssetManifest
 
 
 class AssetManager:
@@ -17,6 +20,11 @@ class AssetManager:
         self.root_path = Path(__file__).parent.parent
         self.assets_path = self.root_path / "assets"
 
+        # Index of all assets, rebuilt only when a directory has changed
+        self.manifest = AssetManifest(self.assets_path)
+        self.manifest.ensure()
+        self._gun_sounds = {}
+
     def build_path(self, path_suffix: str, file: str = "") -> str:
         """
         Build a full path to an asset file.
@@ -33,6 +41,45 @@ class AssetManager:
             return str(path_dir / file)
         return str(path_dir) + "/"
 
+    def relative_path(self, path: str) -> str:
+        """
+        Get the path of an asset relative to the assets directory.
+
+        Args:
+            path: Full path to an asset file or directory
+
+        Returns:
+            POSIX-style path relative to the assets directory
+        """
+        return Path(path).relative_to(self.assets_path).as_posix()
+
+    def list_files(self, path_suffix: str) -> list:
+        """
+        List the files in an asset directory from the manifest.
+
+        Args:
+            path_suffix: Relative path within assets directory
+
+        Returns:
+            Sorted list of filenames
+        """
+        return self.manifest.list_files(path_suffix)
+
+    def has_file(self, path: str) -> bool:
+        """
+        Check whether an asset file exists according to the manifest.
+
+        Args:
+            path: Full path to the asset file
+
+        Returns:
+            True if the file is a known asset
+        """
+        try:
+            return self.manifest.get(self.relative_path(path)) is not None
+        except ValueError:
+            return os.path.isfile(path)
+
     def get_random_file(self, path: str) -> str:
         """
         Get a random file from a directory.
@@ -43,7 +90,7 @@ class AssetManager:
         Returns:
             Full path to a random file
         """
-        files = [f for f in os.listdir(path)]
+        files = self.list_files(self.relative_path(path))
         random_file = random.choice(files)
         return f"{path}{random_file}"
 
@@ -54,11 +101,31 @@ class AssetManager:
         Returns:
             Sorted list of unique gun names
         """
-        gun_path = self.build_path("sounds/cs_weapons/shoot")
-        files = [f.split("-")[0] for f in os.listdir(gun_path)]
+        files = [f.split("-")[0] for f in self.list_files("sounds/cs_weapons/shoot")]
         unique_guns = list(set(files))
         return sorted(unique_guns)
 
+    def get_gun_sounds(self, gun_prefix: str) -> list:
+        """
+        Get the shooting sounds for a gun.
+
+        Silenced ("unsil") variants only match unsil prefixes and vice versa.
+
+        Args:
+            gun_prefix: Gun name/prefix
+
+        Returns:
+            List of full paths to matching sound files
+        """
+        if gun_prefix not in self._gun_sounds:
+            is_unsil = "unsil" in gun_prefix
+            self._gun_sounds[gun_prefix] = [
+                self.build_path("sounds/cs_weapons/shoot", gun)
+                for gun in self.list_files("sounds/cs_weapons/shoot")
+                if gun_prefix in gun and (("unsil" in gun) if is_unsil else ("unsil" not in gun))
+            ]
+        return self._gun_sounds[gun_prefix]
+
     def get_background_names(self) -> list:
         """
         Get all background texture filenames.
@@ -66,9 +133,7 @@ class AssetManager:
         Returns:
             Sorted list of background image filenames
         """
-        bg_path = self.build_path("img/bg")
-        files = sorted([f for f in os.listdir(bg_path)])
-        return files
+        return self.list_files("img/bg")
 
     def get_background_texture_path(self, filename: str = None) -> str:
         """
@@ -85,6 +150,24 @@ class AssetManager:
             return self.get_random_file(bg_path)
         return f"{bg_path}{filename}"
 
+    def get_image_size(self, path: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the dimensions of an image asset from the manifest.
+
+        Args:
+            path: Full path to the image file
+
+        Returns:
+            (width, height), or None if the manifest does not know them
+        """
+        try:
+            entry = self.manifest.get(self.relative_path(path))
+        except ValueError:
+            return None
+        if not entry or "width" not in entry:
+            return None
+        return entry["width"], entry["height"]
+
     def get_sound_path(self, category: str, filename: str) -> str:
         """
         Get path to a specific sound file.
@@ -0,0 +1,268 @@
+"""
+AssetManifest class for Half-Life VOX TimeLEFT application.
+Keeps an on-disk index of every asset so lookups never scan directories.
+
+Usage:
+    python -m libs.asset_manifest          # Rebuild asset_manifest.json
+"""
+
+import hashlib
+import json
+import os
+import struct
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "asset_manifest.json"
+
+
+class AssetManifest:
+    """
+    In-memory index of the assets directory backed by a JSON manifest.
+
+    The manifest records size, mtime and a content hash for every file,
+    plus audio and image properties. It is revalidated against directory
+    mtimes, which change whenever files are added, removed or renamed.
+    """
+
+    def __init__(self, assets_path: Path, manifest_path: Optional[Path] = None):
+        """
+        Initialize the manifest.
+
+        Args:
+            assets_path: Root assets directory
+            manifest_path: Manifest file location (defaults to a file next to
+                the assets directory, so writing it does not touch its mtime)
+        """
+        self.assets_path = Path(assets_path)
+        self.manifest_path = Path(manifest_path or self.assets_path.parent / MANIFEST_FILENAME)
+        self.files: Dict[str, dict] = {}
+        self.directories: Dict[str, dict] = {}
+
+    def ensure(self) -> bool:
+        """
+        Load the manifest, rebuilding and saving it if it is stale.
+
+        Returns:
+            True if the manifest was rebuilt, False if it was up to date
+        """
+        if self.load() and self.is_current():
+            return False
+
+        self.build(previous=self.files)
+        try:
+            self.save()
+        except OSError as e:
+            print(f"Warning: Could not write asset manifest {self.manifest_path}: {e}")
+        return True
+
+    def load(self) -> bool:
+        """
+        Load the manifest from disk.
+
+        Returns:
+            True if a manifest of the current version was loaded
+        """
+        try:
+            with open(self.manifest_path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        if data.get("version") != MANIFEST_VERSION:
+            return False
+
+        self.files = data.get("files", {})
+        self.directories = data.get("directories", {})
+        return True
+
+    def save(self):
+        """Write the manifest to disk atomically."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "directories": self.directories,
+            "files": self.files,
+        }
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_current(self) -> bool:
+        """
+        Check the manifest against the directory mtimes on disk.
+
+        Returns:
+            True if no directory has changed since the manifest was built
+        """
+        if not self.directories:
+            return False
+
+        for rel_dir, info in self.directories.items():
+            try:
+                if os.stat(self.assets_path / rel_dir).st_mtime_ns != info["mtime_ns"]:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def build(self, previous: Optional[Dict[str, dict]] = None):
+        """
+        Scan the assets directory and rebuild the manifest.
+
+        Files whose size and mtime are unchanged keep their previous entry,
+        so only new or modified files are hashed and decoded.
+
+        Args:
+            previous: File entries from an earlier manifest
+        """
+        previous = previous or {}
+        files = {}
+        directories = {}
+
+        for dir_path, dir_names, file_names in os.walk(self.assets_path):
+            dir_names.sort()
+            rel_dir = Path(dir_path).relative_to(self.assets_path).as_posix()
+            names = sorted(file_names)
+            directories[rel_dir] = {
+                "mtime_ns": os.stat(dir_path).st_mtime_ns,
+                "files": names,
+            }
+
+            for name in names:
+                rel_path = name if rel_dir == "." else f"{rel_dir}/{name}"
+                stat = os.stat(os.path.join(dir_path, name))
+                entry = previous.get(rel_path)
+                if (entry and entry["size"] == stat.st_size and
+                        entry["mtime_ns"] == stat.st_mtime_ns):
+                    files[rel_path] = entry
+                else:
+                    files[rel_path] = self.describe_file(
+                        os.path.join(dir_path, name), stat
+                    )
+
+        self.files = files
+        self.directories = directories
+
+    @classmethod
+    def describe_file(cls, path: str, stat: Optional[os.stat_result] = None) -> dict:
+        """
+        Build the manifest entry for a single file.
+
+        Args:
+            path: Full path to the file
+            stat: Result of os.stat for the file (optional)
+
+        Returns:
+            Dictionary of file properties
+        """
+        stat = stat or os.stat(path)
+        with open(path, "rb") as f:
+            content = f.read()
+
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "blake2b": hashlib.blake2b(content, digest_size=16).hexdigest(),
+        }
+
+        extension = path.rsplit(".", 1)[-1].lower()
+        if extension == "wav":
+            entry.update(cls._describe_wav(path))
+        elif extension in IMAGE_HEADERS:
+            dimensions = IMAGE_HEADERS[extension](content)
+            if dimensions:
+                entry["width"], entry["height"] = dimensions
+        return entry
+
+    @staticmethod
+    def _describe_wav(path: str) -> dict:
+        """Read duration and sample format from a WAV header."""
+        try:
+            with wave.open(path, "rb") as wav:
+                sample_width = wav.getsampwidth()
+                return {
+                    "duration": round(wav.getnframes() / wav.getframerate(), 4),
+                    "sample_rate": wav.getframerate(),
+                    "channels": wav.getnchannels(),
+                    "sample_format": "u8" if sample_width == 1 else f"s{sample_width * 8}",
+                }
+        except (wave.Error, EOFError, ZeroDivisionError) as e:
+            return {"error": str(e)}
+
+    def list_files(self, rel_dir: str) -> List[str]:
+        """
+        List the files in an asset directory.
+
+        Args:
+            rel_dir: Directory relative to the assets root
+
+        Returns:
+            Sorted list of filenames (empty if the directory is unknown)
+        """
+        info = self.directories.get(rel_dir.strip("/") or ".")
+        return info["files"] if info else []
+
+    def get(self, rel_path: str) -> Optional[dict]:
+        """
+        Get the manifest entry for a file.
+
+        Args:
+            rel_path: File path relative to the assets root
+
+        Returns:
+            File properties or None if the file is not in the manifest
+        """
+        return self.files.get(rel_path)
+
+
+def _bmp_dimensions(content: bytes):
+    if content[:2] != b"BM" or len(content) < 26:
+        return None
+    width, height = struct.unpack_from("<ii", content, 18)
+    return width, abs(height)
+
+
+def _tga_dimensions(content: bytes):
+    if len(content) < 18:
+        return None
+    return struct.unpack_from("<HH", content, 12)
+
+
+def _pcx_dimensions(content: bytes):
+    if len(content) < 12 or content[0] != 0x0A:
+        return None
+    x_min, y_min, x_max, y_max = struct.unpack_from("<HHHH", content, 4)
+    return x_max - x_min + 1, y_max - y_min + 1
+
+
+def _png_dimensions(content: bytes):
+    if content[:8] != b"\x89PNG\r\n\x1a\n" or len(content) < 24:
+        return None
+    return struct.unpack_from(">II", content, 16)
+
+
+def _gif_dimensions(content: bytes):
+    if content[:3] != b"GIF" or len(content) < 10:
+        return None
+    return struct.unpack_from("<HH", content, 6)
+
+
+IMAGE_HEADERS = {
+    "bmp": _bmp_dimensions,
+    "tga": _tga_dimensions,
+    "pcx": _pcx_dimensions,
+    "png": _png_dimensions,
+    "gif": _gif_dimensions,
+}
+
+
+if __name__ == "__main__":
+    manifest = AssetManifest(Path(__file__).parent.parent / "assets")
+    manifest.load()
+    manifest.build(previous=manifest.files)
+    manifest.save()
+    print(f"Wrote {len(manifest.files)} assets in {len(manifest.directories)} "
+          f"directories to {manifest.manifest_path}")
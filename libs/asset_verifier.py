@@ -0,0 +1,266 @@
+"""
+Asset verification for Half-Life VOX TimeLEFT application.
+Decodes every sound and image in parallel and reports broken or missing assets.
+
+Usage:
+    python -m libs.asset_verifier                      # Print JSON report
+    python -m libs.asset_verifier --report report.json # Write JSON report
+    python -m libs.asset_verifier --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+from libs.asset_manifest import AssetManifest
+from libs.config import Config
+
+SOUND_EXTENSIONS = {"wav"}
+IMAGE_EXTENSIONS = {"bmp", "tga", "png"}
+SUPPORTED_SAMPLE_WIDTHS = {1, 2}
+
+
+def _issue(path: str, severity: str, check: str, message: str, repair: str) -> dict:
+    return {
+        "path": path,
+        "severity": severity,
+        "check": check,
+        "message": message,
+        "repair": repair,
+    }
+
+
+def verify_sound(path: str, rel_path: str) -> List[dict]:
+    """
+    Fully decode a WAV file and check it against the mixer settings.
+
+    Args:
+        path: Full path to the sound file
+        rel_path: Path relative to the assets directory
+
+    Returns:
+        List of issues found
+    """
+    try:
+        with wave.open(path, "rb") as wav:
+            channels = wav.getnchannels()
+            sample_width = wav.getsampwidth()
+            rate = wav.getframerate()
+            frames = wav.getnframes()
+            data = wav.readframes(frames)
+    except (wave.Error, EOFError, OSError) as e:
+        return [_issue(rel_path, "error", "decode", f"Cannot decode WAV: {e}",
+                       "Re-export as uncompressed PCM WAV")]
+
+    issues = []
+    expected = frames * channels * sample_width
+    if len(data) != expected:
+        issues.append(_issue(
+            rel_path, "error", "decode",
+            f"Truncated audio data: {len(data)} of {expected} bytes",
+            "Re-export the sound from its source"
+        ))
+    if sample_width not in SUPPORTED_SAMPLE_WIDTHS:
+        issues.append(_issue(
+            rel_path, "warning", "format",
+            f"{sample_width * 8}-bit samples (mixer uses {abs(Config.MIXER_SIZE)}-bit)",
+            "Re-export as 8-bit or 16-bit PCM"
+        ))
+    if channels > Config.MIXER_CHANNELS:
+        issues.append(_issue(
+            rel_path, "warning", "format",
+            f"{channels} channels (mixer uses {Config.MIXER_CHANNELS})",
+            "Downmix to mono"
+        ))
+    if rate <= 0 or Config.MIXER_FREQUENCY % rate:
+        issues.append(_issue(
+            rel_path, "warning", "format",
+            f"Sample rate {rate} Hz does not divide mixer rate {Config.MIXER_FREQUENCY} Hz",
+            f"Resample to {Config.MIXER_FREQUENCY} Hz"
+        ))
+    return issues
+
+
+def verify_image(path: str, rel_path: str, entry: Optional[dict]) -> List[dict]:
+    """
+    Decode an image the way the GUI does and compare it to the manifest.
+
+    Args:
+        path: Full path to the image file
+        rel_path: Path relative to the assets directory
+        entry: Manifest entry for the file
+
+    Returns:
+        List of issues found
+    """
+    import dearpygui.dearpygui as dpg
+
+    image = dpg.load_image(path)
+    if image is None:
+        return [_issue(rel_path, "error", "decode", "DearPyGui cannot decode image",
+                       "Convert to TGA or BMP")]
+
+    width, height, channels, data = image
+    if entry and (entry.get("width"), entry.get("height")) != (width, height):
+        return [_issue(
+            rel_path, "warning", "manifest",
+            f"Decoded size {width}x{height} differs from header "
+            f"{entry.get('width')}x{entry.get('height')}",
+            "Rebuild the manifest: python -m libs.asset_manifest"
+        )]
+    return []
+
+
+def verify_file(task: tuple) -> List[dict]:
+    """
+    Verify a single asset (process pool entry point).
+
+    Args:
+        task: Tuple of (full path, relative path, manifest entry)
+
+    Returns:
+        List of issues found
+    """
+    path, rel_path, entry = task
+    issues = []
+
+    try:
+        os.stat(path)
+    except OSError as e:
+        return [_issue(rel_path, "error", "exists", f"Missing file: {e}",
+                       "Restore the file or rebuild the manifest")]
+
+    if entry:
+        with open(path, "rb") as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        if digest != entry["blake2b"]:
+            issues.append(_issue(
+                rel_path, "warning", "hash", "Content changed since manifest was built",
+                "Rebuild the manifest: python -m libs.asset_manifest"
+            ))
+
+    extension = rel_path.rsplit(".", 1)[-1].lower()
+    if extension in SOUND_EXTENSIONS:
+        issues += verify_sound(path, rel_path)
+    elif rel_path.startswith("img/bg/"):
+        if extension in IMAGE_EXTENSIONS:
+            issues += verify_image(path, rel_path, entry)
+        else:
+            issues.append(_issue(
+                rel_path, "error", "format", f"Unsupported background format: .{extension}",
+                "Convert to TGA or BMP"
+            ))
+    return issues
+
+
+def check_references(manifest: AssetManifest) -> List[dict]:
+    """
+    Check that every sound the application can play exists.
+
+    Args:
+        manifest: Loaded asset manifest
+
+    Returns:
+        List of issues found
+    """
+    from libs.audio_manager import AudioManager
+
+    issues = []
+    for word in sorted(AudioManager.vox_vocabulary()):
+        rel_path = f"sounds/vox/{word}.wav"
+        if manifest.get(rel_path) is None:
+            issues.append(_issue(
+                rel_path, "error", "vox_word", f"VOX word '{word}' cannot be announced",
+                "Add the missing VOX sound"
+            ))
+
+    guns = {f.split("-")[0] for f in manifest.list_files("sounds/cs_weapons/shoot")}
+    for gun in sorted(guns - set(Config.WEAPONS_NO_DEPLOY)):
+        rel_path = f"sounds/cs_weapons/deploy/{gun}_deploy.wav"
+        if manifest.get(rel_path) is None:
+            issues.append(_issue(
+                rel_path, "error", "deploy_sound", f"No deploy sound for '{gun}'",
+                f"Add the sound or list '{gun}' in Config.WEAPONS_NO_DEPLOY"
+            ))
+
+    if not manifest.list_files(f"sounds/{Config.END_SOUND_TYPE}"):
+        issues.append(_issue(
+            f"sounds/{Config.END_SOUND_TYPE}", "error", "end_sound",
+            "No end-of-timer sounds", "Add at least one sound"
+        ))
+    return issues
+
+
+def verify_assets(assets_path: Path, workers: Optional[int] = None) -> dict:
+    """
+    Verify the whole asset tree.
+
+    Args:
+        assets_path: Root assets directory
+        workers: Number of worker processes (defaults to CPU count)
+
+    Returns:
+        Machine-readable report dictionary
+    """
+    started = time.perf_counter()
+    manifest = AssetManifest(assets_path)
+    manifest.ensure()
+
+    tasks = [
+        (str(assets_path / rel_path), rel_path, entry)
+        for rel_path, entry in sorted(manifest.files.items())
+    ]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+
+    issues = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for file_issues in pool.map(verify_file, tasks, chunksize=chunksize):
+            issues += file_issues
+    issues += check_references(manifest)
+
+    severities = [issue["severity"] for issue in issues]
+    return {
+        "summary": {
+            "files_checked": len(tasks),
+            "errors": severities.count("error"),
+            "warnings": severities.count("warning"),
+            "workers": workers,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        },
+        "issues": issues,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Verify HL-VOX-TimeLEFT assets")
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    parser.add_argument("--workers", type=int, help="Number of worker processes")
+    args = parser.parse_args(argv)
+
+    assets_path = Path(__file__).parent.parent / "assets"
+    report = verify_assets(assets_path, args.workers)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        summary = report["summary"]
+        print(f"Checked {summary['files_checked']} files in {summary['elapsed_seconds']}s: "
+              f"{summary['errors']} errors, {summary['warnings']} warnings")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    return 1 if report["summary"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,32 +3,56 @@ AudioManager class for Half-Life VOX TimeLEFT application.
 Handles all audio playback operations and sound sequences.
 """
 
-import os
 import random
 import threading
 from time import sleep
 from typing import Optional
-from num2words import num2words
 import pygame
 
+from libs import tracing
 from libs.asset_manager import AssetManager
 from libs.config import Config
+from libs.runtime import OVERFLOW_DROP_OLDEST, Runtime
+
+# Runtime queues: short effects, and announcements (one at a time)
+AUDIO_QUEUE = "audio"
+VOICE_QUEUE = "voice"
 
 
 class AudioManager:
     """Manages all audio playback and sound sequences."""
 
-    def __init__(self, asset_manager: AssetManager):
+    def __init__(self, asset_manager: AssetManager, runtime: Optional[Runtime] = None):
         """
         Initialize the audio manager.
 
         Args:
             asset_manager: AssetManager instance for path building
+            runtime: Runtime whose queues play async sounds (a private one
+                is created if omitted)
         """
         self.asset_manager = asset_manager
 
+        # Async playback runs on fixed workers; when clicks outpace them
+        # the oldest waiting sound is skipped
+        self.runtime = runtime or Runtime()
+        self.runtime.add_queue(AUDIO_QUEUE, workers=Config.AUDIO_WORKERS,
+                               capacity=Config.AUDIO_QUEUE_CAPACITY,
+                               overflow=OVERFLOW_DROP_OLDEST)
+        self.runtime.add_queue(VOICE_QUEUE, workers=1,
+                               capacity=Config.VOICE_QUEUE_CAPACITY,
+                               overflow=OVERFLOW_DROP_OLDEST)
+
+        # Set by shutdown(); playback loops return instead of waiting
+        self._stopping = threading.Event()
+
         # Initialize pygame mixer
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        pygame.mixer.init(
+            frequency=Config.MIXER_FREQUENCY,
+            size=Config.MIXER_SIZE,
+            channels=Config.MIXER_CHANNELS,
+            buffer=Config.MIXER_BUFFER
+        )
 
         # Preload common sound paths
         self.bg_sound = asset_manager.get_sound_path("UI", "buttonclick.wav")
@@ -39,6 +63,24 @@ class AudioManager:
         self.weapon_pickup_sound = asset_manager.get_sound_path("items", "gunpickup2.wav")
         self.open_app_sound = asset_manager.get_sound_path("items", "gunpickup2.wav")
 
+    @staticmethod
+    def _load_sound(sound_path: str) -> pygame.mixer.Sound:
+        """
+        Decode a sound file.
+
+        Args:
+            sound_path: Full path to the sound file
+
+        Returns:
+            Loaded sound
+
+        Raises:
+            pygame.error: If the file cannot be loaded
+        """
+        with tracing.span("audio.load", "audio", file=sound_path.rsplit("/", 1)[-1]):
+            return pygame.mixer.Sound(sound_path)
+
+    @tracing.traced("audio.play_sound", "audio")
     def play_sound(self, sound_path: str):
         """
         Play a sound file synchronously using pygame.
@@ -46,11 +88,13 @@ class AudioManager:
         Args:
             sound_path: Full path to the sound file
         """
+        if self._stopping.is_set():
+            return
         try:
-            sound = pygame.mixer.Sound(sound_path)
+            sound = self._load_sound(sound_path)
             channel = sound.play()
             # Wait for sound to finish
-            while channel.get_busy():
+            while channel.get_busy() and not self._stopping.is_set():
                 pygame.time.wait(10)
         except pygame.error as e:
             print(f"Error playing sound {sound_path}: {e}")
@@ -63,12 +107,23 @@ class AudioManager:
             sound_path: Full path to the sound file
         """
         try:
-            sound = pygame.mixer.Sound(sound_path)
+            sound = self._load_sound(sound_path)
             sound.play()
         except pygame.error as e:
             print(f"Error playing sound {sound_path}: {e}")
 
-    def time_to_words(self, time_str: str) -> list:
+    def shutdown(self):
+        """
+        Stop all playback.
+
+        Call before the runtime shuts down: pygame quits the mixer at exit,
+        which crashes the process if a worker is still waiting on a channel.
+        """
+        self._stopping.set()
+        pygame.mixer.stop()
+
+    @staticmethod
+    def time_to_words(time_str: str) -> list:
         """
         Convert time string to list of words for VOX playback.
 
@@ -82,19 +137,19 @@ class AudioManager:
         words = []
 
         if hours > 0:
-            words += self._split_words(hours)
+            words += AudioManager._split_words(hours)
             words.append("hour" if hours == 1 else "hours")
 
         if minutes > 0:
             if hours > 0:
                 words.append("_comma")
-            words += self._split_words(minutes)
+            words += AudioManager._split_words(minutes)
             words.append("minutes")  # No sound-bite for "singular minute"
 
         if seconds > 0:
             if hours > 0 or minutes > 0:
                 words.append("and")
-            words += self._split_words(seconds)
+            words += AudioManager._split_words(seconds)
             words.append("second" if seconds == 1 else "seconds")
 
         return words
@@ -110,8 +165,27 @@ class AudioManager:
         Returns:
             List of individual word strings
         """
+        from num2words import num2words
+
         return num2words(hyphenated_word).replace("-", " ").split()
 
+    @staticmethod
+    def vox_vocabulary() -> set:
+        """
+        Get every VOX word that announcements can play.
+
+        Returns:
+            Set of word strings (without file extension)
+        """
+        words = {"remaining", "_period"}
+        words.update(Config.COUNTDOWN_SOUNDS)
+        for n in range(100):
+            words.update(AudioManager.time_to_words(f"{n:02}:01:01"))
+        for n in range(60):
+            words.update(AudioManager.time_to_words(f"01:{n:02}:{n:02}"))
+        return words
+
+    @tracing.traced("audio.play_timeleft", "audio")
     def play_timeleft(self, timeleft: str):
         """
         Play time-left announcement sequence.
@@ -137,12 +211,9 @@ class AudioManager:
         Args:
             timeleft: Time remaining in HH:MM:SS format
         """
-        threading.Thread(
-            target=self.play_timeleft,
-            args=(timeleft,),
-            daemon=True
-        ).start()
+        self.runtime.submit(VOICE_QUEUE, self.play_timeleft, timeleft)
 
+    @tracing.traced("audio.play_countdown", "audio")
     def play_countdown(self):
         """Play countdown sequence (5, 4, 3, 2, 1) followed by ending sound."""
         # Play countdown
@@ -165,11 +236,9 @@ class AudioManager:
 
     def play_countdown_async(self):
         """Play countdown sequence asynchronously."""
-        threading.Thread(
-            target=self.play_countdown,
-            daemon=True
-        ).start()
+        self.runtime.submit(VOICE_QUEUE, self.play_countdown)
 
+    @tracing.traced("audio.play_shootgun", "audio")
     def play_shootgun(self, gun_prefix: str):
         """
         Play weapon shooting sound.
@@ -177,20 +246,7 @@ class AudioManager:
         Args:
             gun_prefix: Gun name/prefix to play
         """
-        gun_path = self.asset_manager.build_path("sounds/cs_weapons/shoot")
-        gun_filenames = os.listdir(gun_path)
-
-        # Determine if we're looking for "unsil" sounds
-        is_unsil = "unsil" in gun_prefix
-
-        # Filter sounds accordingly
-        filtered_sounds = [
-            gun for gun in gun_filenames
-            if gun_prefix in gun and (("unsil" in gun) if is_unsil else ("unsil" not in gun))
-        ]
-
-        # Construct full paths
-        gun_fullpaths = [os.path.join(gun_path, gun) for gun in filtered_sounds]
+        gun_fullpaths = self.asset_manager.get_gun_sounds(gun_prefix)
 
         if not gun_fullpaths:
             print("No matching gun sounds found.")
@@ -207,12 +263,9 @@ class AudioManager:
         Args:
             gun_prefix: Gun name/prefix to play
         """
-        threading.Thread(
-            target=self.play_shootgun,
-            args=(gun_prefix,),
-            daemon=True
-        ).start()
+        self.runtime.submit(AUDIO_QUEUE, self.play_shootgun, gun_prefix)
 
+    @tracing.traced("audio.play_weapon_deploy", "audio")
     def play_weapon_deploy(self, selected_gun: str):
         """
         Play weapon deploy sound sequence.
@@ -235,7 +288,7 @@ class AudioManager:
         if selected_gun in Config.WEAPONS_BOLTPULL:
             try:
                 # Play deploy sound and wait
-                deploy_sound = pygame.mixer.Sound(gun_deploy)
+                deploy_sound = self._load_sound(gun_deploy)
                 deploy_sound.play()
                 sleep(Config.BOLTPULL_DELAY)
 
@@ -244,7 +297,7 @@ class AudioManager:
                     "sounds/cs_weapons/deploy",
                     "m4a1_boltpull.wav"
                 )
-                boltpull_sound = pygame.mixer.Sound(m4_boltpull)
+                boltpull_sound = self._load_sound(m4_boltpull)
                 boltpull_sound.play()
             except pygame.error as e:
                 print(f"Error playing weapon deploy: {e}")
@@ -259,8 +312,4 @@ class AudioManager:
         Args:
             selected_gun: Selected gun name
         """
-        threading.Thread(
-            target=self.play_weapon_deploy,
-            args=(selected_gun,),
-            daemon=True
-        ).start()
+        self.runtime.submit(AUDIO_QUEUE, self.play_weapon_deploy, selected_gun)
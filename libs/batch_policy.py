@@ -0,0 +1,174 @@
+"""
+AdaptiveBatchPolicy class for Half-Life VOX TimeLEFT application.
+Decides when the clickstream uploader should send a batch and how big it is.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from libs.config import Config
+
+
+class AdaptiveBatchPolicy:
+    """
+    Size-, bytes- and linger-driven batching with an adaptive batch size.
+
+    A batch is sent as soon as one of these holds:
+    - the pending events reach the current batch size
+    - the pending bytes reach max_bytes
+    - the oldest pending event has waited for linger seconds
+
+    The batch size follows the observed event rate and insert latency,
+    so bursts produce fewer, larger inserts while idle sessions are still
+    flushed within the linger time. The rate decays while no events
+    arrive, so a batch size grown during a burst shrinks again when idle.
+    """
+
+    SMOOTHING = 0.3  # Weight of the newest sample in moving averages
+    RATE_WINDOW = 1.0  # Seconds per event rate sample
+
+    def __init__(
+        self,
+        min_batch: int = Config.CLICKSTREAM_BATCH_SIZE,
+        max_batch: int = Config.CLICKSTREAM_MAX_BATCH_SIZE,
+        max_bytes: int = Config.CLICKSTREAM_MAX_BATCH_BYTES,
+        linger: float = Config.CLICKSTREAM_LINGER_SECONDS,
+        insert_interval: float = Config.CLICKSTREAM_TARGET_INSERT_INTERVAL,
+        concurrency: int = 1
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            min_batch: Smallest batch size (used when idle)
+            max_batch: Largest batch size
+            max_bytes: Encoded size that triggers a send
+            linger: Maximum seconds an event waits before being sent
+            insert_interval: Preferred minimum seconds between inserts under load
+            concurrency: Number of inserts that may run at the same time
+        """
+        self.min_batch = min_batch
+        self.max_batch = max(max_batch, min_batch)
+        self.max_bytes = max_bytes
+        self.linger = linger
+        self.insert_interval = insert_interval
+        self.concurrency = max(1, concurrency)
+
+        self.batch_size = min_batch
+        self.event_rate = 0.0
+        self.insert_latency = 0.0
+
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_events = 0
+
+    def record_events(self, count: int, now: Optional[float] = None):
+        """
+        Record events arriving in the spool.
+
+        Args:
+            count: Number of events
+            now: Current monotonic time (optional)
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._window_events += count
+            elapsed = now - self._window_start
+            # Sample early during bursts so the batch size grows in time
+            if self._window_events >= self.max_batch and 0 < elapsed < self.RATE_WINDOW:
+                self._update_rate(self._window_events / elapsed)
+                self._window_events = 0
+                self._window_start = now
+            else:
+                self._close_window(now)
+
+    def record_insert(self, count: int, latency: float):
+        """
+        Record a completed insert.
+
+        Args:
+            count: Number of events in the batch
+            latency: Seconds the insert took
+        """
+        with self._lock:
+            self.insert_latency = self._smooth(self.insert_latency, latency)
+            self._resize()
+
+    def should_flush(self, pending: int, pending_bytes: int, oldest_age: float,
+                     now: Optional[float] = None) -> bool:
+        """
+        Check whether a batch should be sent now.
+
+        Args:
+            pending: Number of events waiting to be sent
+            pending_bytes: Encoded size of the waiting events
+            oldest_age: Seconds the oldest waiting event has waited
+            now: Current monotonic time (optional)
+
+        Returns:
+            True if a batch should be sent
+        """
+        self._decay(now)
+        if pending <= 0:
+            return False
+        return (pending >= self.batch_size or
+                pending_bytes >= self.max_bytes or
+                oldest_age >= self.linger)
+
+    def time_until_flush(self, pending: int, oldest_age: float,
+                         now: Optional[float] = None) -> Optional[float]:
+        """
+        Get how long until the linger time forces a send.
+
+        Args:
+            pending: Number of events waiting to be sent
+            oldest_age: Seconds the oldest waiting event has waited
+            now: Current monotonic time (optional)
+
+        Returns:
+            Seconds to wait, or None if nothing is pending
+        """
+        self._decay(now)
+        if pending <= 0:
+            return None
+        return max(0.0, self.linger - oldest_age)
+
+    def _decay(self, now: Optional[float]):
+        """Close rate windows that ended without events."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._close_window(now)
+
+    def _close_window(self, now: float):
+        # Every whole window since the last sample counts as one sample,
+        # so the rate falls off as fast after a long idle stretch as it
+        # would have with events arriving
+        elapsed = now - self._window_start
+        if elapsed < self.RATE_WINDOW:
+            return
+        rate = self._window_events / elapsed
+        if self.event_rate == 0.0:
+            self.event_rate = rate
+        else:
+            keep = (1 - self.SMOOTHING) ** (elapsed / self.RATE_WINDOW)
+            self.event_rate = rate + keep * (self.event_rate - rate)
+        self._resize()
+        self._window_events = 0
+        self._window_start = now
+
+    def _update_rate(self, rate: float):
+        self.event_rate = self._smooth(self.event_rate, rate)
+        self._resize()
+
+    def _resize(self):
+        # Cover the events arriving during one insert interval, or during
+        # two inserts (spread over the concurrent slots) if slower than that
+        window = max(self.insert_interval, 2 * self.insert_latency / self.concurrency)
+        target = int(self.event_rate * window)
+        self.batch_size = min(self.max_batch, max(self.min_batch, target))
+
+    def _smooth(self, average: float, sample: float) -> float:
+        if average == 0.0:
+            return sample
+        return average + self.SMOOTHING * (sample - average)
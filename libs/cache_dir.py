@@ -0,0 +1,38 @@
+"""
+Cache directory utility for Half-Life VOX TimeLEFT application.
+Locates the per-user directory for spooled events and cached state.
+"""
+
+import os
+import platform
+from pathlib import Path
+
+APP_DIR_NAME = "hl-vox-timeleft"
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the per-user cache directory, creating it if needed.
+
+    Strategy:
+    1. HL_VOX_CACHE_DIR environment variable, if set
+    2. Platform cache location (LOCALAPPDATA, ~/Library/Caches, XDG_CACHE_HOME)
+
+    Returns:
+        Path to the application's cache directory
+    """
+    override = os.environ.get("HL_VOX_CACHE_DIR")
+    if override:
+        path = Path(override)
+    else:
+        system = platform.system()
+        if system == "Windows":
+            base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        elif system == "Darwin":
+            base = Path.home() / "Library" / "Caches"
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        path = Path(base) / APP_DIR_NAME
+
+    path.mkdir(parents=True, exist_ok=True)
+    return path
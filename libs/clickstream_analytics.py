@@ -0,0 +1,517 @@
+"""
+Offline clickstream analytics for Half-Life VOX TimeLEFT application.
+Streams spooled or exported NDJSON events in chunks and aggregates them with NumPy.
+
+Usage:
+    python -m libs.clickstream_analytics [PATH ...] [--chunk-size N] [--json]
+
+PATH may be a spool directory, an export or load staging directory, or
+individual .ndjson / .ndjson.gz files. Without a path the spool, export
+and load staging directories in the user cache dir are read.
+"""
+
+import argparse
+import ast
+import gzip
+import io
+import json
+import sys
+import time
+import warnings
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from libs.cache_dir import get_cache_dir
+from libs.event_rollup import ROLLUP_EVENT_TYPE
+from libs.event_spool import CURSOR_FILENAME, SEGMENT_SUFFIX
+
+EVENT_FILE_SUFFIXES = (".ndjson", ".ndjson.gz", ".ndjson.part")
+HEAT_CHARS = " .:-=+*#%@"
+FUNNEL_STAGES = ("session", "started", "paused", "resumed", "reset")
+DEFAULT_DIRECTORIES = ("clickstream_spool", "clickstream_export", "clickstream_load")
+
+
+def find_event_files(paths: Iterable[Path]) -> List[Tuple[Path, int]]:
+    """
+    Expand directories into the event files they contain.
+
+    In a spool directory, segments and bytes before the acknowledgement
+    cursor are skipped: those events were delivered to the sink (and may
+    be read again from an export) but stay on disk until their segment is
+    deleted.
+
+    Args:
+        paths: Files or directories
+
+    Returns:
+        (file, byte offset to start reading at) in name order per directory
+    """
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            cursor = _read_spool_cursor(path)
+            for p in sorted(p for p in path.iterdir() if p.name.endswith(EVENT_FILE_SUFFIXES)):
+                segment = _spool_segment(p) if cursor else None
+                if segment is None:
+                    files.append((p, 0))
+                elif segment >= cursor[0]:
+                    files.append((p, cursor[1] if segment == cursor[0] else 0))
+        elif path.exists():
+            files.append((path, 0))
+    return files
+
+
+def _read_spool_cursor(directory: Path) -> Optional[Tuple[int, int]]:
+    """Get a spool directory's (segment, offset) cursor, or None if it has none."""
+    try:
+        with open(directory / CURSOR_FILENAME, "r") as f:
+            data = json.load(f)
+        return int(data["segment"]), int(data["offset"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _spool_segment(path: Path) -> Optional[int]:
+    """Get the segment number of a spool segment file, or None for other files."""
+    stem = path.name[:-len(SEGMENT_SUFFIX)] if path.name.endswith(SEGMENT_SUFFIX) else ""
+    return int(stem) if stem.isdigit() else None
+
+
+def iter_chunks(files: Iterable[Tuple[Path, int]], chunk_size: int) -> Iterator[List[dict]]:
+    """
+    Read events from files in fixed-size chunks.
+
+    Args:
+        files: (NDJSON file, byte offset) pairs from find_event_files();
+            files named .gz are gzip-compressed and read from the start
+        chunk_size: Events per chunk
+
+    Yields:
+        Lists of up to chunk_size event dictionaries
+    """
+    for path, offset in files:
+        try:
+            with open(path, "rb") as raw:
+                if path.suffix == ".gz":
+                    f = io.BufferedReader(gzip.GzipFile(fileobj=raw))
+                else:
+                    raw.seek(offset)
+                    f = raw
+                while True:
+                    lines = list(islice(f, chunk_size))
+                    if not lines:
+                        break
+                    yield _decode_lines(lines)
+        except (OSError, EOFError) as e:
+            print(f"Warning: Skipping unreadable file {path}: {e}", file=sys.stderr)
+
+
+def _decode_lines(lines: List[bytes]) -> List[dict]:
+    """Decode NDJSON lines, skipping torn or corrupt ones."""
+    lines = [line for line in lines if line.strip()]
+    try:
+        # One decoder call per chunk is several times faster than one per line
+        return json.loads(b"[" + b",".join(lines) + b"]")
+    except ValueError:
+        pass
+    events = []
+    for line in lines:
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events
+
+
+def parse_metadata(value) -> dict:
+    """
+    Decode event metadata.
+
+    Args:
+        value: JSON string, a str(dict) string from older versions, or None
+
+    Returns:
+        Metadata dictionary (empty if missing or unreadable)
+    """
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        pass
+    try:
+        decoded = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return {}
+    return decoded if isinstance(decoded, dict) else {}
+
+
+def parse_duration(value) -> float:
+    """
+    Parse a HH:MM:SS timer input.
+
+    Args:
+        value: Timer input string
+
+    Returns:
+        Seconds, or infinity if it cannot be parsed
+    """
+    try:
+        hours, minutes, seconds = (int(part) for part in str(value).split(":"))
+    except ValueError:
+        return float("inf")
+    return float(hours * 3600 + minutes * 60 + seconds)
+
+
+class _Codes:
+    """Interns strings to consecutive integer codes."""
+
+    def __init__(self):
+        self.index = {}
+        self.names = []
+
+    def code(self, name: str) -> int:
+        code = self.index.get(name)
+        if code is None:
+            code = self.index[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class _FocusState:
+    """Timer state of one session while its events stream past."""
+
+    __slots__ = ("running_since", "budget", "total", "paused", "resumed", "reset")
+
+    def __init__(self):
+        self.running_since = None
+        self.budget = 0.0
+        self.total = 0.0
+        self.paused = False
+        self.resumed = False
+        self.reset = False
+
+    def stop(self, now: float):
+        if self.running_since is not None:
+            spent = min(max(0.0, now - self.running_since), self.budget)
+            self.total += spent
+            self.budget -= spent
+            self.running_since = None
+
+
+class ClickstreamAnalyzer:
+    """
+    Chunked aggregation of clickstream events.
+
+    Memory grows with the number of sessions and components, not with the
+    number of events. Clicks are aggregated per chunk with NumPy; only the
+    rare timer lifecycle events (start, pause, reset) go through a
+    per-session state machine for focus time and the funnel.
+    """
+
+    def __init__(self):
+        """Initialize empty aggregates."""
+        self.sessions = _Codes()
+        self.components = _Codes()
+        self.events = 0
+        self.first_seen = np.zeros(0)
+        self.last_seen = np.zeros(0)
+        self.started = np.zeros(0, dtype=bool)
+        self.heatmap = np.zeros((0, 24), dtype=np.int64)
+        self.focus: Dict[int, _FocusState] = {}
+
+    def add_chunk(self, events: List[dict]):
+        """
+        Aggregate one chunk of events.
+
+        Args:
+            events: Event dictionaries from iter_chunks()
+        """
+        if not events:
+            return
+
+        session_codes = self._factorize(self.sessions, [e.get("session_id") or "" for e in events])
+        component_codes = self._factorize(self.components, [e.get("component") or "" for e in events])
+        parsed = _parse_timestamps([e.get("timestamp") for e in events])
+        valid = ~np.isnat(parsed)
+        timestamps = parsed.astype(np.int64) / 1e6
+
+        # Collapsed bursts and rollup rows stand for several clicks
+        weights = _event_weights(events)
+
+        self._grow()
+        self.events += int(weights.sum())
+
+        # Session length: first and last event per session
+        np.minimum.at(self.first_seen, session_codes[valid], timestamps[valid])
+        np.maximum.at(self.last_seen, session_codes[valid], timestamps[valid])
+
+        # Heatmap: weighted clicks per component and hour of day (UTC)
+        hours = (timestamps[valid] // 3600 % 24).astype(np.int64)
+        np.add.at(self.heatmap, (component_codes[valid], hours), weights[valid])
+
+        # Lifecycle events, in time order
+        lifecycle = [
+            i for i, e in enumerate(events)
+            if valid[i] and (e.get("event_type") == "timer_finished" or (
+                e.get("component") in ("start_button", "pause_button", "reset_button")
+                and e.get("event_type") == "button_click"))
+        ]
+        lifecycle.sort(key=lambda i: timestamps[i])
+        for i in lifecycle:
+            self._apply_lifecycle(int(session_codes[i]), events[i], float(timestamps[i]))
+
+    def report(self) -> dict:
+        """
+        Build the report.
+
+        Returns:
+            Dictionary with totals, session lengths, focus time, funnel and heatmap
+        """
+        sessions = len(self.sessions)
+        seen = np.isfinite(self.first_seen)
+        lengths = (self.last_seen - self.first_seen)[seen] / 60
+
+        focus_minutes = np.zeros(sessions)
+        for code, state in self.focus.items():
+            # Sessions whose timer was still running end at their last event
+            running_since, budget, total = state.running_since, state.budget, state.total
+            if running_since is not None:
+                total += min(max(0.0, self.last_seen[code] - running_since), budget)
+            focus_minutes[code] = total / 60
+
+        paused = np.zeros(sessions, dtype=bool)
+        resumed = np.zeros(sessions, dtype=bool)
+        reset = np.zeros(sessions, dtype=bool)
+        for code, state in self.focus.items():
+            paused[code], resumed[code], reset[code] = state.paused, state.resumed, state.reset
+        funnel_flags = [np.ones(sessions, dtype=bool), self.started, paused, resumed, reset]
+        funnel = {}
+        reached = np.ones(sessions, dtype=bool)
+        for stage, flags in zip(FUNNEL_STAGES, funnel_flags):
+            reached &= flags
+            funnel[stage] = int(reached.sum())
+
+        return {
+            "events": self.events,
+            "sessions": sessions,
+            "first_event": _format_time(self.first_seen[seen].min()) if seen.any() else None,
+            "last_event": _format_time(self.last_seen[seen].max()) if seen.any() else None,
+            "session_minutes": _describe(lengths),
+            "focus_minutes": {
+                "total": float(focus_minutes.sum()),
+                **_describe(focus_minutes[self.started]),
+            },
+            "funnel": funnel,
+            "heatmap": {
+                name: self.heatmap[code].tolist()
+                for code, name in enumerate(self.components.names)
+            },
+        }
+
+    @staticmethod
+    def _factorize(codes: _Codes, values: List[str]) -> np.ndarray:
+        """Map values to global codes, interning only the distinct ones."""
+        distinct, inverse = np.unique(np.array(values, dtype=str), return_inverse=True)
+        mapping = np.fromiter((codes.code(value) for value in distinct),
+                              dtype=np.int64, count=len(distinct))
+        return mapping[inverse]
+
+    def _grow(self):
+        sessions = len(self.sessions)
+        if sessions > len(self.first_seen):
+            extra = sessions - len(self.first_seen)
+            self.first_seen = np.concatenate([self.first_seen, np.full(extra, np.inf)])
+            self.last_seen = np.concatenate([self.last_seen, np.full(extra, -np.inf)])
+            self.started = np.concatenate([self.started, np.zeros(extra, dtype=bool)])
+        components = len(self.components)
+        if components > len(self.heatmap):
+            extra = np.zeros((components - len(self.heatmap), 24), dtype=np.int64)
+            self.heatmap = np.vstack([self.heatmap, extra])
+
+    def _apply_lifecycle(self, session: int, event: dict, now: float):
+        state = self.focus.get(session)
+        if state is None:
+            state = self.focus[session] = _FocusState()
+        component = event["component"]
+        metadata = parse_metadata(event.get("metadata"))
+
+        if event.get("event_type") == "timer_finished":
+            state.stop(now)
+            state.budget = 0.0
+        elif component == "start_button":
+            state.stop(now)
+            state.running_since = now
+            state.budget = parse_duration(metadata.get("time_input"))
+            self.started[session] = True
+        elif component == "pause_button":
+            if metadata.get("is_paused", True):
+                state.stop(now)
+                state.paused = True
+            elif state.budget > 0 and state.running_since is None:
+                state.running_since = now
+                state.resumed = True
+        else:
+            state.stop(now)
+            state.budget = 0.0
+            state.reset = True
+
+
+def _parse_timestamps(values: List[Optional[str]]) -> np.ndarray:
+    """Parse ISO timestamps to datetime64[us]; unreadable ones become NaT."""
+    with warnings.catch_warnings():
+        # Timezone suffixes warn; treat that like a parse failure
+        warnings.simplefilter("error")
+        try:
+            return np.array(values, dtype="datetime64[us]")
+        except (ValueError, Warning):
+            pass
+
+    parsed = np.full(len(values), np.datetime64("NaT", "us"))
+    for i, value in enumerate(values):
+        if not value:
+            continue
+        if value.endswith("Z"):
+            value = value[:-1]
+        elif value.endswith("+00:00"):
+            value = value[:-6]
+        try:
+            parsed[i] = np.datetime64(value, "us")
+        except ValueError:
+            continue
+    return parsed
+
+
+def _event_weights(events: List[dict]) -> np.ndarray:
+    """
+    Number of clicks each event stands for.
+
+    Rollup rows count the events not also kept as raw rows (those are
+    counted from the raw rows); collapsed bursts count burst_count. Only
+    rows whose metadata can hold one of those keys are decoded.
+    """
+    event_types = np.array([e.get("event_type") or "" for e in events], dtype=object)
+    metadata = [e.get("metadata") or "" for e in events]
+    weights = np.ones(len(events), dtype=np.int64)
+
+    for i in np.flatnonzero(event_types == ROLLUP_EVENT_TYPE):
+        decoded = parse_metadata(metadata[i])
+        weights[i] = max(0, int(decoded.get("count", 1)) - int(decoded.get("raw", 0)))
+
+    # A quick scan for the key's name, then the exact key in the decoded metadata
+    bursts = [i for i, value in enumerate(metadata)
+              if "burst_count" in value and event_types[i] != ROLLUP_EVENT_TYPE]
+    for i in bursts:
+        decoded = parse_metadata(metadata[i])
+        if "burst_count" in decoded:
+            weights[i] = int(decoded["burst_count"])
+    return weights
+
+
+def _describe(values: np.ndarray) -> dict:
+    if not len(values):
+        return {"mean": 0.0, "median": 0.0, "p90": 0.0, "max": 0.0}
+    return {
+        "mean": float(values.mean()),
+        "median": float(np.median(values)),
+        "p90": float(np.percentile(values, 90)),
+        "max": float(values.max()),
+    }
+
+
+def _format_time(seconds: float) -> str:
+    return str(np.datetime64(int(seconds * 1e6), "us"))
+
+
+def analyze(paths: Iterable[Path], chunk_size: int = 20000) -> dict:
+    """
+    Analyze event files.
+
+    Args:
+        paths: Files or directories to read
+        chunk_size: Events held in memory at a time
+
+    Returns:
+        Report dictionary (see ClickstreamAnalyzer.report)
+    """
+    analyzer = ClickstreamAnalyzer()
+    for chunk in iter_chunks(find_event_files(paths), chunk_size):
+        analyzer.add_chunk(chunk)
+    return analyzer.report()
+
+
+def print_report(report: dict):
+    """
+    Print a report as text.
+
+    Args:
+        report: Result of analyze()
+    """
+    print(f"Events:   {report['events']}")
+    print(f"Sessions: {report['sessions']}")
+    if report["first_event"]:
+        print(f"Range:    {report['first_event']} .. {report['last_event']} UTC")
+
+    lengths = report["session_minutes"]
+    print(f"\nSession length (min): mean {lengths['mean']:.1f}  median {lengths['median']:.1f}  "
+          f"p90 {lengths['p90']:.1f}  max {lengths['max']:.1f}")
+    focus = report["focus_minutes"]
+    print(f"Focus time (min):     total {focus['total']:.1f}  mean {focus['mean']:.1f}  "
+          f"median {focus['median']:.1f}  per session with a started timer")
+
+    print("\nFunnel:")
+    sessions = report["funnel"]["session"] or 1
+    for stage, count in report["funnel"].items():
+        print(f"  {stage:10} {count:8}  {100 * count / sessions:5.1f}%")
+
+    print("\nClicks per component by hour of day (UTC):")
+    print(f"  {'':26} {''.join(str(h % 10) for h in range(24))}   total")
+    for name, hours in sorted(report["heatmap"].items(), key=lambda item: -sum(item[1])):
+        peak = max(hours) or 1
+        cells = "".join(HEAT_CHARS[min(len(HEAT_CHARS) - 1, round(c / peak * (len(HEAT_CHARS) - 1)))]
+                        for c in hours)
+        print(f"  {name[:26]:26} {cells}   {sum(hours)}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Offline clickstream analytics")
+    parser.add_argument("paths", nargs="*", type=Path,
+                        help="spool/export directories or NDJSON files")
+    parser.add_argument("--chunk-size", type=int, default=20000,
+                        help="events held in memory at a time")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [get_cache_dir() / name for name in DEFAULT_DIRECTORIES]
+    started = time.perf_counter()
+    report = analyze(paths, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        print(f"\nAnalyzed in {elapsed:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Clickstream event encoding for Half-Life VOX TimeLEFT application.
+Compact records on the UI thread, warehouse rows on the worker thread.
+
+track_event() only builds a tuple:
+
+    (monotonic_time, event_type, component, metadata)
+
+EventEncoder turns those tuples into rows on the worker thread: it adds the
+per-session constants, converts the monotonic time to a UTC timestamp and
+serializes metadata to JSON. EventQueue hands the records over.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Field positions in a compact event record
+MONOTONIC = 0
+EVENT_TYPE = 1
+COMPONENT = 2
+METADATA = 3
+
+EventRecord = Tuple[float, str, str, Optional[Dict[str, Any]]]
+
+
+class EventEncoder:
+    """
+    Converts compact event records into clickstream rows.
+
+    The wall-clock time of a record is derived from its monotonic time and
+    an epoch offset taken once, so timestamps stay ordered even if the
+    system clock is adjusted during the session.
+    """
+
+    def __init__(self, user_id: str, session_id: str, app_version: str):
+        """
+        Initialize the encoder.
+
+        Args:
+            user_id: Hashed machine identifier
+            session_id: Session UUID
+            app_version: Application version
+        """
+        self.user_id = user_id
+        self.session_id = session_id
+        self.app_version = app_version
+        self.epoch_offset = time.time() - time.monotonic()
+
+    def encode(self, record: EventRecord) -> dict:
+        """
+        Build the row for one record.
+
+        Args:
+            record: (monotonic_time, event_type, component, metadata)
+
+        Returns:
+            Row dictionary matching the clickstream schema
+        """
+        monotonic, event_type, component, metadata = record
+        timestamp = datetime.fromtimestamp(self.epoch_offset + monotonic, timezone.utc)
+        return {
+            "user_id": self.user_id,
+            "session_id": self.session_id,
+            "app_version": self.app_version,
+            "timestamp": timestamp.replace(tzinfo=None).isoformat(),
+            "event_type": event_type,
+            "component": component,
+            "metadata": encode_metadata(metadata)
+        }
+
+    def encode_all(self, records: Iterable[EventRecord]) -> List[dict]:
+        """
+        Build rows for several records.
+
+        Args:
+            records: Compact event records
+
+        Returns:
+            List of row dictionaries
+        """
+        return [self.encode(record) for record in records]
+
+
+class EventQueue:
+    """
+    Bounded single-consumer queue with a lock-free put.
+
+    A drop-in for the subset of queue.Queue the tracker uses. put_nowait()
+    is a length check and a deque append (both atomic under the GIL), and
+    only touches the wake-up event when the consumer may be waiting. With
+    several producers the bound can be exceeded by a few items.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of queued items
+        """
+        self.maxsize = maxsize
+        self._items = deque()
+        self._ready = threading.Event()
+        self._closed = False
+
+    def put_nowait(self, item):
+        """
+        Add an item without blocking.
+
+        Raises:
+            queue.Full: If the queue holds maxsize items
+        """
+        if len(self._items) >= self.maxsize:
+            raise queue.Full
+        self._items.append(item)
+        if not self._ready.is_set():
+            self._ready.set()
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        Remove and return the oldest item, waiting up to timeout seconds.
+
+        Raises:
+            queue.Empty: If no item arrived in time
+        """
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+            self._ready.clear()
+            # An item appended before the clear did not set the event
+            if self._items:
+                continue
+            if self._closed or not self._ready.wait(timeout):
+                raise queue.Empty
+
+    def close(self):
+        """Wake the consumer; from now on get() does not wait on an empty queue."""
+        self._closed = True
+        self._ready.set()
+
+    def get_nowait(self):
+        """
+        Remove and return the oldest item.
+
+        Raises:
+            queue.Empty: If the queue is empty
+        """
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise queue.Empty from None
+
+    def qsize(self) -> int:
+        """Get the number of queued items."""
+        return len(self._items)
+
+    def empty(self) -> bool:
+        """Check whether the queue is empty."""
+        return not self._items
+
+
+def encode_metadata(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Serialize event metadata to a JSON string.
+
+    Args:
+        metadata: Metadata dictionary (or None)
+
+    Returns:
+        Compact JSON, or None if there is no metadata
+    """
+    if not metadata:
+        return None
+    return json.dumps(metadata, separators=(",", ":"), default=str)
@@ -0,0 +1,369 @@
+"""
+Load-job upload path for Half-Life VOX TimeLEFT clickstream events.
+Compacts batches into large gzip NDJSON files and submits them as BigQuery load jobs.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from libs.clickstream_sinks import ClickstreamSink
+from libs.config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+STAGING_SUFFIX = ".ndjson.part"
+READY_SUFFIX = ".ndjson.gz"
+FAILED_SUFFIX = ".failed"
+LOCK_FILENAME = "staging.lock"
+
+
+class LoadJobSubmitter(ABC):
+    """Base class for destinations that accept whole NDJSON files."""
+
+    name = "submitter"
+
+    def connect(self) -> bool:
+        """
+        Prepare the submitter.
+
+        Returns:
+            True if ready, False otherwise
+        """
+        return True
+
+    @abstractmethod
+    def submit(self, path: Path) -> Optional[bool]:
+        """
+        Load one gzip NDJSON file.
+
+        Args:
+            path: File to load
+
+        Returns:
+            True if loaded, False on a transient error (retried later),
+            None if the file was rejected and must not be retried
+        """
+
+
+class BigQueryLoadSubmitter(LoadJobSubmitter):
+    """Submits files as BigQuery batch load jobs."""
+
+    name = "bigquery"
+
+    def __init__(self, project_id: str, dataset_id: str, table_id: str):
+        """
+        Initialize the submitter.
+
+        Args:
+            project_id: GCP project ID
+            dataset_id: BigQuery dataset ID
+            table_id: BigQuery table ID
+        """
+        self.project_id = project_id
+        self.table_ref = f"{project_id}.{dataset_id}.{table_id}"
+        self.client = None
+        self._job_config = None
+
+    def connect(self) -> bool:
+        """Import the BigQuery library, create the client and job config."""
+        try:
+            from google.cloud import bigquery
+            from libs.clickstream_schema import bigquery_schema
+
+            self.client = bigquery.Client(project=self.project_id)
+            self._job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                schema=bigquery_schema(),
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            )
+            return True
+        except Exception as e:
+            print(f"Warning: Failed to initialize BigQuery load jobs: {e}")
+            return False
+
+    def submit(self, path: Path) -> Optional[bool]:
+        """Run a load job for the file and wait for it to finish."""
+        from google.api_core import exceptions
+
+        try:
+            with open(path, "rb") as f:
+                job = self.client.load_table_from_file(
+                    f, self.table_ref, job_config=self._job_config
+                )
+            job.result(timeout=Config.CLICKSTREAM_LOAD_JOB_TIMEOUT)
+            print(f"Loaded {job.output_rows} events to BigQuery from {path.name}")
+            return True
+        except exceptions.BadRequest as e:
+            print(f"BigQuery rejected {path.name}: {e}")
+            return None
+        except exceptions.NotFound:
+            print(f"Error: BigQuery table {self.table_ref} not found. "
+                  f"Run setup_bigquery.py to create it.")
+            return False
+        except Exception as e:
+            print(f"Error running BigQuery load job for {path.name}: {e}")
+            return False
+
+
+class FakeLoadSubmitter(LoadJobSubmitter):
+    """
+    In-process submitter for tests.
+
+    Reads each submitted file and keeps its rows, with injectable latency
+    and failures.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = Config.CLICKSTREAM_FAKE_LATENCY,
+        fail_calls: Optional[List[int]] = None,
+        reject_calls: Optional[List[int]] = None
+    ):
+        """
+        Initialize the submitter.
+
+        Args:
+            latency: Seconds each load job takes
+            fail_calls: Call numbers (starting at 1) that fail transiently
+            reject_calls: Call numbers (starting at 1) whose file is rejected
+        """
+        self.latency = latency
+        self.fail_calls = set(fail_calls or ())
+        self.reject_calls = set(reject_calls or ())
+        self.lock = threading.Lock()
+        self.jobs = []  # (call number, file name, rows, result)
+        self.rows = []
+
+    def submit(self, path: Path) -> Optional[bool]:
+        """Record the file's rows, failing as configured."""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with gzip.open(path, "rb") as f:
+            rows = [json.loads(line) for line in f]
+
+        with self.lock:
+            call = len(self.jobs) + 1
+            if call in self.reject_calls:
+                result = None
+            else:
+                result = call not in self.fail_calls
+            self.jobs.append((call, path.name, len(rows), result))
+            if result:
+                self.rows.extend(rows)
+        return result
+
+
+class LoadJobSink(ClickstreamSink):
+    """
+    Sink that lands events through periodic load jobs instead of streaming inserts.
+
+    Batches are appended (and fsynced) to an uncompressed staging file, so
+    the tracker's spool can acknowledge them right away. Once the staging
+    file reaches file_bytes or has been open for interval seconds it is
+    compacted into a gzip NDJSON file, which a background thread submits as
+    a load job and deletes once loaded. Files left over from a previous run
+    are picked up on connect.
+
+    The staging directory is locked while the sink is connected, so a
+    second instance never compacts another's open staging file or submits
+    the same ready file twice.
+    """
+
+    name = "bigquery_load"
+
+    def __init__(
+        self,
+        submitter: LoadJobSubmitter,
+        staging_dir: Path,
+        file_bytes: int = Config.CLICKSTREAM_LOAD_FILE_BYTES,
+        interval: float = Config.CLICKSTREAM_LOAD_INTERVAL
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            submitter: Destination for compacted files
+            staging_dir: Directory for staging and compacted files
+            file_bytes: Uncompressed size at which a file is compacted
+            interval: Maximum seconds a staging file stays open
+        """
+        self.submitter = submitter
+        self.staging_dir = Path(staging_dir)
+        self.file_bytes = file_bytes
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.submit_lock = threading.Lock()
+
+        self._staging = None
+        self._staging_path = None
+        self._staging_opened = 0.0
+        self._sequence = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock_file = None
+
+    def connect(self) -> bool:
+        """Lock the staging directory, recover leftover files and start submitting."""
+        try:
+            self.staging_dir.mkdir(parents=True, exist_ok=True)
+            self._lock_file = self._acquire_lock()
+            for path in sorted(self.staging_dir.glob("*" + STAGING_SUFFIX)):
+                self._compact(path)
+        except OSError as e:
+            print(f"Warning: Cannot prepare clickstream load staging: {e}")
+            self._release_lock()
+            return False
+
+        if not self.submitter.connect():
+            self._release_lock()
+            return False
+
+        self._thread = threading.Thread(target=self._submit_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def insert(self, events: List[dict]) -> bool:
+        """Append the batch to the staging file."""
+        data = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        encoded = data.encode("utf-8")
+
+        with self.lock:
+            try:
+                if self._staging is None:
+                    self._open_staging()
+                self._staging.write(encoded)
+                self._staging.flush()
+                os.fsync(self._staging.fileno())
+            except OSError as e:
+                print(f"Error writing clickstream load staging: {e}")
+                return False
+
+            if self._staging.tell() >= self.file_bytes:
+                self._rotate()
+        return True
+
+    def close(self):
+        """
+        Stop the submit thread and close the staging file.
+
+        Unsubmitted files stay on disk and are loaded on the next start.
+        """
+        self._stop.set()
+        with self.lock:
+            if self._staging is not None:
+                self._staging.close()
+                self._staging = None
+
+        # A load job still running keeps the directory locked until exit
+        if self.submit_lock.acquire(blocking=False):
+            try:
+                self._release_lock()
+            finally:
+                self.submit_lock.release()
+
+    def pending_files(self) -> List[Path]:
+        """Get compacted files waiting to be submitted, oldest first."""
+        return sorted(self.staging_dir.glob("*" + READY_SUFFIX))
+
+    def flush(self):
+        """Compact the staging file now and submit everything ready (blocking)."""
+        with self.lock:
+            self._rotate()
+        self._submit_ready()
+
+    def _acquire_lock(self):
+        if fcntl is None:
+            return None
+        lock_file = open(self.staging_dir / LOCK_FILENAME, "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise OSError(f"{self.staging_dir} is in use by another process")
+        return lock_file
+
+    def _release_lock(self):
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _open_staging(self):
+        self._sequence += 1
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        self._staging_path = self.staging_dir / f"clickstream-{stamp}-{self._sequence:04d}{STAGING_SUFFIX}"
+        self._staging = open(self._staging_path, "ab")
+        self._staging_opened = time.monotonic()
+
+    def _rotate(self):
+        if self._staging is None:
+            return
+        self._staging.close()
+        self._staging = None
+        self._compact(self._staging_path)
+
+    def _compact(self, path: Path):
+        """Compress a staging file into a ready file and remove the original."""
+        with open(path, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                # Drop a line torn by a crash
+                f.truncate(content.rfind(b"\n") + 1)
+
+        if os.path.getsize(path):
+            ready_path = path.with_name(path.name[:-len(STAGING_SUFFIX)] + READY_SUFFIX)
+            tmp_path = ready_path.with_name(ready_path.name + ".tmp")
+            with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmp_path, ready_path)
+        os.remove(path)
+
+    def _submit_loop(self):
+        """Background thread compacting due staging files and submitting them."""
+        retry_delay = Config.CLICKSTREAM_RETRY_DELAY
+        while not self._stop.wait(min(self.interval, Config.CLICKSTREAM_LOAD_CHECK_INTERVAL)):
+            with self.lock:
+                if (self._staging is not None and
+                        time.monotonic() - self._staging_opened >= self.interval):
+                    self._rotate()
+
+            if self._submit_ready():
+                retry_delay = Config.CLICKSTREAM_RETRY_DELAY
+                continue
+
+            # Back off until the destination is reachable again
+            self._stop.wait(retry_delay)
+            retry_delay = min(retry_delay * 2, Config.CLICKSTREAM_MAX_RETRY_DELAY)
+
+    def _submit_ready(self) -> bool:
+        """
+        Submit ready files oldest first.
+
+        Returns:
+            False if a submission failed transiently, True otherwise
+        """
+        with self.submit_lock:
+            for path in self.pending_files():
+                if self._stop.is_set():
+                    break
+                result = self.submitter.submit(path)
+                if result is False:
+                    return False
+                if result is None:
+                    os.replace(path, path.with_name(path.name + FAILED_SUFFIX))
+                else:
+                    os.remove(path)
+            return True
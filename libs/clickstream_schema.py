@@ -0,0 +1,44 @@
+"""
+Clickstream table schema for Half-Life VOX TimeLEFT application.
+Shared by setup_bigquery.py, the streaming and load-job uploaders and the local sinks.
+"""
+
+from typing import List
+
+# (name, BigQuery type, mode, description) in column order
+CLICKSTREAM_SCHEMA = (
+    ("user_id", "STRING", "REQUIRED",
+     "Hashed machine identifier for user tracking"),
+    ("session_id", "STRING", "REQUIRED",
+     "UUID identifying the application session"),
+    ("app_version", "STRING", "REQUIRED",
+     "Application version (SemVer format)"),
+    ("timestamp", "TIMESTAMP", "REQUIRED",
+     "Event timestamp (UTC)"),
+    ("event_type", "STRING", "REQUIRED",
+     "Type of event (e.g., button_click, timer_start)"),
+    ("component", "STRING", "REQUIRED",
+     "UI component that triggered the event"),
+    ("metadata", "STRING", "NULLABLE",
+     "Additional event metadata (JSON string)"),
+)
+
+EVENT_FIELDS = tuple(name for name, field_type, mode, description in CLICKSTREAM_SCHEMA)
+
+PARTITION_FIELD = "timestamp"
+CLUSTERING_FIELDS = ["user_id", "session_id", "event_type"]
+
+
+def bigquery_schema() -> List:
+    """
+    Build the schema as BigQuery SchemaField objects.
+
+    Returns:
+        List of google.cloud.bigquery.SchemaField
+    """
+    from google.cloud import bigquery
+
+    return [
+        bigquery.SchemaField(name, field_type, mode=mode, description=description)
+        for name, field_type, mode, description in CLICKSTREAM_SCHEMA
+    ]
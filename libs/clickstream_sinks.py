@@ -0,0 +1,362 @@
+"""
+Clickstream sink classes for Half-Life VOX TimeLEFT application.
+Destinations the ClickstreamTracker uploader delivers event batches to.
+"""
+
+import gzip
+import json
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from libs.cache_dir import get_cache_dir
+from libs.clickstream_schema import EVENT_FIELDS
+from libs.config import Config
+
+
+class ClickstreamSink(ABC):
+    """
+    Base class for clickstream destinations.
+
+    connect() runs once on the uploader thread; insert() may be called from
+    several insert threads at the same time and must be thread-safe.
+    """
+
+    name = "sink"
+
+    def connect(self) -> bool:
+        """
+        Prepare the sink (import libraries, open files, create clients).
+
+        Returns:
+            True if the sink is ready, False otherwise
+        """
+        return True
+
+    @abstractmethod
+    def insert(self, events: List[dict]) -> bool:
+        """
+        Deliver a batch of events.
+
+        Args:
+            events: Event rows in spool order
+
+        Returns:
+            True if the rows were delivered or permanently rejected,
+            False on a transient error (the batch is retried)
+        """
+
+    def close(self):
+        """Release resources held by the sink."""
+
+
+class BigQuerySink(ClickstreamSink):
+    """Streams batches into a BigQuery table with insert_rows_json."""
+
+    name = "bigquery"
+
+    def __init__(self, project_id: str, dataset_id: str, table_id: str):
+        """
+        Initialize the sink.
+
+        Args:
+            project_id: GCP project ID
+            dataset_id: BigQuery dataset ID
+            table_id: BigQuery table ID
+        """
+        self.project_id = project_id
+        self.table_ref = f"{project_id}.{dataset_id}.{table_id}"
+        self.client = None
+        self._bigquery = None
+
+    def connect(self) -> bool:
+        """Import the BigQuery library and create the client."""
+        try:
+            from google.cloud import bigquery
+            self._bigquery = bigquery
+            self.client = bigquery.Client(project=self.project_id)
+            return True
+        except Exception as e:
+            print(f"Warning: Failed to initialize BigQuery clickstream tracker: {e}")
+            return False
+
+    def insert(self, events: List[dict]) -> bool:
+        """Insert the batch with insert_rows_json."""
+        if not self.client:
+            return False
+
+        from google.api_core import exceptions
+
+        try:
+            errors = self.client.insert_rows_json(
+                self.table_ref,
+                events,
+                retry=self._bigquery.DEFAULT_RETRY
+            )
+
+            if errors:
+                print(f"BigQuery insert errors: {errors}")
+            else:
+                print(f"Successfully inserted {len(events)} events to BigQuery")
+            return True
+
+        except exceptions.NotFound:
+            print(f"Error: BigQuery table {self.table_ref} not found. "
+                  f"Run setup_bigquery.py to create it.")
+            return True
+        except Exception as e:
+            print(f"Error inserting to BigQuery: {e}")
+            return False
+
+
+class NdjsonFileSink(ClickstreamSink):
+    """
+    Appends batches to gzip-compressed NDJSON files.
+
+    A new file is started once the current one holds rotate_bytes of
+    uncompressed data. Each batch is appended as its own complete gzip
+    member (gzip readers concatenate members), so files stay readable if
+    the application is killed.
+    """
+
+    name = "ndjson"
+
+    def __init__(
+        self,
+        directory: Path,
+        rotate_bytes: int = Config.CLICKSTREAM_NDJSON_ROTATE_BYTES
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            directory: Directory the files are written to
+            rotate_bytes: Uncompressed size at which a new file is started
+        """
+        self.directory = Path(directory)
+        self.rotate_bytes = rotate_bytes
+        self.lock = threading.Lock()
+        self._file = None
+        self._written = 0
+        self._sequence = 0
+
+    def connect(self) -> bool:
+        """Create the output directory."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            return True
+        except OSError as e:
+            print(f"Warning: Cannot create clickstream export directory: {e}")
+            return False
+
+    def insert(self, events: List[dict]) -> bool:
+        """Append the batch to the current file."""
+        data = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        encoded = data.encode("utf-8")
+
+        with self.lock:
+            try:
+                if self._file is None or self._written >= self.rotate_bytes:
+                    self._open_next()
+                self._file.write(gzip.compress(encoded, compresslevel=6))
+                self._file.flush()
+                self._written += len(encoded)
+                return True
+            except OSError as e:
+                print(f"Error writing clickstream export: {e}")
+                self._close_file()
+                return False
+
+    def close(self):
+        """Close the current file."""
+        with self.lock:
+            self._close_file()
+
+    def _open_next(self):
+        self._close_file()
+        self._sequence += 1
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        path = self.directory / f"clickstream-{stamp}-{self._sequence:04d}.ndjson.gz"
+        self._file = open(path, "ab")
+        self._written = 0
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+class SqliteSink(ClickstreamSink):
+    """Inserts batches into a local SQLite database."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Path, table: str = "clickstream"):
+        """
+        Initialize the sink.
+
+        Args:
+            path: Database file
+            table: Table name
+        """
+        self.path = Path(path)
+        self.table = table
+        self.lock = threading.Lock()
+        self._connection = None
+
+    def connect(self) -> bool:
+        """Open the database and create the table."""
+        import sqlite3
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            columns = ", ".join(f"{field} TEXT" for field in EVENT_FIELDS)
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({columns})")
+            self._connection.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Warning: Cannot open clickstream database {self.path}: {e}")
+            return False
+
+    def insert(self, events: List[dict]) -> bool:
+        """Insert the batch in one transaction."""
+        import sqlite3
+
+        rows = [tuple(event.get(field) for field in EVENT_FIELDS) for event in events]
+        placeholders = ", ".join("?" for _ in EVENT_FIELDS)
+        with self.lock:
+            try:
+                with self._connection:
+                    self._connection.executemany(
+                        f"INSERT INTO {self.table} VALUES ({placeholders})", rows
+                    )
+                return True
+            except sqlite3.Error as e:
+                print(f"Error inserting to clickstream database: {e}")
+                return False
+
+    def close(self):
+        """Close the database."""
+        with self.lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class FakeSink(ClickstreamSink):
+    """
+    In-process sink for tests and benchmarks.
+
+    Records every call and keeps delivered rows in memory. Latency and
+    failures can be injected to exercise the batching and retry path.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = Config.CLICKSTREAM_FAKE_LATENCY,
+        failure_rate: float = Config.CLICKSTREAM_FAKE_FAILURE_RATE,
+        fail_calls: Optional[List[int]] = None,
+        connect_ok: bool = True,
+        seed: Optional[int] = None,
+        keep_rows: bool = True
+    ):
+        """
+        Initialize the sink.
+
+        Args:
+            latency: Seconds each insert takes
+            failure_rate: Probability that an insert fails transiently
+            fail_calls: Call numbers (starting at 1) that always fail
+            connect_ok: Result returned by connect()
+            seed: Random seed for reproducible failures
+            keep_rows: Keep delivered rows in rows (off for long load runs;
+                delivered still counts them)
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail_calls = set(fail_calls or ())
+        self.connect_ok = connect_ok
+        self.lock = threading.Lock()
+        self.keep_rows = keep_rows
+        self.calls = []  # (call number, batch size, delivered)
+        self.rows = []
+        self.delivered = 0
+        self._random = random.Random(seed)
+
+    def connect(self) -> bool:
+        """Return the configured connect result."""
+        return self.connect_ok
+
+    def insert(self, events: List[dict]) -> bool:
+        """Record the batch, failing as configured."""
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self.lock:
+            call = len(self.calls) + 1
+            delivered = (call not in self.fail_calls and
+                         self._random.random() >= self.failure_rate)
+            self.calls.append((call, len(events), delivered))
+            if delivered:
+                self.delivered += len(events)
+                if self.keep_rows:
+                    self.rows.extend(events)
+        return delivered
+
+
+def create_sink(
+    kind: str = Config.CLICKSTREAM_SINK,
+    project_id: str = Config.CLICKSTREAM_PROJECT_ID,
+    dataset_id: str = Config.CLICKSTREAM_DATASET_ID,
+    table_id: str = Config.CLICKSTREAM_TABLE_ID,
+    directory: Optional[str] = Config.CLICKSTREAM_SINK_DIR
+) -> ClickstreamSink:
+    """
+    Create a sink by name.
+
+    Args:
+        kind: "bigquery", "bigquery_load", "fake_load", "ndjson", "sqlite" or "fake"
+        project_id: GCP project ID (bigquery, bigquery_load)
+        dataset_id: BigQuery dataset ID (bigquery, bigquery_load)
+        table_id: Table name (bigquery, bigquery_load, sqlite)
+        directory: Output or staging directory for file-based sinks
+            (defaults to the user cache dir)
+
+    Returns:
+        ClickstreamSink instance
+
+    Raises:
+        ValueError: If kind is unknown
+    """
+    if kind == BigQuerySink.name:
+        return BigQuerySink(project_id, dataset_id, table_id)
+    if kind == FakeSink.name:
+        return FakeSink()
+
+    if kind in ("bigquery_load", "fake_load"):
+        from libs.clickstream_loader import (
+            BigQueryLoadSubmitter, FakeLoadSubmitter, LoadJobSink
+        )
+        staging_dir = Path(directory) if directory else get_cache_dir() / "clickstream_load"
+        if kind == "fake_load":
+            submitter = FakeLoadSubmitter()
+        else:
+            submitter = BigQueryLoadSubmitter(project_id, dataset_id, table_id)
+        return LoadJobSink(submitter, staging_dir)
+
+    output_dir = Path(directory) if directory else get_cache_dir() / "clickstream_export"
+    if kind == NdjsonFileSink.name:
+        return NdjsonFileSink(output_dir)
+    if kind == SqliteSink.name:
+        return SqliteSink(output_dir / "clickstream.db", table=table_id)
+    raise ValueError(f"Unknown clickstream sink: {kind}")
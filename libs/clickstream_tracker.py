@@ -6,25 +6,60 @@ Handles asynchronous clickstream tracking to BigQuery with batching.
 import atexit
 import threading
 import queue
+import sys
+import time
 import uuid
-from datetime import datetime
+from collections import Counter, deque
+from concurrent.futures import Future, wait as wait_futures
+from pathlib import Path
 from typing import Optional, Dict, Any
-from google.cloud import bigquery
-from google.api_core import exceptions
 
-from libs.machine_id import get_machine_id
-from libs.version import __version__
+from libs import tracing
+from libs.batch_policy import AdaptiveBatchPolicy
+from libs.cache_dir import get_cache_dir
+from libs.clickstream_event import EVENT_TYPE, METADATA, MONOTONIC, EventEncoder, EventQueue
+from libs.clickstream_sinks import ClickstreamSink, create_sink
+from libs.config import Config
+from libs.event_rollup import EventRollup
+from libs.event_sampler import EventSampler
+from libs.event_spool import MemorySpool, open_spool
+from libs.identity import resolve_identity
+from libs.runtime import OVERFLOW_DROP_NEWEST as RUNTIME_DROP_NEWEST, Runtime
+from libs.tracker_metrics import TrackerMetrics, format_stats
+
+# What track_event does when the event queue is full
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_SPILL = "spill"  # Write straight to the spool, drop if it is busy
+OVERFLOW_POLICIES = (OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST, OVERFLOW_SPILL)
+
+# user_id / app_version until the worker has resolved them
+UNRESOLVED = "unknown"
+
+# Runtime queue running sink inserts
+INSERT_QUEUE = "clickstream-insert"
 
 
 class ClickstreamTracker:
     """
-    Manages clickstream event tracking to BigQuery.
+    Manages clickstream event tracking to BigQuery (or another sink).
 
     Features:
-    - Asynchronous batch inserts (batches of 10)
-    - Background thread for processing
-    - Graceful shutdown with data flush
-    - Automatic retry on transient errors
+    - Durable on-disk spool, so unsent events survive crashes and restarts
+    - Background worker writing events to the spool with group commits
+    - Background uploader draining the spool in order, with a configurable
+      number of concurrent inserts acknowledged in spool order
+    - Batches sent by size, bytes or linger time, with a batch size that
+      adapts to the event rate and insert latency
+    - Pluggable sink (BigQuery, NDJSON files, SQLite or an in-process fake),
+      connected on the uploader thread, off the startup path
+    - Retry with backoff; events stay spooled while the sink is unreachable
+    - Shutdown bounded by a hard deadline, with at most one insert attempt
+    - Bounded event queue with an overflow policy and per-event-type drop counts
+    - Per-event sampling, rate limiting and burst collapsing before queueing
+    - Optional per-minute rollup rows, alongside or instead of raw events
+    - Self-metrics (latency and size histograms, failures, spool depth)
+      in get_stats() and an optional periodic log line
     """
 
     def __init__(
@@ -33,7 +68,13 @@ class ClickstreamTracker:
         dataset_id: str = "hl_timeleft",
         table_id: str = "clickstream",
         batch_size: int = 10,
-        enabled: bool = True
+        enabled: bool = True,
+        spool_dir: Optional[str] = Config.CLICKSTREAM_SPOOL_DIR,
+        max_in_flight: int = Config.CLICKSTREAM_MAX_IN_FLIGHT,
+        queue_capacity: int = Config.CLICKSTREAM_QUEUE_CAPACITY,
+        overflow_policy: str = Config.CLICKSTREAM_OVERFLOW_POLICY,
+        sink: Optional[ClickstreamSink] = None,
+        runtime: Optional[Runtime] = None
     ):
         """
         Initialize the clickstream tracker.
@@ -42,52 +83,132 @@ class ClickstreamTracker:
             project_id: GCP project ID
             dataset_id: BigQuery dataset ID
             table_id: BigQuery table ID
-            batch_size: Number of events to batch before inserting
+            batch_size: Smallest batch size (the adaptive size never goes below it)
             enabled: Whether tracking is enabled
+            spool_dir: Directory for spooled events (defaults to the user cache dir)
+            max_in_flight: Maximum number of batches inserted concurrently
+            queue_capacity: Maximum number of events waiting for the spool writer
+            overflow_policy: One of OVERFLOW_POLICIES, applied when the queue is full
+            sink: Destination for batches (defaults to Config.CLICKSTREAM_SINK)
+            runtime: Runtime whose "clickstream-insert" queue runs inserts (a
+                private one is created and shut down with the tracker if omitted)
+
+        Raises:
+            ValueError: If overflow_policy is unknown
         """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+
         self.project_id = project_id
         self.dataset_id = dataset_id
         self.table_id = table_id
         self.batch_size = batch_size
         self.enabled = enabled
-
-        # Get stable machine identifier
-        self.user_id = get_machine_id()
+        self.spool_dir = spool_dir
+        self.max_in_flight = max(1, max_in_flight)
+        self.overflow_policy = overflow_policy
 
         # Generate unique session ID for this application instance
         self.session_id = str(uuid.uuid4())
 
-        # Get application version
-        self.app_version = __version__
+        # Session constants are added to events by the worker, not per call.
+        # The machine ID and version are filled in by the worker before it
+        # encodes anything, so startup never waits for them.
+        self.encoder = EventEncoder(UNRESOLVED, self.session_id, UNRESOLVED)
+        self.identity_ready = threading.Event()
 
-        # Event queue for async processing
-        self.event_queue = queue.Queue()
-        self.batch_buffer = []
-        self.lock = threading.Lock()
-        self.shutdown_event = threading.Event()
+        # Thins out high-frequency events (e.g. Fire button mashing)
+        self.sampler = EventSampler(self.session_id)
+
+        # Per-minute summary rows (used by the worker thread only)
+        self.rollup = EventRollup(self.encoder.epoch_offset)
 
-        # BigQuery client
-        self.client = None
-        self.table_ref = None
+        # Pipeline instrumentation
+        self.metrics = TrackerMetrics()
+        self._track_calls = 0
+        self._next_metrics_log = time.monotonic() + Config.CLICKSTREAM_METRICS_LOG_INTERVAL
+
+        # Bounded event queue feeding the spool writer
+        self.event_queue = EventQueue(maxsize=queue_capacity)
+        self.shutdown_event = threading.Event()
+        self.upload_event = threading.Event()
+        self.spool = None
+        self.spool_ready = threading.Event()
+        self.batch_policy = AdaptiveBatchPolicy(
+            min_batch=batch_size,
+            concurrency=self.max_in_flight
+        )
+        self.worker_thread = None
+        self.uploader_thread = None
+
+        # One insert worker per in-flight batch
+        self._own_runtime = runtime is None
+        self.runtime = runtime or Runtime()
+        self.runtime.add_queue(INSERT_QUEUE, workers=self.max_in_flight,
+                               capacity=self.max_in_flight, overflow=RUNTIME_DROP_NEWEST)
+        self._shutdown_deadline = float("inf")
+        self._shutdown_lock = threading.Lock()
+        self._shutdown_dropped = 0
+
+        # Destination of uploaded batches (connected by the uploader thread)
+        self.sink = sink or create_sink(
+            Config.CLICKSTREAM_SINK, project_id, dataset_id, table_id
+        )
+
+        # (events spooled so far, monotonic time) per group commit, used to
+        # find how long the oldest unsent event has waited
+        self._spool_marks = deque()
+        self._spooled_total = 0
+        self._dispatched_total = 0
+        self._sent_total = 0
+        self._in_flight_events = 0
+        self._in_flight_bytes = 0
+
+        # Overflow accounting (track_event may be called from any thread)
+        self._overflow_lock = threading.Lock()
+        self._dropped = Counter()
+        self._spilled = 0
+        self._spilled_unmarked = 0
 
         if self.enabled:
-            try:
-                self.client = bigquery.Client(project=project_id)
-                self.table_ref = f"{project_id}.{dataset_id}.{table_id}"
+            # Start background processing thread
+            self.worker_thread = threading.Thread(
+                target=self._process_events,
+                daemon=True
+            )
+            self.worker_thread.start()
 
-                # Start background processing thread
-                self.worker_thread = threading.Thread(
-                    target=self._process_events,
-                    daemon=True
-                )
-                self.worker_thread.start()
+            # Register cleanup handler
+            atexit.register(self.shutdown)
 
-                # Register cleanup handler
-                atexit.register(self.shutdown)
+    @property
+    def user_id(self) -> str:
+        """Hashed machine identifier ("unknown" until resolved)."""
+        return self.encoder.user_id
 
-            except Exception as e:
-                print(f"Warning: Failed to initialize BigQuery clickstream tracker: {e}")
-                self.enabled = False
+    @property
+    def app_version(self) -> str:
+        """Application version ("unknown" until resolved)."""
+        return self.encoder.app_version
+
+    def _connect(self) -> bool:
+        """
+        Connect the sink.
+
+        Runs on the uploader thread so library imports and credential
+        lookups never delay application startup.
+
+        Returns:
+            True if the sink is ready, False otherwise
+        """
+        try:
+            connected = self.sink.connect()
+        except Exception as e:
+            print(f"Warning: Failed to connect {self.sink.name} clickstream sink: {e}")
+            connected = False
+        if not connected:
+            self.enabled = False
+        return connected
 
     def track_event(
         self,
@@ -98,6 +219,10 @@ class ClickstreamTracker:
         """
         Track a clickstream event.
 
+        Only a compact record is queued here; the worker thread adds the
+        session constants and serializes metadata to JSON. The metadata
+        dictionary must not be modified after the call.
+
         Args:
             event_type: Type of event (e.g., "button_click", "timer_start")
             component: UI component name (e.g., "start_button", "pause_button")
@@ -106,117 +231,553 @@ class ClickstreamTracker:
         if not self.enabled:
             return
 
-        event = {
-            "user_id": self.user_id,
-            "session_id": self.session_id,
-            "app_version": self.app_version,
-            "timestamp": datetime.utcnow().isoformat(),
-            "event_type": event_type,
-            "component": component,
-            "metadata": str(metadata) if metadata else None
-        }
+        # Time a sample of calls so measuring stays cheap
+        self._track_calls += 1
+        if self._track_calls % self.metrics.sample_every:
+            self._enqueue(event_type, component, metadata)
+            return
+        started = time.perf_counter()
+        self._enqueue(event_type, component, metadata)
+        self.metrics.track_event_us.observe((time.perf_counter() - started) * 1e6)
+
+    def _enqueue(self, event_type: str, component: str, metadata: Optional[Dict[str, Any]]):
+        """
+        Sample an event and put its record on the queue.
+
+        Args:
+            event_type: Type of event
+            component: UI component name
+            metadata: Additional event metadata
+        """
+        if self.sampler.active:
+            event = self.sampler.admit(time.monotonic(), event_type, component, metadata)
+            if event is None:
+                return
+        else:
+            event = (time.monotonic(), event_type, component, metadata)
 
         try:
             self.event_queue.put_nowait(event)
         except queue.Full:
-            print("Warning: Event queue full, dropping event")
+            self._handle_overflow(event)
+
+    def _handle_overflow(self, event: tuple):
+        """
+        Apply the overflow policy to an event that did not fit in the queue.
+
+        Never blocks: spilling only writes if the spool lock is free.
+
+        Args:
+            event: The event being tracked
+        """
+        if self.overflow_policy == OVERFLOW_DROP_OLDEST:
+            try:
+                oldest = self.event_queue.get_nowait()
+            except queue.Empty:
+                oldest = None
+            try:
+                self.event_queue.put_nowait(event)
+                event = oldest
+            except queue.Full:
+                if oldest is not None:
+                    self._count_drop(oldest)
+            if event is not None:
+                self._count_drop(event)
+            return
+
+        if self.overflow_policy == OVERFLOW_SPILL and self.spool_ready.is_set():
+            if self.spool.append([self.encoder.encode(event)], block=False):
+                with self._overflow_lock:
+                    self._spilled += 1
+                    self._spilled_unmarked += 1
+                return
+
+        self._count_drop(event)
+
+    def _count_drop(self, event: tuple):
+        """
+        Count a dropped event by type.
+
+        Args:
+            event: The dropped event
+        """
+        with self._overflow_lock:
+            if not self._dropped:
+                print("Warning: Clickstream event queue full, dropping events")
+            self._dropped[event[EVENT_TYPE]] += 1
+
+    def _resolve_identity(self):
+        """
+        Resolve the machine ID and version (on the worker thread).
+
+        The machine ID is cached in the user cache dir, so only the first
+        run on a machine may wait for a subprocess.
+        """
+        try:
+            self.encoder.user_id, self.encoder.app_version = resolve_identity()
+        except Exception as e:
+            print(f"Warning: Could not resolve clickstream identity: {e}")
+        self.identity_ready.set()
+
+    def _open_spool(self):
+        """Open the spool directory (on the worker thread)."""
+        spool_dir = self.spool_dir or get_cache_dir() / "clickstream_spool"
+        self.spool = open_spool(Path(spool_dir))
+
+        # Events left over from a previous run are already past their linger time
+        self._spooled_total = self.spool.pending_count()
+        if self._spooled_total:
+            self._spool_marks.append(
+                (self._spooled_total, time.monotonic() - self.batch_policy.linger)
+            )
+        self.spool_ready.set()
 
     def _process_events(self):
-        """Background thread worker to process events."""
+        """Background thread worker writing queued events to the spool."""
+        # Before anything is encoded, so every row carries the identity
+        self._resolve_identity()
+        self._open_spool()
+
+        # Published only once started, so shutdown() never joins an
+        # unstarted thread; at interpreter exit no thread can be started
+        # and the spooled events wait for the next run
+        uploader_thread = threading.Thread(
+            target=self._upload_events,
+            daemon=True
+        )
+        try:
+            uploader_thread.start()
+        except RuntimeError:
+            pass
+        else:
+            self.uploader_thread = uploader_thread
+
         while not self.shutdown_event.is_set():
             try:
                 # Get event with timeout to allow checking shutdown flag
                 event = self.event_queue.get(timeout=0.5)
+            except queue.Empty:
+                events = []
+            else:
+                # Group commit: one fsync for everything already queued
+                events = self._drain_queue([event], Config.CLICKSTREAM_SPOOL_GROUP_SIZE)
+
+                # Collapsed bursts carry the time of their first click instead
+                metadata = event[METADATA]
+                if not (metadata and "burst_count" in metadata):
+                    self.metrics.queue_wait_ms.observe((time.monotonic() - event[MONOTONIC]) * 1000)
+
+            now = time.monotonic()
+            events = self._aggregate(events, now)
+            if events:
+                self._spool_events(events)
+
+            if Config.CLICKSTREAM_METRICS_LOG_INTERVAL and now >= self._next_metrics_log:
+                self._next_metrics_log = now + Config.CLICKSTREAM_METRICS_LOG_INTERVAL
+                print(format_stats(self.get_stats()))
+
+        # Spool events queued before shutdown, as far as the deadline allows
+        remaining_events = self._aggregate(
+            self._drain_queue([], sys.maxsize), time.monotonic(), force=True
+        )
+        group_size = Config.CLICKSTREAM_SPOOL_GROUP_SIZE
+        for start in range(0, len(remaining_events), group_size):
+            if time.monotonic() >= self._shutdown_deadline:
+                self._count_shutdown_drops(len(remaining_events) - start)
+                break
+            self._spool_events(remaining_events[start:start + group_size])
+
+    def _aggregate(self, events: list, now: float, force: bool = False) -> list:
+        """
+        Add ended bursts and rollup rows to a group of queued records.
 
-                with self.lock:
-                    self.batch_buffer.append(event)
+        Args:
+            events: Records taken from the queue
+            now: Current monotonic time
+            force: Release open bursts and rollups (shutdown)
+
+        Returns:
+            Records to spool
+        """
+        events.extend(self.sampler.flush(now, force=force))
+        if self.rollup.active:
+            events = self.rollup.process(events)
+            events.extend(self.rollup.flush(now, force=force))
+        return events
+
+    def _drain_queue(self, events: list, limit: int) -> list:
+        """
+        Move already queued events into a list without blocking.
 
-                    # Insert batch when it reaches batch_size
-                    if len(self.batch_buffer) >= self.batch_size:
-                        self._insert_batch()
+        Args:
+            events: List to extend
+            limit: Maximum length of the list
 
+        Returns:
+            The extended list
+        """
+        while len(events) < limit:
+            try:
+                events.append(self.event_queue.get_nowait())
             except queue.Empty:
-                # No events, check if we should flush partial batch
-                if self.shutdown_event.is_set():
-                    break
-                continue
-            except Exception as e:
-                print(f"Error processing event: {e}")
+                break
+        return events
 
-    def _insert_batch(self):
-        """Insert current batch to BigQuery."""
-        if not self.batch_buffer or not self.client:
-            return
+    def _spool_events(self, events: list):
+        """
+        Encode events and append them to the spool with a single commit.
 
+        Args:
+            events: Compact event records to spool
+        """
+        started = time.perf_counter()
         try:
-            errors = self.client.insert_rows_json(
-                self.table_ref,
-                self.batch_buffer,
-                retry=bigquery.DEFAULT_RETRY
-            )
+            with tracing.span("clickstream.spool", "clickstream", events=len(events)):
+                self.spool.append(self.encoder.encode_all(events))
+                self.spool.commit()
+        except Exception as e:
+            print(f"Error spooling events: {e}")
+            return
+        self.metrics.spool_commit_ms.observe((time.perf_counter() - started) * 1000)
+        self.metrics.record_spool_depth(self.spool.pending_count())
 
-            if errors:
-                print(f"BigQuery insert errors: {errors}")
-            else:
-                print(f"Successfully inserted {len(self.batch_buffer)} events to BigQuery")
+        # Spilled events were appended by track_event; the commit made them durable
+        with self._overflow_lock:
+            spilled, self._spilled_unmarked = self._spilled_unmarked, 0
 
-            # Clear buffer after insert (success or failure)
-            self.batch_buffer.clear()
+        now = time.monotonic()
+        self._spooled_total += len(events) + spilled
+        self._spool_marks.append((self._spooled_total, now))
+        self.batch_policy.record_events(len(events), now)
 
-        except exceptions.NotFound:
-            print(f"Error: BigQuery table {self.table_ref} not found. "
-                  f"Run setup_bigquery.py to create it.")
-            self.batch_buffer.clear()
-        except Exception as e:
-            print(f"Error inserting to BigQuery: {e}")
-            # Keep buffer to retry on next batch
-            if len(self.batch_buffer) > self.batch_size * 3:
-                # Drop oldest events if buffer grows too large
-                self.batch_buffer = self.batch_buffer[-self.batch_size:]
+        # Size and bytes triggers; the uploader times the linger itself
+        if self.batch_policy.should_flush(self._unsent_count(), self._unsent_bytes(), 0.0):
+            self.upload_event.set()
 
-    def shutdown(self):
+    def _upload_events(self):
         """
-        Gracefully shutdown tracker, flushing remaining events.
-        Called automatically via atexit.
+        Background thread draining the spool to the sink in order.
+
+        Up to max_in_flight batches are inserted concurrently, each on its
+        own daemon thread so an insert stuck on the network never holds up
+        interpreter exit; batches are acknowledged strictly in spool order.
         """
-        if not self.enabled:
+        if not self._connect():
             return
 
-        print("Shutting down clickstream tracker...")
-        self.shutdown_event.set()
+        in_flight = deque()
+        retry_delay = Config.CLICKSTREAM_RETRY_DELAY
+        backing_off = False
+        while not self.shutdown_event.is_set():
+            wait = self.batch_policy.time_until_flush(self._unsent_count(), self._oldest_age())
+            self.upload_event.wait(timeout=1.0 if wait is None else min(wait, 1.0))
+            self.upload_event.clear()
+
+            acked = self._collect_batches(in_flight)
+            backing_off = acked is None
+            if backing_off:
+                # Leave events spooled and back off until the sink is reachable
+                self.shutdown_event.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, Config.CLICKSTREAM_MAX_RETRY_DELAY)
+                continue
+            if acked:
+                retry_delay = Config.CLICKSTREAM_RETRY_DELAY
+
+            # Start due batches, oldest first
+            while (len(in_flight) < self.max_in_flight and self._flush_due() and
+                   not self.shutdown_event.is_set()):
+                if not self._dispatch_batch(in_flight):
+                    break
+
+        self._final_flush(in_flight, attempt=not backing_off)
+        self.sink.close()
+
+    def _dispatch_batch(self, in_flight: deque, max_events: Optional[int] = None) -> bool:
+        """
+        Read the next batch from the spool and start inserting it.
+
+        Args:
+            in_flight: Batches being inserted, in spool order
+            max_events: Batch size limit (defaults to the adaptive batch size)
+
+        Returns:
+            True if a batch was started, False if nothing was left to read
+        """
+        batch = self.spool.read(max_events or self.batch_policy.batch_size,
+                                self.batch_policy.max_bytes)
+        if not batch.events:
+            return False
+
+        self._dispatched_total += len(batch)
+        self._in_flight_events += len(batch)
+        self._in_flight_bytes += batch.size
+
+        future = self.runtime.submit(INSERT_QUEUE, self._timed_insert, batch.events)
+        if future is None:
+            # Every insert worker is still busy (e.g. with an insert abandoned
+            # at a rewind) or the runtime is shut down; report the batch as
+            # undelivered so it is re-read later
+            future = Future()
+            future.set_result(False)
+        future.add_done_callback(lambda f: self.upload_event.set())
+        in_flight.append((batch, future))
+        return True
+
+    def _collect_batches(self, in_flight: deque) -> Optional[int]:
+        """
+        Acknowledge finished batches at the head of the in-flight queue.
+
+        A batch finishing early waits until every batch before it is done,
+        so the spool cursor only ever moves past delivered events.
+
+        Args:
+            in_flight: Batches being inserted, in spool order
+
+        Returns:
+            Number of batches acknowledged, or None if an insert failed
+            and the unacknowledged events were returned to the spool
+        """
+        acked = 0
+        while in_flight and in_flight[0][1].done():
+            batch, future = in_flight.popleft()
+            self._in_flight_events -= len(batch)
+            self._in_flight_bytes -= batch.size
 
-        # Process remaining events in queue
-        remaining_events = []
-        while not self.event_queue.empty():
             try:
-                remaining_events.append(self.event_queue.get_nowait())
-            except queue.Empty:
-                break
+                delivered = future.result()
+            except Exception as e:
+                print(f"Error inserting clickstream batch: {e}")
+                delivered = False
+
+            if not delivered:
+                self._rewind(in_flight)
+                return None
+
+            self.spool.ack(batch)
+            self._sent_total += len(batch)
+            acked += 1
+        return acked
+
+    def _rewind(self, in_flight: deque):
+        """
+        Abandon the in-flight batches and re-read them from the spool.
+
+        Args:
+            in_flight: Batches still being inserted after a failed one
+        """
+        # Re-reading while an insert is still running would send it twice;
+        # after shutdown nothing is re-read, so only wait until the deadline
+        timeout = self._remaining() if self.shutdown_event.is_set() else None
+        wait_futures([future for batch, future in in_flight], timeout=timeout)
+        self.metrics.record_rewind(len(in_flight) + 1)
+        in_flight.clear()
+        self._in_flight_events = 0
+        self._in_flight_bytes = 0
+        self.spool.rewind()
+
+        # The re-read events are due as soon as the backoff ends
+        self._spool_marks.appendleft(
+            (self._dispatched_total, time.monotonic() - self.batch_policy.linger)
+        )
+        self._dispatched_total = self._sent_total
+
+    def _final_flush(self, in_flight: deque, attempt: bool):
+        """
+        Make at most one last delivery attempt before the shutdown deadline.
+
+        Batches already being inserted count as the attempt; otherwise one
+        batch of up to the maximum batch size is inserted, unless the last
+        insert failed. Whatever is not acknowledged by the deadline stays
+        spooled for the next run.
+
+        Args:
+            in_flight: Batches being inserted, in spool order
+            attempt: Whether a new insert may be started
+        """
+        # Let the worker spool what was still queued
+        if self.worker_thread is not None:
+            self.worker_thread.join(timeout=self._remaining())
 
-        # Add to batch buffer
-        with self.lock:
-            self.batch_buffer.extend(remaining_events)
+        if attempt and not in_flight and self._remaining() > 0 and self._unsent_count():
+            self._dispatch_batch(in_flight, self.batch_policy.max_batch)
+        if not in_flight:
+            return
+
+        wait_futures([future for batch, future in in_flight], timeout=self._remaining())
+        self._collect_batches(in_flight)
+
+    def _remaining(self) -> float:
+        """Get the seconds left until the shutdown deadline (0.0 once it has passed)."""
+        return max(0.0, self._shutdown_deadline - time.monotonic())
+
+    def _count_shutdown_drops(self, count: int):
+        """
+        Count events lost because shutdown ran out of time.
+
+        Args:
+            count: Number of events dropped
+        """
+        with self._overflow_lock:
+            self._shutdown_dropped += count
+
+    def _unsent_count(self) -> int:
+        """Get the number of spooled events not yet handed to an insert."""
+        return self.spool.pending_count() - self._in_flight_events
+
+    def _unsent_bytes(self) -> int:
+        """Get the encoded size of spooled events not yet handed to an insert."""
+        return self.spool.pending_bytes() - self._in_flight_bytes
+
+    def _oldest_age(self) -> float:
+        """
+        Get how long the oldest unsent event has been waiting.
+
+        Returns:
+            Age in seconds, or 0.0 if nothing is waiting
+        """
+        marks = self._spool_marks
+        while marks and marks[0][0] <= self._dispatched_total:
+            marks.popleft()
+        if not marks:
+            return 0.0
+        return time.monotonic() - marks[0][1]
+
+    def _flush_due(self) -> bool:
+        """Check whether the batch policy wants a batch sent now."""
+        return self.batch_policy.should_flush(
+            self._unsent_count(),
+            self._unsent_bytes(),
+            self._oldest_age()
+        )
+
+    def _timed_insert(self, events: list) -> bool:
+        """
+        Insert a batch and record its latency with the batch policy and metrics.
+
+        Args:
+            events: Event rows to insert
+
+        Returns:
+            Result of _insert_batch()
+        """
+        started = time.monotonic()
+        with tracing.span("clickstream.insert", "clickstream", events=len(events)):
+            delivered = self._insert_batch(events)
+        latency = time.monotonic() - started
+        self.batch_policy.record_insert(len(events), latency)
+        self.metrics.record_insert(len(events), latency * 1000, delivered)
+        return delivered
+
+    def _insert_batch(self, events: list) -> bool:
+        """
+        Deliver a batch of events to the sink.
+
+        Args:
+            events: Event rows to insert
+
+        Returns:
+            True if the rows were delivered or permanently rejected,
+            False on a transient error
+        """
+        try:
+            return self.sink.insert(events)
+        except Exception as e:
+            print(f"Error inserting to {self.sink.name} sink: {e}")
+            return False
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """
+        Stop tracking within CLICKSTREAM_SHUTDOWN_TIMEOUT seconds.
+
+        Called from Application.run and again via atexit; only the first
+        call does anything. The worker spools what is still queued and the
+        uploader makes at most one insert attempt, both bounded by the same
+        deadline, so closing the app never waits on the network. Unsent
+        events stay in the on-disk spool for the next run; events that
+        could not be spooled in time, or were only held in a memory spool,
+        are dropped and counted in get_stats()["shutdown_dropped"].
+
+        Args:
+            timeout: Shorter deadline in seconds (what is left of the
+                caller's own shutdown deadline)
+        """
+        if timeout is None:
+            timeout = Config.CLICKSTREAM_SHUTDOWN_TIMEOUT
+        with self._shutdown_lock:
+            if self.worker_thread is None or self.shutdown_event.is_set():
+                return
+            self._shutdown_deadline = time.monotonic() + min(
+                timeout, Config.CLICKSTREAM_SHUTDOWN_TIMEOUT
+            )
+            self.shutdown_event.set()
+        atexit.unregister(self.shutdown)
 
-            # Flush final batch
-            if self.batch_buffer:
-                print(f"Flushing {len(self.batch_buffer)} remaining events...")
-                self._insert_batch()
+        print("Shutting down clickstream tracker...")
+        self.upload_event.set()
+        self.event_queue.close()
+
+        self.worker_thread.join(timeout=self._remaining())
+        if self.uploader_thread is not None:
+            self.uploader_thread.join(timeout=self._remaining())
+
+        if self.worker_thread.is_alive() or not self.spool_ready.is_set():
+            # The worker is stuck (e.g. on disk I/O); what it has not taken is lost
+            self._count_shutdown_drops(len(self._drain_queue([], sys.maxsize)))
+
+        left = 0
+        if self.spool_ready.is_set():
+            left = self.spool.pending_count()
+            if isinstance(self.spool, MemorySpool):
+                self._count_shutdown_drops(left)
+                left = 0
+            busy = self.worker_thread.is_alive() or (
+                self.uploader_thread is not None and self.uploader_thread.is_alive()
+            )
+            if not busy:
+                # Don't close the spool under a thread still using it
+                self.spool.close()
 
-        # Wait for worker thread to finish
-        if hasattr(self, 'worker_thread') and self.worker_thread.is_alive():
-            self.worker_thread.join(timeout=5.0)
+        message = "Clickstream tracker shutdown complete"
+        if left:
+            message += f", {left} events spooled for the next run"
+        if self._shutdown_dropped:
+            message += f", {self._shutdown_dropped} events dropped"
+        print(message)
 
-        print("Clickstream tracker shutdown complete")
+        if self._own_runtime:
+            # Inserts still running past the deadline are abandoned
+            self.runtime.shutdown(timeout=0)
 
     def get_stats(self) -> Dict[str, int]:
         """
         Get tracker statistics.
 
+        Never blocks: every value is read from counters kept by the
+        background threads.
+
         Returns:
-            Dictionary with queue size and buffer size
+            Dictionary with queue size, spooled (not yet uploaded) events,
+            events being inserted, the current adaptive batch size,
+            events spilled to the spool, dropped events per event type,
+            events dropped by a memory-only spool or at shutdown, sampling and rollup
+            statistics, and pipeline metrics (see TrackerMetrics)
         """
-        with self.lock:
-            return {
-                "queue_size": self.event_queue.qsize(),
-                "buffer_size": len(self.batch_buffer)
-            }
+        spool = self.spool
+        with self._overflow_lock:
+            dropped = dict(self._dropped)
+            spilled = self._spilled
+        return {
+            "queue_size": self.event_queue.qsize(),
+            "buffer_size": spool.pending_count() if spool else 0,
+            "spool_bytes": spool.pending_bytes() if spool else 0,
+            "in_flight": self._in_flight_events,
+            "batch_size": self.batch_policy.batch_size,
+            "spilled": spilled,
+            "dropped": dropped,
+            "dropped_total": sum(dropped.values()),
+            "spool_dropped": getattr(spool, "dropped", 0),
+            "shutdown_dropped": self._shutdown_dropped,
+            "sampling": self.sampler.get_stats(),
+            "rollup": self.rollup.get_stats(),
+            "metrics": self.metrics.snapshot()
+        }
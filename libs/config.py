@@ -28,6 +28,27 @@ class Config:
     DEFAULT_POMODORO_TIME = "00:30:00"  # HH:MM:SS
     COUNTDOWN_THRESHOLD = 5  # seconds before playing countdown
 
+    # Shared runtime (libs/runtime.py): fixed worker threads per subsystem
+    AUDIO_WORKERS = 4  # sound effects played at the same time
+    AUDIO_QUEUE_CAPACITY = 8  # pending effects; the oldest are dropped beyond this
+    VOICE_QUEUE_CAPACITY = 1  # pending VOX announcements (countdown, time left)
+    RUNTIME_SHUTDOWN_TIMEOUT = 0.05  # seconds shutdown waits for running tasks
+    SHUTDOWN_TIMEOUT = 0.09  # seconds closing the app may take, all steps together
+
+    # Span tracing (libs/tracing.py, enabled with main.py --trace)
+    TRACE_CAPACITY = 100000  # events kept; the oldest are overwritten beyond this
+
+    # Headless terminal mode (main.py --headless)
+    HEADLESS_POLL_INTERVAL = 0.05  # seconds between key polls and redraws
+    HEADLESS_AUDIO_GRACE = 15.0  # seconds to let the countdown finish playing before exit
+
+    # Timer daemon (python -m libs.daemon)
+    DAEMON_SOCKET = None  # None = "timeleft.sock" in the user cache dir
+    DAEMON_POLL_INTERVAL = 0.05  # seconds between event loop wake-ups
+    DAEMON_CLIENT_TIMEOUT = 2.0  # seconds a client waits for a reply
+    DAEMON_MAX_CLIENT_BUFFER = 64 * 1024  # unsent bytes before a slow client is dropped
+    DAEMON_ATTACH = True  # the GUI drives a running daemon's timer instead of its own
+
     # DearPyGUI Tags
     GUN_TAG = "gun_tag"
     TEXT_TAG = "text_tag"
@@ -39,8 +60,30 @@ class Config:
     IMAGE_TAG = "image_texture"
     SHOOT_TAG = "shoot_gun_button"
     DRAWLIST_TAG = "drawlist_tag"
+    BG_IMAGE_TAG = "bg_image"
+    BG_LABEL_TAG = "bg_label"
     TIMELEFT_TAG = "timeleft_button"
     BACKGROUND_TAG = "background_combo"
+    PANORAMA_TAG = "panorama_checkbox"
+
+    # Skybox panorama settings
+    PANORAMA_FOV = 90.0  # horizontal field of view in degrees
+    PANORAMA_SPEED = 4.0  # degrees per second
+    PANORAMA_FRAME_BUDGET_MS = 2.0  # max render time per frame
+    PANORAMA_AZIMUTH_STEPS = 2048  # precomputed view angles per revolution
+
+    # Background transition settings
+    CROSSFADE_FRAMES = 30  # frames per background crossfade
+    CROSSFADE_CACHE_SIZE = 16  # decoded backgrounds kept in memory
+
+    # Audio mixer settings (pygame.mixer.init)
+    MIXER_FREQUENCY = 22050
+    MIXER_SIZE = -16  # signed 16-bit samples
+    MIXER_CHANNELS = 2
+    MIXER_BUFFER = 512
+
+    # Startup budget for importing and constructing the Application
+    STARTUP_BUDGET_MS = 300
 
     # Sound types
     COUNTDOWN_SOUNDS = ["five", "four", "three", "two", "one"]
@@ -56,4 +99,48 @@ class Config:
     CLICKSTREAM_PROJECT_ID = "experiment-476518"
     CLICKSTREAM_DATASET_ID = "hl_timeleft"
     CLICKSTREAM_TABLE_ID = "clickstream"
-    CLICKSTREAM_BATCH_SIZE = 10  # Number of events to batch before inserting
+    CLICKSTREAM_BATCH_SIZE = 10  # Smallest batch; used when events are rare
+    CLICKSTREAM_MAX_BATCH_SIZE = 500  # Largest batch the adaptive size can grow to
+    CLICKSTREAM_MAX_BATCH_BYTES = 1024 * 1024  # Send once this much is pending
+    CLICKSTREAM_LINGER_SECONDS = 30.0  # Max time an event waits before it is sent
+    CLICKSTREAM_TARGET_INSERT_INTERVAL = 2.0  # Preferred seconds between inserts under load
+    CLICKSTREAM_SPOOL_DIR = None  # None = "clickstream_spool" in the user cache dir
+    CLICKSTREAM_SPOOL_SEGMENT_BYTES = 1024 * 1024  # Start a new spool file after this
+    CLICKSTREAM_SPOOL_GROUP_SIZE = 500  # Max events written per fsync
+    CLICKSTREAM_MEMORY_SPOOL_EVENTS = 10000  # Limit when the spool falls back to memory
+    CLICKSTREAM_RETRY_DELAY = 5.0  # Seconds before retrying a failed upload
+    CLICKSTREAM_MAX_RETRY_DELAY = 300.0  # Upper bound for upload retry backoff
+    CLICKSTREAM_MAX_IN_FLIGHT = 2  # Batches inserted concurrently
+    CLICKSTREAM_SHUTDOWN_TIMEOUT = 0.08  # Hard deadline in seconds for the whole shutdown flush
+    CLICKSTREAM_METRICS_LOG_INTERVAL = 0.0  # Seconds between tracker metrics log lines (0 = off)
+    CLICKSTREAM_QUEUE_CAPACITY = 10000  # Events waiting for the spool writer
+    CLICKSTREAM_OVERFLOW_POLICY = "spill"  # "drop_newest", "drop_oldest" or "spill"
+
+    # Per-event sampling, keyed by "event_type" or "event_type:component".
+    # Settings: sample_rate, collapse_window, collapse_max_span, rate_limit, burst
+    CLICKSTREAM_EVENT_POLICIES = {
+        "button_click:shoot_gun_button": {"collapse_window": 1.0, "rate_limit": 1.0, "burst": 10},
+        "panorama_toggle": {"rate_limit": 1.0, "burst": 5},
+    }
+    # Per-minute summary rows (event_type "rollup"): "off", "alongside" or "instead"
+    # of raw events; in "instead" mode protected events are still sent raw
+    CLICKSTREAM_ROLLUP_MODE = "off"
+    CLICKSTREAM_ROLLUP_INTERVAL = 60.0  # Seconds between rollup flushes
+    CLICKSTREAM_ROLLUP_DISTINCT_KEYS = ["weapon", "background"]  # Metadata values listed per rollup
+    # Never sampled (and kept raw with rollups), whatever the policies say
+    CLICKSTREAM_PROTECTED_EVENTS = [
+        "app_start",
+        "button_click:start_button",
+        "button_click:pause_button",
+        "button_click:reset_button",
+        "button_click:timeleft_button",
+    ]
+    CLICKSTREAM_SINK = "bigquery"  # "bigquery", "bigquery_load", "fake_load", "ndjson", "sqlite" or "fake"
+    CLICKSTREAM_SINK_DIR = None  # None = "clickstream_export" in the user cache dir
+    CLICKSTREAM_NDJSON_ROTATE_BYTES = 16 * 1024 * 1024  # Uncompressed size per export file
+    CLICKSTREAM_FAKE_LATENCY = 0.0  # Seconds per insert for the fake sink
+    CLICKSTREAM_FAKE_FAILURE_RATE = 0.0  # Chance a fake insert fails transiently
+    CLICKSTREAM_LOAD_FILE_BYTES = 64 * 1024 * 1024  # Uncompressed size per load job file
+    CLICKSTREAM_LOAD_INTERVAL = 600.0  # Max seconds between load jobs
+    CLICKSTREAM_LOAD_CHECK_INTERVAL = 5.0  # How often the load submitter wakes up
+    CLICKSTREAM_LOAD_JOB_TIMEOUT = 300.0  # Seconds to wait for a load job
@@ -0,0 +1,144 @@
+"""
+BackgroundCrossfade class for Half-Life VOX TimeLEFT application.
+Blends between background images over a fixed number of frames.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+import dearpygui.dearpygui as dpg
+import numpy as np
+
+from libs.config import Config
+
+
+class BackgroundCrossfade:
+    """
+    Crossfades the background texture between two images.
+
+    Decoded backgrounds are cached as float32 buffers at texture size, and
+    all blend buffers are allocated up front so stepping a fade does not
+    allocate.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        frames: int = Config.CROSSFADE_FRAMES,
+        cache_size: int = Config.CROSSFADE_CACHE_SIZE
+    ):
+        """
+        Initialize the crossfade.
+
+        Args:
+            width: Texture width in pixels
+            height: Texture height in pixels
+            frames: Number of frames a transition lasts
+            cache_size: Number of decoded backgrounds to keep in memory
+        """
+        self.width = width
+        self.height = height
+        self.frames = max(1, frames)
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._frame_index = 0
+        self._target = None
+
+        size = width * height * 4
+        self._from = np.empty(size, dtype=np.float32)
+        self._delta = np.empty(size, dtype=np.float32)
+        self._frame = np.empty(size, dtype=np.float32)
+
+    @property
+    def active(self) -> bool:
+        """Check if a transition is in progress."""
+        return self._target is not None
+
+    def load(self, path: str) -> Optional[np.ndarray]:
+        """
+        Get the texture data for a background image.
+
+        Args:
+            path: Full path to the background image
+
+        Returns:
+            Flat RGBA float32 buffer at texture size, or None if unreadable
+        """
+        if path in self._cache:
+            self._cache.move_to_end(path)
+            return self._cache[path]
+
+        image = dpg.load_image(path)
+        if image is None:
+            return None
+
+        width, height, channels, data = image
+        pixels = np.asarray(data, dtype=np.float32).reshape(height, width, 4)
+        if width != self.width or height != self.height:
+            rows = np.arange(self.height) * height // self.height
+            cols = np.arange(self.width) * width // self.width
+            pixels = pixels[rows[:, None], cols[None, :]]
+        buffer = np.ascontiguousarray(pixels).ravel()
+
+        self._cache[path] = buffer
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return buffer
+
+    def start(self, current: np.ndarray, target: np.ndarray):
+        """
+        Begin a transition from the displayed image to a new one.
+
+        Args:
+            current: Texture data currently on screen
+            target: Texture data to fade to
+        """
+        self.capture(current)
+        self.fade_to(target)
+
+    def capture(self, current: np.ndarray):
+        """
+        Copy the displayed image as the start of the next transition.
+
+        Use this before overwriting a buffer that is still on screen.
+
+        Args:
+            current: Texture data currently on screen
+        """
+        np.copyto(self._from, current)
+
+    def fade_to(self, target: np.ndarray):
+        """
+        Begin a transition from the last captured image.
+
+        Args:
+            target: Texture data to fade to
+        """
+        np.subtract(target, self._from, out=self._delta)
+        self._target = target
+        self._frame_index = 0
+
+    def step(self) -> Optional[np.ndarray]:
+        """
+        Advance the transition by one frame.
+
+        Returns:
+            Blended texture data, or None if no transition is active
+        """
+        if self._target is None:
+            return None
+
+        self._frame_index += 1
+        if self._frame_index >= self.frames:
+            target = self._target
+            self._target = None
+            return target
+
+        # Smoothstep easing
+        t = self._frame_index / self.frames
+        alpha = t * t * (3 - 2 * t)
+        np.multiply(self._delta, alpha, out=self._frame)
+        np.add(self._frame, self._from, out=self._frame)
+        return self._frame
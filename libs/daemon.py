@@ -0,0 +1,332 @@
+"""
+Timer daemon for Half-Life VOX TimeLEFT application.
+One background process owns the timer, the mixer and the tracker; clients
+control it over a Unix domain socket (see libs/daemon_client.py).
+
+All connections are served by one selector loop on the main thread, so
+the daemon's thread count does not grow with the number of clients. The
+GUI attaches to a running daemon instead of starting its own timer
+(Config.DAEMON_ATTACH).
+
+Usage:
+    python -m libs.daemon [--socket PATH] [--no-tracking]
+    python main.py --daemon
+"""
+
+import argparse
+import json
+import os
+import selectors
+import signal
+import socket
+import stat
+import sys
+from typing import Dict, List, Optional
+
+from libs.config import Config
+from libs.daemon_client import COMMANDS, DaemonClient, default_socket_path
+from libs.event_bus import DELIVERY_RENDER, EVENT_KINDS, TimerEvent
+from libs.timer_engine import TimerEngine
+
+# Longest command line accepted from a client
+MAX_COMMAND_BYTES = 1024
+
+
+class _Connection:
+    """Buffers of one client connection."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.received = bytearray()
+        self.unsent = bytearray()
+        self.watching = False
+
+
+class TimerDaemon:
+    """
+    Timer engine shared by every client.
+
+    The components are the ones Application uses, built once: assets are
+    indexed and the mixer is opened when the daemon starts, so a client
+    only pays for a socket connection.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None,
+                 tracking: bool = Config.CLICKSTREAM_ENABLED):
+        """
+        Bind the socket and start the components.
+
+        Args:
+            socket_path: Socket to listen on (defaults to default_socket_path())
+            tracking: Whether to record clickstream events
+
+        Raises:
+            RuntimeError: If another daemon is listening on the socket, or
+                something other than a stale socket is at its path
+            OSError: If the socket cannot be created
+        """
+        self.socket_path = str(socket_path or default_socket_path())
+        # Bind first, so a second daemon fails before loading anything
+        self.listener = self._bind(self.socket_path)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.connections: Dict[socket.socket, _Connection] = {}
+        self.stopping = False
+
+        try:
+            self._create_components(tracking)
+        except BaseException:
+            self._close_listener()
+            raise
+
+    def _create_components(self, tracking: bool):
+        """Create the components Application uses and subscribe to timer events."""
+        self.engine = TimerEngine(tracking)
+        self.runtime = self.engine.runtime
+        self.event_bus = self.engine.event_bus
+        self.timer = self.engine.timer
+        self.audio_manager = self.engine.audio_manager
+        self.clickstream_tracker = self.engine.clickstream_tracker
+        self._setup_callbacks()
+
+    @staticmethod
+    def _bind(socket_path: str) -> socket.socket:
+        """
+        Listen on a Unix domain socket readable only by the current user.
+
+        A socket file left behind by a daemon that died (one that refuses
+        connections) is replaced; anything else at the path is left alone.
+
+        Raises:
+            RuntimeError: If a daemon is already listening there, or the
+                path is not a stale socket
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform")
+        try:
+            mode = os.lstat(socket_path).st_mode
+        except FileNotFoundError:
+            mode = None
+        if mode is not None:
+            if not stat.S_ISSOCK(mode):
+                raise RuntimeError(f"{socket_path} exists and is not a socket")
+            try:
+                DaemonClient(socket_path, timeout=0.5).close()
+            except ConnectionRefusedError:
+                os.unlink(socket_path)
+            except OSError as e:
+                # e.g. a timeout while a live daemon's backlog is full
+                raise RuntimeError(f"Cannot tell whether a timer daemon is listening on "
+                                   f"{socket_path}: {e}")
+            else:
+                raise RuntimeError(f"A timer daemon is already listening on {socket_path}")
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)
+        try:
+            listener.bind(socket_path)
+        finally:
+            os.umask(umask)
+        listener.listen(socket.SOMAXCONN)
+        listener.setblocking(False)
+        return listener
+
+    def _setup_callbacks(self):
+        """Subscribe the watching clients to timer events."""
+        # Forwarded by the selector loop, which pumps the polled delivery
+        # like the GUI's render loop
+        self.event_bus.subscribe(
+            EVENT_KINDS, self._broadcast, delivery=DELIVERY_RENDER, name="daemon_clients"
+        )
+
+    def _broadcast(self, event: TimerEvent):
+        """
+        Send a timer event to every watching client.
+
+        Args:
+            event: Timer event
+        """
+        line = self._encode({"event": event.kind, "seconds": event.seconds, "time": event.time_str})
+        for connection in list(self.connections.values()):
+            if connection.watching:
+                self._send(connection, line)
+
+    def status(self) -> dict:
+        """
+        Get the timer status sent with every reply.
+
+        Returns:
+            Dictionary with running, paused, seconds, time and clients
+        """
+        return {
+            "running": self.timer.is_running,
+            "paused": self.timer.is_paused,
+            "seconds": self.timer.current_time,
+            "time": self.timer.get_formatted_time(),
+            "clients": len(self.connections),
+        }
+
+    def handle_command(self, line: str, connection: Optional[_Connection] = None) -> dict:
+        """
+        Run one protocol command.
+
+        Args:
+            line: Command line, e.g. "start 00:25:00"
+            connection: Client that sent it (needed for "watch")
+
+        Returns:
+            Reply dictionary
+        """
+        parts = line.split()
+        command = parts[0].lower() if parts else ""
+        if command not in COMMANDS:
+            return {"ok": False, "error": f"unknown command: {command or '(empty)'}"}
+
+        track = self.clickstream_tracker.track_event
+        if command == "start":
+            time_str = parts[1] if len(parts) > 1 else Config.DEFAULT_POMODORO_TIME
+            track("daemon_command", "start_button", {"time_input": time_str})
+            if not self.timer.start(time_str):
+                return {"ok": False, "error": f"invalid time: {time_str} (expected HH:MM:SS)"}
+            self.audio_manager.play_sound_async(self.audio_manager.start_sound)
+        elif command == "pause" or (command == "resume" and self.timer.is_paused):
+            track("daemon_command", "pause_button", {"is_paused": not self.timer.is_paused})
+            self.audio_manager.play_sound_async(self.audio_manager.pause_sound)
+            self.timer.pause()
+        elif command == "reset":
+            track("daemon_command", "reset_button")
+            self.audio_manager.play_sound_async(self.audio_manager.reset_sound)
+            self.timer.reset()
+        elif command == "timeleft":
+            remaining_time = self.timer.get_formatted_time()
+            track("daemon_command", "timeleft_button", {"remaining_time": remaining_time})
+            self.audio_manager.play_timeleft_async(remaining_time)
+        elif command == "watch" and connection is not None:
+            connection.watching = True
+        elif command == "stop":
+            self.stopping = True
+        return {"ok": True, **self.status()}
+
+    def serve_forever(self):
+        """Serve clients until a "stop" command, SIGTERM or Ctrl+C."""
+        print(f"Timer daemon listening on {self.socket_path}")
+        try:
+            while not self.stopping:
+                for key, mask in self.selector.select(Config.DAEMON_POLL_INTERVAL):
+                    if key.fileobj is self.listener:
+                        self._accept()
+                        continue
+                    connection = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._receive(connection)
+                    if mask & selectors.EVENT_WRITE and connection.sock in self.connections:
+                        self._flush(connection)
+                self.event_bus.pump(DELIVERY_RENDER)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def _accept(self):
+        # Take every pending connection, so a burst of clients never fills the backlog
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            connection = _Connection(sock)
+            self.connections[sock] = connection
+            self.selector.register(sock, selectors.EVENT_READ, connection)
+
+    def _receive(self, connection: _Connection):
+        try:
+            data = connection.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._close(connection)
+            return
+
+        connection.received += data
+        while b"\n" in connection.received:
+            line, _, rest = connection.received.partition(b"\n")
+            connection.received = bytearray(rest)
+            reply = self.handle_command(line.decode(errors="replace"), connection)
+            self._send(connection, self._encode(reply))
+            if connection.sock not in self.connections:
+                return
+        if len(connection.received) > MAX_COMMAND_BYTES:
+            self._close(connection)
+
+    def _send(self, connection: _Connection, payload: bytes):
+        connection.unsent += payload
+        if len(connection.unsent) > Config.DAEMON_MAX_CLIENT_BUFFER:
+            # A watcher that stopped reading
+            self._close(connection)
+            return
+        self._flush(connection)
+
+    def _flush(self, connection: _Connection):
+        try:
+            sent = connection.sock.send(connection.unsent)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._close(connection)
+            return
+        del connection.unsent[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if connection.unsent else 0)
+        self.selector.modify(connection.sock, events, connection)
+
+    def _close(self, connection: _Connection):
+        if self.connections.pop(connection.sock, None) is None:
+            return
+        self.selector.unregister(connection.sock)
+        connection.sock.close()
+
+    def _close_listener(self):
+        self.selector.unregister(self.listener)
+        self.selector.close()
+        self.listener.close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _encode(message: dict) -> bytes:
+        return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+    def shutdown(self):
+        """Close every connection and stop the components like Application.run."""
+        for connection in list(self.connections.values()):
+            self._close(connection)
+        self._close_listener()
+        self.engine.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run the TimeLEFT timer daemon")
+    parser.add_argument("--socket", help="socket path (default: timeleft.sock in the cache dir)")
+    parser.add_argument("--no-tracking", action="store_true",
+                        help="do not record clickstream events")
+    args = parser.parse_args(argv)
+
+    try:
+        daemon = TimerDaemon(args.socket, tracking=Config.CLICKSTREAM_ENABLED and not args.no_tracking)
+    except (RuntimeError, OSError) as e:
+        print(f"Could not start timer daemon: {e}", file=sys.stderr)
+        return 1
+
+    # Stop cleanly when the service manager asks
+    signal.signal(signal.SIGTERM, lambda signum, frame: setattr(daemon, "stopping", True))
+    daemon.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
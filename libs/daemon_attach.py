@@ -0,0 +1,159 @@
+"""
+Daemon attachment for Half-Life VOX TimeLEFT application.
+Lets the GUI drive a running timer daemon instead of a timer of its own.
+
+RemoteTimer has the Timer interface the UI uses and forwards each call as
+a daemon command; the daemon's timer events are republished on the local
+EventBus, so the display updates as before. The daemon plays the start,
+pause and reset sounds, the time-left announcement and the countdown on
+its mixer, so every attached client hears one timer. Effects that belong
+to the GUI alone (weapons, backgrounds) still play locally.
+"""
+
+import socket
+import threading
+import time
+from typing import Optional
+
+from libs.asset_manager import AssetManager
+from libs.audio_manager import AudioManager
+from libs.daemon_client import DaemonClient
+from libs.event_bus import FINISHED, PAUSED, RESET, RESUMED, STARTED, EventBus, TimerEvent
+from libs.runtime import Runtime
+
+
+class RemoteTimer:
+    """Timer interface backed by a timer daemon."""
+
+    def __init__(self, client: DaemonClient, event_bus: EventBus):
+        """
+        Attach to the daemon and start following its events.
+
+        Args:
+            client: Connection used for commands
+            event_bus: Bus the daemon's timer events are published on
+
+        Raises:
+            OSError: If the daemon stops answering while attaching
+        """
+        self.client = client
+        self.event_bus = event_bus
+        self.lock = threading.Lock()
+        self._status = client.status()
+
+        # A second connection, since a watching connection also receives events
+        self._watcher = DaemonClient(client.socket_path)
+        self._thread = threading.Thread(target=self._follow, name="daemon-watch", daemon=True)
+        self._thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the daemon's timer is running."""
+        return self._status.get("running", False)
+
+    @property
+    def is_paused(self) -> bool:
+        """Check if the daemon's timer is paused."""
+        return self._status.get("paused", False)
+
+    @property
+    def current_time(self) -> int:
+        """Get the seconds left on the daemon's timer."""
+        return self._status.get("seconds", 0)
+
+    def get_formatted_time(self) -> str:
+        """Get the daemon's time left as HH:MM:SS."""
+        return self._status.get("time", "00:00:00")
+
+    def start(self, time_str: str) -> bool:
+        """
+        Start (or restart) the daemon's timer.
+
+        Args:
+            time_str: Time in HH:MM:SS format
+
+        Returns:
+            True if the daemon accepted the time
+        """
+        return self._request("start", time_str)
+
+    def pause(self):
+        """Toggle pause on the daemon's timer."""
+        self._request("pause")
+
+    def reset(self):
+        """Reset the daemon's timer."""
+        self._request("reset")
+
+    def announce_time_left(self):
+        """Have the daemon announce the time left."""
+        self._request("timeleft")
+
+    def close(self):
+        """Detach; the daemon's timer keeps running."""
+        # shutdown() wakes the watch thread blocked reading the socket
+        try:
+            self._watcher.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._watcher.close()
+        with self.lock:
+            self.client.close()
+
+    def _request(self, command: str, *args: str) -> bool:
+        with self.lock:
+            try:
+                reply = self.client.request(command, *args)
+            except (OSError, ValueError) as e:
+                print(f"Timer daemon error: {e}")
+                return False
+        if not reply.get("ok"):
+            return False
+        self._status = reply
+        return True
+
+    def _follow(self):
+        """Republish the daemon's events (on the daemon-watch thread)."""
+        states = {
+            STARTED: (True, False), RESUMED: (True, False), PAUSED: (True, True),
+            RESET: (False, False), FINISHED: (False, False),
+        }
+        try:
+            for event in self._watcher.watch():
+                running, paused = states.get(event["event"], (self.is_running, self.is_paused))
+                self._status = {**self._status, "running": running, "paused": paused,
+                                "seconds": event["seconds"], "time": event["time"]}
+                self.event_bus.publish(
+                    TimerEvent(event["event"], event["seconds"], event["time"], time.monotonic())
+                )
+        except (OSError, ValueError):
+            pass
+        print("Detached from timer daemon")
+
+
+class RemoteAudioManager(AudioManager):
+    """AudioManager whose timer sounds are played by the daemon."""
+
+    def __init__(self, asset_manager: AssetManager, runtime: Optional[Runtime],
+                 timer: RemoteTimer):
+        """
+        Initialize the local mixer for GUI-only effects.
+
+        Args:
+            asset_manager: AssetManager instance for sound lookups
+            runtime: Runtime whose queues play the sounds
+            timer: Attached daemon timer
+        """
+        super().__init__(asset_manager, runtime)
+        self.timer = timer
+        # Played by the daemon with the start, pause and reset commands
+        self._daemon_sounds = {self.start_sound, self.pause_sound, self.reset_sound}
+
+    def play_sound_async(self, sound_path: str):
+        """Play a sound locally unless the daemon plays it."""
+        if sound_path not in self._daemon_sounds:
+            super().play_sound_async(sound_path)
+
+    def play_timeleft_async(self, timeleft: str):
+        """Have the daemon announce its own time left."""
+        self.timer.announce_time_left()
@@ -0,0 +1,176 @@
+"""
+Timer daemon client for Half-Life VOX TimeLEFT application.
+Talks to the daemon in libs/daemon.py over its Unix domain socket.
+
+Only the standard library is imported, so scripts and thin clients attach
+without loading pygame, assets or the tracker.
+
+Protocol: one command per line ("start 00:25:00", "pause", "resume",
+"reset", "timeleft", "status", "watch", "stop"); every command is answered
+with one JSON line holding "ok" and the timer status, or "error". After
+"watch", the daemon also sends one JSON line per timer event.
+
+Usage:
+    python -m libs.daemon_client start [HH:MM:SS]
+    python -m libs.daemon_client pause|resume|reset|timeleft|status|stop
+    python -m libs.daemon_client watch
+"""
+
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from libs.cache_dir import get_cache_dir
+from libs.config import Config
+
+SOCKET_FILENAME = "timeleft.sock"
+COMMANDS = ("start", "pause", "resume", "reset", "timeleft", "status", "watch", "stop")
+
+
+def default_socket_path() -> Path:
+    """Get the daemon socket path (Config.DAEMON_SOCKET or the user cache dir)."""
+    return Path(Config.DAEMON_SOCKET or get_cache_dir() / SOCKET_FILENAME)
+
+
+class DaemonClient:
+    """Connection to a running timer daemon."""
+
+    def __init__(self, socket_path: Optional[str] = None,
+                 timeout: float = Config.DAEMON_CLIENT_TIMEOUT):
+        """
+        Connect to the daemon.
+
+        Args:
+            socket_path: Daemon socket (defaults to default_socket_path())
+            timeout: Seconds to wait for a reply
+
+        Raises:
+            OSError: If no daemon is listening on the socket
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform")
+        self.socket_path = str(socket_path or default_socket_path())
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.socket_path)
+        except OSError:
+            self.sock.close()
+            raise
+        self._reader = self.sock.makefile("rb")
+
+    def request(self, command: str, *args: str) -> dict:
+        """
+        Send a command and wait for its reply.
+
+        Args:
+            command: One of COMMANDS
+            *args: Command arguments
+
+        Returns:
+            Reply dictionary ("ok" plus the timer status, or "error")
+
+        Raises:
+            ConnectionError: If the daemon closed the connection
+        """
+        self.sock.sendall((" ".join((command,) + args) + "\n").encode())
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Timer daemon closed the connection")
+        return json.loads(line)
+
+    def start(self, time_str: str = Config.DEFAULT_POMODORO_TIME) -> dict:
+        """Start (or restart) the timer with an HH:MM:SS time."""
+        return self.request("start", time_str)
+
+    def pause(self) -> dict:
+        """Toggle pause, like the Pause button."""
+        return self.request("pause")
+
+    def resume(self) -> dict:
+        """Resume a paused timer."""
+        return self.request("resume")
+
+    def reset(self) -> dict:
+        """Reset the timer."""
+        return self.request("reset")
+
+    def timeleft(self) -> dict:
+        """Announce the time left on the daemon's speakers."""
+        return self.request("timeleft")
+
+    def status(self) -> dict:
+        """Get the timer status."""
+        return self.request("status")
+
+    def stop(self) -> dict:
+        """Ask the daemon to shut down."""
+        return self.request("stop")
+
+    def watch(self) -> Iterator[dict]:
+        """
+        Follow timer events until the daemon stops.
+
+        Yields:
+            Event dictionaries ("event", "seconds", "time")
+        """
+        self.request("watch")
+        self.sock.settimeout(None)
+        for line in self._reader:
+            yield json.loads(line)
+
+    def close(self):
+        """Close the connection."""
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Control the TimeLEFT timer daemon")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("time", nargs="?", help="HH:MM:SS for start")
+    parser.add_argument("--socket", help="daemon socket path")
+    args = parser.parse_args(argv)
+
+    try:
+        client = DaemonClient(args.socket)
+    except OSError as e:
+        print(f"No timer daemon at {args.socket or default_socket_path()}: {e}", file=sys.stderr)
+        print("Start one with: python -m libs.daemon", file=sys.stderr)
+        return 1
+
+    with client:
+        try:
+            if args.command == "watch":
+                for event in client.watch():
+                    print(f"{event['event']:<10} {event['time']}", flush=True)
+                return 0
+            extra = (args.time,) if args.command == "start" and args.time else ()
+            reply = client.request(args.command, *extra)
+        except KeyboardInterrupt:
+            return 0
+        except (OSError, ValueError) as e:
+            print(f"Timer daemon error: {e}", file=sys.stderr)
+            return 1
+
+    if not reply.get("ok"):
+        print(f"Error: {reply.get('error')}", file=sys.stderr)
+        return 1
+    state = "paused" if reply["paused"] else "running" if reply["running"] else "stopped"
+    print(f"{reply['time']} {state}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,292 @@
+"""
+EventBus class for Half-Life VOX TimeLEFT application.
+Delivers timer events to subscribers on the thread each subscriber chooses.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from libs.tracker_metrics import Histogram
+
+# Timer event kinds
+TICK = "tick"
+STARTED = "started"
+PAUSED = "paused"
+RESUMED = "resumed"
+RESET = "reset"
+FINISHED = "finished"
+MILESTONE = "milestone"
+EVENT_KINDS = (TICK, STARTED, PAUSED, RESUMED, RESET, FINISHED, MILESTONE)
+
+# Delivery threads. "render" is pumped by the UI loop; any other name gets
+# its own worker thread, started on first subscription.
+DELIVERY_RENDER = "render"
+DELIVERY_AUDIO = "audio"
+DELIVERY_TRACKER = "tracker"
+POLLED_DELIVERIES = (DELIVERY_RENDER,)
+
+
+class TimerEvent(NamedTuple):
+    """One timer event."""
+
+    kind: str
+    seconds: int  # Seconds left on the timer
+    time_str: str  # seconds formatted as HH:MM:SS
+    monotonic: float  # When the event was published
+
+
+class Subscription:
+    """
+    One subscriber: its handler, delivery thread and ring buffer.
+
+    The ring buffer holds at most capacity events; when the subscriber
+    falls behind, the oldest undelivered events are overwritten and
+    counted, so publishing never waits for it.
+    """
+
+    def __init__(self, name: str, kinds: Iterable[str], handler: Callable[[TimerEvent], None],
+                 delivery: str, capacity: int):
+        """
+        Initialize the subscription.
+
+        Args:
+            name: Name used in statistics
+            kinds: Event kinds delivered to the handler
+            handler: Function called with each TimerEvent
+            delivery: Delivery thread name
+            capacity: Ring buffer size
+        """
+        self.name = name
+        self.kinds = frozenset(kinds)
+        self.handler = handler
+        self.delivery = delivery
+        self.buffer = deque(maxlen=max(1, capacity))
+        self.delivered = 0
+        self.overwritten = 0
+        self.errors = 0
+        self.handler_ms = Histogram()
+        self.latency_ms = Histogram()
+
+    def offer(self, event: TimerEvent):
+        """Add an event to the ring buffer without blocking."""
+        if len(self.buffer) == self.buffer.maxlen:
+            self.overwritten += 1
+        self.buffer.append(event)
+
+    def drain(self) -> int:
+        """
+        Call the handler for every buffered event.
+
+        Returns:
+            Number of events handled
+        """
+        handled = 0
+        while True:
+            try:
+                event = self.buffer.popleft()
+            except IndexError:
+                return handled
+            started = time.monotonic()
+            self.latency_ms.observe((started - event.monotonic) * 1000)
+            try:
+                self.handler(event)
+            except Exception as e:
+                self.errors += 1
+                print(f"Error in {self.name} event handler: {e}")
+            self.handler_ms.observe((time.monotonic() - started) * 1000)
+            self.delivered += 1
+            handled += 1
+
+    def get_stats(self) -> dict:
+        """Get delivery statistics."""
+        return {
+            "delivery": self.delivery,
+            "buffered": len(self.buffer),
+            "delivered": self.delivered,
+            "overwritten": self.overwritten,
+            "errors": self.errors,
+            "handler_ms": self.handler_ms.snapshot(),
+            "latency_ms": self.latency_ms.snapshot(),
+        }
+
+
+class _Delivery:
+    """Subscriptions delivered on one thread, and the flag that wakes it."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.subscriptions: List[Subscription] = []
+        self.pending = threading.Event()
+        self.stopping = False
+        self.thread = None
+
+    def drain(self) -> int:
+        self.pending.clear()
+        return sum(subscription.drain() for subscription in list(self.subscriptions))
+
+    def run(self):
+        while not self.stopping:
+            self.pending.wait()
+            self.drain()
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for timer events.
+
+    publish() only appends to the ring buffers of matching subscribers
+    and wakes their delivery threads, so the timer thread never runs a
+    handler and a slow subscriber can only lose its own oldest events.
+    Subscribers on the "render" delivery are handled when the UI loop
+    calls pump(); every other delivery name has a daemon worker thread.
+    """
+
+    def __init__(self):
+        """Initialize an empty bus."""
+        self.lock = threading.Lock()
+        self.published = 0
+        self.publish_us = Histogram()
+        self._by_kind: Dict[str, tuple] = {}
+        self._deliveries: Dict[str, _Delivery] = {}
+
+    def subscribe(
+        self,
+        kinds: Iterable[str],
+        handler: Callable[[TimerEvent], None],
+        delivery: str = DELIVERY_RENDER,
+        capacity: int = 64,
+        name: Optional[str] = None
+    ) -> Subscription:
+        """
+        Register a handler.
+
+        Args:
+            kinds: Event kinds to receive (see EVENT_KINDS)
+            handler: Function called with each TimerEvent on the delivery thread
+            delivery: Delivery thread name (DELIVERY_RENDER, DELIVERY_AUDIO,
+                DELIVERY_TRACKER or any other name for a dedicated thread)
+            capacity: Ring buffer size; older events are overwritten beyond it
+            name: Name used in statistics (defaults to the handler's name)
+
+        Returns:
+            Subscription (pass to unsubscribe())
+
+        Raises:
+            ValueError: If an event kind is unknown
+        """
+        kinds = tuple(kinds)
+        unknown = set(kinds) - set(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown event kinds: {sorted(unknown)}")
+
+        subscription = Subscription(
+            name or getattr(handler, "__qualname__", repr(handler)),
+            kinds, handler, delivery, capacity
+        )
+        with self.lock:
+            target = self._deliveries.get(delivery)
+            if target is None:
+                target = self._deliveries[delivery] = _Delivery(delivery)
+                if delivery not in POLLED_DELIVERIES:
+                    target.thread = threading.Thread(
+                        target=target.run,
+                        name=f"event-bus-{delivery}",
+                        daemon=True
+                    )
+                    target.thread.start()
+            target.subscriptions.append(subscription)
+            # Copy on write, so publish() reads without taking the lock
+            for kind in kinds:
+                self._by_kind[kind] = self._by_kind.get(kind, ()) + ((subscription, target),)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a handler; events already buffered for it are discarded.
+
+        Args:
+            subscription: Result of subscribe()
+        """
+        with self.lock:
+            target = self._deliveries.get(subscription.delivery)
+            if target is not None and subscription in target.subscriptions:
+                target.subscriptions.remove(subscription)
+            for kind in subscription.kinds:
+                self._by_kind[kind] = tuple(
+                    entry for entry in self._by_kind.get(kind, ()) if entry[0] is not subscription
+                )
+        subscription.buffer.clear()
+
+    def publish(self, event: TimerEvent):
+        """
+        Hand an event to its subscribers without waiting for them.
+
+        Args:
+            event: Event to deliver
+        """
+        started = time.perf_counter()
+        for subscription, target in self._by_kind.get(event.kind, ()):
+            subscription.offer(event)
+            if not target.pending.is_set():
+                target.pending.set()
+        self.published += 1
+        self.publish_us.observe((time.perf_counter() - started) * 1e6)
+
+    def pump(self, delivery: str = DELIVERY_RENDER) -> int:
+        """
+        Deliver pending events of a polled delivery on the calling thread.
+
+        Cheap when nothing is pending, so it can run every frame.
+
+        Args:
+            delivery: Polled delivery name
+
+        Returns:
+            Number of events handled
+        """
+        target = self._deliveries.get(delivery)
+        if target is None or not target.pending.is_set():
+            return 0
+        return target.drain()
+
+    def get_stats(self) -> dict:
+        """
+        Get bus statistics.
+
+        Returns:
+            Dictionary with events published, publish overhead in
+            microseconds, and per-subscriber delivery statistics
+        """
+        with self.lock:
+            subscriptions = [s for target in self._deliveries.values() for s in target.subscriptions]
+        subscribers = {}
+        for subscription in subscriptions:
+            name = subscription.name
+            # Unnamed lambdas share a name
+            while name in subscribers:
+                name += "'"
+            subscribers[name] = subscription.get_stats()
+        return {
+            "published": self.published,
+            "publish_us": self.publish_us.snapshot(),
+            "subscribers": subscribers,
+        }
+
+    def shutdown(self, timeout: float = 0.05):
+        """
+        Stop the worker threads.
+
+        Args:
+            timeout: Seconds to wait for each thread to finish its handler
+        """
+        with self.lock:
+            deliveries = list(self._deliveries.values())
+        deadline = time.monotonic() + timeout
+        for target in deliveries:
+            target.stopping = True
+            target.pending.set()
+        for target in deliveries:
+            if target.thread is not None:
+                target.thread.join(timeout=max(0.0, deadline - time.monotonic()))
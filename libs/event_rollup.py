@@ -0,0 +1,182 @@
+"""
+EventRollup class for Half-Life VOX TimeLEFT application.
+Aggregates clickstream events into per-minute summary rows on the worker thread.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from libs.clickstream_event import COMPONENT, EVENT_TYPE, METADATA, MONOTONIC
+from libs.config import Config
+
+ROLLUP_EVENT_TYPE = "rollup"
+
+# What happens to raw events when rollups are on
+ROLLUP_OFF = "off"
+ROLLUP_ALONGSIDE = "alongside"  # Keep every raw event as well
+ROLLUP_INSTEAD = "instead"  # Keep only protected raw events
+ROLLUP_MODES = (ROLLUP_OFF, ROLLUP_ALONGSIDE, ROLLUP_INSTEAD)
+
+
+class _Bucket:
+    """Counts for one (minute, event type, component)."""
+
+    __slots__ = ("count", "raw", "first", "last", "distinct")
+
+    def __init__(self, now: float):
+        self.count = 0
+        self.raw = 0
+        self.first = now
+        self.last = now
+        self.distinct = {}
+
+
+class EventRollup:
+    """
+    Per-minute counts of clickstream events.
+
+    Events are counted per (minute, event type, component) with first and
+    last times and the distinct values of selected metadata keys (weapons,
+    backgrounds). Minutes that have ended are released by flush() as one
+    summary row each, with event_type "rollup" and the summary in metadata,
+    so they fit the existing clickstream table. The summary's "raw" count
+    says how many of the counted events were also kept as raw events, so
+    readers of both can avoid counting them twice.
+    """
+
+    def __init__(
+        self,
+        epoch_offset: float,
+        mode: str = Config.CLICKSTREAM_ROLLUP_MODE,
+        interval: float = Config.CLICKSTREAM_ROLLUP_INTERVAL,
+        distinct_keys: Optional[List[str]] = None,
+        protected: Optional[List[str]] = None
+    ):
+        """
+        Initialize the rollup.
+
+        Args:
+            epoch_offset: Wall-clock time minus monotonic time (from EventEncoder)
+            mode: One of ROLLUP_MODES
+            interval: Seconds between flushes of ended minutes
+            distinct_keys: Metadata keys whose distinct values are listed
+            protected: "event_type" or "event_type:component" keys whose raw
+                events are kept in "instead" mode
+
+        Raises:
+            ValueError: If mode is unknown
+        """
+        if mode not in ROLLUP_MODES:
+            raise ValueError(f"Unknown rollup mode: {mode}")
+
+        self.epoch_offset = epoch_offset
+        self.mode = mode
+        self.interval = interval
+        self.distinct_keys = tuple(distinct_keys if distinct_keys is not None
+                                   else Config.CLICKSTREAM_ROLLUP_DISTINCT_KEYS)
+        if protected is None:
+            protected = Config.CLICKSTREAM_PROTECTED_EVENTS
+        self.protected = set(protected)
+
+        self.rows_emitted = 0
+        self.events_rolled_up = 0
+        self._buckets: Dict[Tuple[int, str, str], _Bucket] = {}
+        self._next_flush = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Check whether rollups are on."""
+        return self.mode != ROLLUP_OFF
+
+    def process(self, records: List[tuple]) -> List[tuple]:
+        """
+        Count records and return the raw records to keep.
+
+        Args:
+            records: Compact event records
+
+        Returns:
+            Records to spool as raw events
+        """
+        kept = []
+        for record in records:
+            keep = self.mode == ROLLUP_ALONGSIDE or self._is_protected(record)
+            self._add(record, keep)
+            if keep:
+                kept.append(record)
+        return kept
+
+    def flush(self, monotonic_now: float, force: bool = False) -> List[tuple]:
+        """
+        Release summary rows for minutes that have ended.
+
+        Args:
+            monotonic_now: Current monotonic time
+            force: Release every minute, including the current one (shutdown)
+
+        Returns:
+            Compact records for the summary rows
+        """
+        if not self._buckets or (not force and monotonic_now < self._next_flush):
+            return []
+        self._next_flush = monotonic_now + self.interval
+
+        current_minute = int((monotonic_now + self.epoch_offset) // 60)
+        released = []
+        for key in sorted(self._buckets):
+            minute, event_type, component = key
+            if not force and minute >= current_minute:
+                continue
+            bucket = self._buckets.pop(key)
+            released.append((bucket.first, ROLLUP_EVENT_TYPE, component, {
+                "event_type": event_type,
+                "minute": minute * 60,
+                "count": bucket.count,
+                "raw": bucket.raw,
+                "first_ms": round((bucket.first + self.epoch_offset) * 1000),
+                "last_ms": round((bucket.last + self.epoch_offset) * 1000),
+                **{key: sorted(values) for key, values in bucket.distinct.items()},
+            }))
+        self.rows_emitted += len(released)
+        return released
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get rollup statistics.
+
+        Returns:
+            Dictionary with events counted, summary rows emitted and open buckets
+        """
+        return {
+            "events_rolled_up": self.events_rolled_up,
+            "rows_emitted": self.rows_emitted,
+            "open_buckets": len(self._buckets)
+        }
+
+    def _add(self, record: tuple, raw: bool):
+        monotonic = record[MONOTONIC]
+        metadata = record[METADATA] or {}
+        minute = int((monotonic + self.epoch_offset) // 60)
+        key = (minute, record[EVENT_TYPE], record[COMPONENT])
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(monotonic)
+
+        # Collapsed bursts stand for several clicks
+        count = metadata.get("burst_count", 1)
+        bucket.count += count
+        if raw:
+            bucket.raw += count
+        self.events_rolled_up += count
+        bucket.first = min(bucket.first, monotonic)
+        bucket.last = max(bucket.last, monotonic + metadata.get("burst_span_ms", 0) / 1000)
+
+        for name in self.distinct_keys:
+            value = metadata.get(name)
+            if value is not None:
+                bucket.distinct.setdefault(name, set()).add(str(value))
+
+    def _is_protected(self, record: tuple) -> bool:
+        event_type = record[EVENT_TYPE]
+        return (event_type in self.protected or
+                f"{event_type}:{record[COMPONENT]}" in self.protected)
@@ -0,0 +1,241 @@
+"""
+EventSampler class for Half-Life VOX TimeLEFT application.
+Per-event-type sampling, rate limiting and burst collapsing for clickstream events.
+"""
+
+import threading
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from libs.config import Config
+
+
+class SamplingPolicy:
+    """
+    How one kind of event is thinned out before it is queued.
+
+    Steps are applied in order: session sampling, burst collapsing, rate
+    limiting. A policy with no settings keeps every event.
+    """
+
+    __slots__ = ("sample_rate", "collapse_window", "collapse_max_span", "rate_limit", "burst")
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        collapse_window: float = 0.0,
+        collapse_max_span: float = 60.0,
+        rate_limit: float = 0.0,
+        burst: Optional[float] = None
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            sample_rate: Fraction of sessions that report the event (0..1),
+                chosen deterministically from the session ID
+            collapse_window: Events closer together than this many seconds
+                are merged into one event with a count and a time span (0 = off)
+            collapse_max_span: Longest time one merged event may cover
+            rate_limit: Maximum events per second (0 = unlimited)
+            burst: Events allowed at once above the rate (defaults to the rate)
+        """
+        self.sample_rate = sample_rate
+        self.collapse_window = collapse_window
+        self.collapse_max_span = collapse_max_span
+        self.rate_limit = rate_limit
+        self.burst = max(1.0, burst if burst is not None else rate_limit)
+
+
+class _Burst:
+    """Events being merged into one."""
+
+    __slots__ = ("first", "last", "count", "event_type", "component", "metadata")
+
+    def __init__(self, now: float, event_type: str, component: str, metadata):
+        self.first = now
+        self.last = now
+        self.count = 1
+        self.event_type = event_type
+        self.component = component
+        self.metadata = metadata
+
+    def record(self) -> tuple:
+        metadata = dict(self.metadata or {})
+        metadata["burst_count"] = self.count
+        metadata["burst_span_ms"] = round((self.last - self.first) * 1000)
+        return (self.first, self.event_type, self.component, metadata)
+
+
+class EventSampler:
+    """
+    Applies SamplingPolicy objects to events in track_event.
+
+    Policies are looked up by "event_type:component" first, then by
+    "event_type". Events listed in protected are never thinned out, so
+    timer lifecycle events always arrive even if their event type has a
+    policy. Merged bursts are held here until flush() releases them.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        policies: Optional[Dict[str, Dict[str, Any]]] = None,
+        protected: Optional[List[str]] = None
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            session_id: Session UUID (seeds the per-session sampling decision)
+            policies: Policy settings by "event_type" or "event_type:component"
+            protected: "event_type" or "event_type:component" keys that are never sampled
+        """
+        if policies is None:
+            policies = Config.CLICKSTREAM_EVENT_POLICIES
+        if protected is None:
+            protected = Config.CLICKSTREAM_PROTECTED_EVENTS
+
+        self.session_id = session_id
+        self.policies = {self._parse_key(key): SamplingPolicy(**settings)
+                         for key, settings in policies.items()}
+        self.protected = {self._parse_key(key) for key in protected}
+
+        self.lock = threading.Lock()
+        self.sampled_out = Counter()
+        self.rate_limited = Counter()
+        self.collapsed = 0
+        self._bursts = {}
+        self._buckets = {}
+        self._session_keeps = {}
+
+    @property
+    def active(self) -> bool:
+        """Check whether any policy is configured."""
+        return bool(self.policies)
+
+    def admit(self, now: float, event_type: str, component: str, metadata) -> Optional[tuple]:
+        """
+        Decide what to queue for an event.
+
+        Args:
+            now: Monotonic time of the event
+            event_type: Type of event
+            component: UI component name
+            metadata: Event metadata
+
+        Returns:
+            Compact event record to queue, or None if nothing is queued now
+        """
+        key = (event_type, component)
+        policy = self.policies.get(key) or self.policies.get(event_type)
+        if policy is None or key in self.protected or event_type in self.protected:
+            return (now, event_type, component, metadata)
+
+        name = f"{event_type}:{component}"
+        with self.lock:
+            if policy.sample_rate < 1.0 and not self._session_keeps_event(key, policy):
+                self.sampled_out[name] += 1
+                return None
+
+            if policy.collapse_window > 0:
+                return self._collapse(key, policy, now, event_type, component, metadata)
+
+            if not self._take_token(key, policy, now):
+                self.rate_limited[name] += 1
+                return None
+
+        if policy.sample_rate < 1.0:
+            metadata = dict(metadata or {}, sample_rate=policy.sample_rate)
+        return (now, event_type, component, metadata)
+
+    def flush(self, now: float, force: bool = False) -> List[tuple]:
+        """
+        Release merged bursts that have ended.
+
+        Args:
+            now: Current monotonic time
+            force: Release every burst (e.g. on shutdown)
+
+        Returns:
+            Compact event records to queue
+        """
+        if not self._bursts:
+            return []
+
+        released = []
+        with self.lock:
+            for key, burst in list(self._bursts.items()):
+                policy = self.policies.get(key) or self.policies.get(key[0])
+                if force or now - burst.last >= policy.collapse_window:
+                    del self._bursts[key]
+                    if self._take_token(key, policy, now):
+                        released.append(burst.record())
+                    else:
+                        self.rate_limited[f"{key[0]}:{key[1]}"] += burst.count
+        return released
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get sampling statistics.
+
+        Returns:
+            Dictionary with events removed by sampling and rate limiting
+            (per "event_type:component"), events merged into bursts and
+            bursts still open
+        """
+        with self.lock:
+            return {
+                "sampled_out": dict(self.sampled_out),
+                "rate_limited": dict(self.rate_limited),
+                "collapsed": self.collapsed,
+                "open_bursts": len(self._bursts)
+            }
+
+    def _collapse(self, key, policy: SamplingPolicy, now: float,
+                  event_type: str, component: str, metadata) -> Optional[tuple]:
+        burst = self._bursts.get(key)
+        if burst is not None:
+            same_burst = (now - burst.last < policy.collapse_window and
+                          now - burst.first < policy.collapse_max_span and
+                          metadata == burst.metadata)
+            if same_burst:
+                burst.last = now
+                burst.count += 1
+                self.collapsed += 1
+                return None
+            # The previous burst is over; queue it and start a new one
+            del self._bursts[key]
+            self._bursts[key] = _Burst(now, event_type, component, metadata)
+            if self._take_token(key, policy, now):
+                return burst.record()
+            self.rate_limited[f"{event_type}:{component}"] += burst.count
+            return None
+
+        self._bursts[key] = _Burst(now, event_type, component, metadata)
+        return None
+
+    def _take_token(self, key, policy: SamplingPolicy, now: float) -> bool:
+        if policy.rate_limit <= 0:
+            return True
+        tokens, updated = self._buckets.get(key, (policy.burst, now))
+        tokens = min(policy.burst, tokens + (now - updated) * policy.rate_limit)
+        if tokens < 1.0:
+            self._buckets[key] = (tokens, now)
+            return False
+        self._buckets[key] = (tokens - 1.0, now)
+        return True
+
+    def _session_keeps_event(self, key, policy: SamplingPolicy) -> bool:
+        keep = self._session_keeps.get(key)
+        if keep is None:
+            digest = zlib.crc32(f"{self.session_id}:{key[0]}:{key[1]}".encode("utf-8"))
+            keep = digest / 0xFFFFFFFF < policy.sample_rate
+            self._session_keeps[key] = keep
+        return keep
+
+    @staticmethod
+    def _parse_key(key: str):
+        event_type, _, component = key.partition(":")
+        return (event_type, component) if component else event_type
@@ -0,0 +1,408 @@
+"""
+Event spool classes for Half-Life VOX TimeLEFT application.
+Durable, ordered storage for clickstream events awaiting upload.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import List, Optional
+
+from libs.config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+SEGMENT_SUFFIX = ".ndjson"
+CURSOR_FILENAME = "cursor.json"
+LOCK_FILENAME = "spool.lock"
+
+
+class SpoolLockedError(OSError):
+    """Raised when another process already owns the spool directory."""
+
+
+class SpoolBatch:
+    """A run of consecutive spooled events returned by a read."""
+
+    __slots__ = ("events", "start", "end", "size")
+
+    def __init__(self, events: List[dict], start, end, size: int):
+        """
+        Initialize the batch.
+
+        Args:
+            events: Decoded events in spool order
+            start: Spool position of the first event
+            end: Spool position just after the last event
+            size: Encoded size of the events in bytes
+        """
+        self.events = events
+        self.start = start
+        self.end = end
+        self.size = size
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+class EventSpool:
+    """
+    Append-only on-disk event log made of NDJSON segment files.
+
+    Writers append events and call commit(), which flushes and fsyncs once
+    for everything appended since the last commit (group commit). Readers
+    take batches in order and acknowledge them; acknowledged segments are
+    deleted. A torn final line left by a crash is truncated on open.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int = Config.CLICKSTREAM_SPOOL_SEGMENT_BYTES
+    ):
+        """
+        Open (or create) a spool directory.
+
+        Args:
+            directory: Directory holding the segment files
+            segment_bytes: Size at which a new segment is started
+
+        Raises:
+            SpoolLockedError: If another process is using the directory
+        """
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock_file = self._acquire_lock()
+
+        segments = self._list_segments()
+        if not segments:
+            segments = [1]
+        self._write_segment = segments[-1]
+        self._truncate_torn_tail(self._write_segment)
+        self._writer = open(self._segment_path(self._write_segment), "ab")
+        self._committed_size = self._writer.tell()
+        self._dirty = False
+
+        self._cursor = self._load_cursor(segments[0])
+        self._read_pos = self._cursor
+        self._pending_events, self._pending_bytes = self._count_pending()
+
+    def append(self, events: List[dict], block: bool = True) -> bool:
+        """
+        Append events to the spool (not yet durable until commit()).
+
+        Args:
+            events: JSON-serializable event dictionaries
+            block: Wait for the spool lock; if False, give up when it is busy
+
+        Returns:
+            True if the events were appended
+        """
+        if not events:
+            return True
+        data = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        encoded = data.encode("utf-8")
+
+        if not self.lock.acquire(blocking=block):
+            return False
+        try:
+            if self._writer.tell() >= self.segment_bytes:
+                self._rotate()
+            self._writer.write(encoded)
+            self._dirty = True
+            self._pending_events += len(events)
+            self._pending_bytes += len(encoded)
+        finally:
+            self.lock.release()
+        return True
+
+    def commit(self):
+        """
+        Flush and fsync everything appended since the last commit.
+
+        The fsync runs without the lock held, so appends are never stuck
+        behind the disk.
+        """
+        with self.lock:
+            if not self._dirty:
+                return
+            self._writer.flush()
+            segment = self._write_segment
+            size = self._writer.tell()
+            fd = os.dup(self._writer.fileno())
+            self._dirty = False
+
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        with self.lock:
+            # A rotation in the meantime already made the segment durable
+            if segment == self._write_segment:
+                self._committed_size = max(self._committed_size, size)
+
+    def read(self, max_events: int, max_bytes: Optional[int] = None) -> SpoolBatch:
+        """
+        Read the next committed events after the previous read.
+
+        Args:
+            max_events: Maximum number of events to return
+            max_bytes: Maximum encoded size of the batch (optional)
+
+        Returns:
+            SpoolBatch (possibly empty)
+        """
+        with self.lock:
+            start = self._read_pos
+            segment, offset = start
+            events = []
+            size = 0
+
+            while len(events) < max_events:
+                end = self._segment_end(segment)
+                if offset >= end:
+                    if segment >= self._write_segment:
+                        break
+                    segment, offset = segment + 1, 0
+                    continue
+
+                with open(self._segment_path(segment), "rb") as f:
+                    f.seek(offset)
+                    while len(events) < max_events and offset < end:
+                        line = f.readline()
+                        if not line.endswith(b"\n"):
+                            offset = end
+                            break
+                        if max_bytes and events and size + len(line) > max_bytes:
+                            max_events = len(events)
+                            break
+                        offset += len(line)
+                        size += len(line)
+                        try:
+                            events.append(json.loads(line))
+                        except ValueError:
+                            print(f"Skipping corrupt spool record in segment {segment}")
+
+            self._read_pos = (segment, offset)
+            return SpoolBatch(events, start, self._read_pos, size)
+
+    def ack(self, batch: SpoolBatch):
+        """
+        Mark a batch as delivered so it is never read again.
+
+        Args:
+            batch: Batch returned by read(), acknowledged in read order
+        """
+        with self.lock:
+            if batch.end <= self._cursor:
+                return
+            self._cursor = batch.end
+            self._pending_events -= len(batch.events)
+            self._pending_bytes -= batch.size
+            self._save_cursor()
+
+            for segment in self._list_segments():
+                if segment >= self._cursor[0]:
+                    break
+                try:
+                    os.remove(self._segment_path(segment))
+                except OSError:
+                    pass
+
+    def rewind(self):
+        """Return unacknowledged events to the reader, e.g. after a failed upload."""
+        with self.lock:
+            self._read_pos = self._cursor
+
+    def pending_count(self) -> int:
+        """Get the number of events not yet acknowledged."""
+        return self._pending_events
+
+    def pending_bytes(self) -> int:
+        """Get the encoded size of events not yet acknowledged."""
+        return self._pending_bytes
+
+    def close(self):
+        """Commit outstanding writes and release the spool."""
+        self.commit()
+        with self.lock:
+            self._writer.close()
+            if self._lock_file:
+                self._lock_file.close()
+                self._lock_file = None
+
+    def _acquire_lock(self):
+        if fcntl is None:
+            return None
+        lock_file = open(self.directory / LOCK_FILENAME, "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise SpoolLockedError(f"Spool {self.directory} is in use by another process")
+        return lock_file
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}{SEGMENT_SUFFIX}"
+
+    def _list_segments(self) -> List[int]:
+        return sorted(
+            int(name[:-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX) and name[:-len(SEGMENT_SUFFIX)].isdigit()
+        )
+
+    def _segment_end(self, segment: int) -> int:
+        if segment == self._write_segment:
+            return self._committed_size
+        try:
+            return os.path.getsize(self._segment_path(segment))
+        except OSError:
+            return 0
+
+    def _rotate(self):
+        self._writer.flush()
+        os.fsync(self._writer.fileno())
+        self._writer.close()
+        self._write_segment += 1
+        self._writer = open(self._segment_path(self._write_segment), "ab")
+        self._committed_size = 0
+
+    def _truncate_torn_tail(self, segment: int):
+        path = self._segment_path(segment)
+        if not path.exists():
+            return
+        with open(path, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+
+    def _load_cursor(self, first_segment: int):
+        try:
+            with open(self.directory / CURSOR_FILENAME, "r") as f:
+                data = json.load(f)
+            cursor = (int(data["segment"]), int(data["offset"]))
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            cursor = (first_segment, 0)
+        return max(cursor, (first_segment, 0))
+
+    def _save_cursor(self):
+        tmp_path = self.directory / (CURSOR_FILENAME + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"segment": self._cursor[0], "offset": self._cursor[1]}, f)
+        os.replace(tmp_path, self.directory / CURSOR_FILENAME)
+
+    def _count_pending(self):
+        events = 0
+        size = 0
+        for segment in self._list_segments():
+            if segment < self._cursor[0]:
+                continue
+            with open(self._segment_path(segment), "rb") as f:
+                if segment == self._cursor[0]:
+                    f.seek(self._cursor[1])
+                content = f.read()
+            events += content.count(b"\n")
+            size += len(content)
+        return events, size
+
+
+class MemorySpool:
+    """
+    In-memory stand-in for EventSpool with the same interface.
+
+    Used when the spool directory cannot be opened. Events do not survive
+    a restart, and the oldest events are dropped beyond max_events.
+    """
+
+    def __init__(self, max_events: int = Config.CLICKSTREAM_MEMORY_SPOOL_EVENTS):
+        """
+        Initialize the spool.
+
+        Args:
+            max_events: Maximum number of events held in memory
+        """
+        self.max_events = max_events
+        self.lock = threading.Lock()
+        self.dropped = 0
+        self._events = deque()
+        self._cursor = 0
+        self._read_pos = 0
+
+    def append(self, events: List[dict], block: bool = True) -> bool:
+        """Append events, dropping the oldest beyond max_events."""
+        if not self.lock.acquire(blocking=block):
+            return False
+        try:
+            self._events.extend(events)
+            while len(self._events) > self.max_events:
+                self._events.popleft()
+                self._cursor += 1
+                self._read_pos = max(self._read_pos, self._cursor)
+                self.dropped += 1
+        finally:
+            self.lock.release()
+        return True
+
+    def commit(self):
+        """No-op: memory is never durable."""
+
+    def read(self, max_events: int, max_bytes: Optional[int] = None) -> SpoolBatch:
+        """Read the next events after the previous read."""
+        with self.lock:
+            start = self._read_pos
+            offset = start - self._cursor
+            events = [self._events[i] for i in range(offset, min(offset + max_events, len(self._events)))]
+            self._read_pos = start + len(events)
+            return SpoolBatch(events, start, self._read_pos, 0)
+
+    def ack(self, batch: SpoolBatch):
+        """Drop a delivered batch."""
+        with self.lock:
+            while self._cursor < batch.end and self._events:
+                self._events.popleft()
+                self._cursor += 1
+
+    def rewind(self):
+        """Return unacknowledged events to the reader."""
+        with self.lock:
+            self._read_pos = self._cursor
+
+    def pending_count(self) -> int:
+        """Get the number of events not yet acknowledged."""
+        return len(self._events)
+
+    def pending_bytes(self) -> int:
+        """Size is not tracked in memory."""
+        return 0
+
+    def close(self):
+        """No-op."""
+
+
+def open_spool(directory: Optional[Path]):
+    """
+    Open the on-disk spool, falling back to memory if that fails.
+
+    Args:
+        directory: Spool directory, or None for a memory-only spool
+
+    Returns:
+        EventSpool or MemorySpool instance
+    """
+    if directory is None:
+        return MemorySpool()
+    try:
+        return EventSpool(directory)
+    except OSError as e:
+        print(f"Warning: Clickstream spool unavailable, events kept in memory: {e}")
+        return MemorySpool()
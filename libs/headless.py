@@ -0,0 +1,298 @@
+"""
+Headless terminal mode for Half-Life VOX TimeLEFT application.
+Runs the timer and VOX announcements with a terminal status line instead of the GUI.
+
+Nothing here imports dearpygui, so this mode starts faster and uses far
+less memory than the GUI build; it suits SSH sessions and build servers.
+"""
+
+import os
+import select
+import sys
+import time
+from typing import Optional, TextIO
+
+from libs.config import Config
+from libs.event_bus import DELIVERY_RENDER, FINISHED, PAUSED, RESET, RESUMED, TICK, TimerEvent
+from libs.timer_engine import TimerEngine
+
+KEY_HELP = "[p] pause/resume  [t] time left  [r] restart  [q] quit"
+
+
+class TerminalRenderer:
+    """
+    Single status line that is redrawn in place.
+
+    On a terminal only the characters that changed since the last draw are
+    written (the cursor jumps past the unchanged prefix). When output is
+    not a terminal (e.g. a CI log), a line is printed only for updates
+    marked as important, so the log is not flooded with ticks.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Initialize the renderer.
+
+        Args:
+            stream: Output stream (defaults to stdout)
+        """
+        self.stream = stream or sys.stdout
+        self.interactive = self.stream.isatty()
+        self.line = ""
+        self.chars_written = 0
+
+    def render(self, text: str, important: bool = True):
+        """
+        Show text as the status line.
+
+        Args:
+            text: New status line
+            important: Whether a non-interactive stream should log it
+        """
+        if text == self.line:
+            return
+        if not self.interactive:
+            if important:
+                self._write(text + "\n")
+            self.line = text
+            return
+
+        prefix = 0
+        for new, old in zip(text, self.line):
+            if new != old:
+                break
+            prefix += 1
+        output = "\r" + (f"\x1b[{prefix}C" if prefix else "") + text[prefix:]
+        if len(text) < len(self.line):
+            output += "\x1b[K"
+        self._write(output)
+        self.line = text
+
+    def message(self, text: str):
+        """
+        Print a line above the status line.
+
+        Args:
+            text: Message to print
+        """
+        if self.interactive and self.line:
+            self._write("\r\x1b[K" + text + "\n" + self.line)
+        else:
+            self._write(text + "\n")
+
+    def finish(self):
+        """End the status line so later output starts on a new line."""
+        if self.interactive and self.line:
+            self._write("\n")
+        self.line = ""
+
+    def _write(self, output: str):
+        self.stream.write(output)
+        self.stream.flush()
+        self.chars_written += len(output)
+
+
+class _KeyReader:
+    """Non-blocking single-key input from a terminal (no-op elsewhere)."""
+
+    def __init__(self):
+        self.available = False
+        self._restore = None
+
+    def __enter__(self):
+        if not sys.stdin.isatty():
+            return self
+        if os.name == "nt":
+            self.available = True
+            return self
+        try:
+            import termios
+            import tty
+            fd = sys.stdin.fileno()
+            attributes = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+        except (ImportError, OSError):
+            return self
+        self._restore = lambda: termios.tcsetattr(fd, termios.TCSADRAIN, attributes)
+        self.available = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._restore is not None:
+            self._restore()
+        return False
+
+    def read(self, timeout: float) -> Optional[str]:
+        """
+        Wait up to timeout seconds for a key press.
+
+        Returns:
+            The key, or None if none was pressed
+        """
+        if not self.available:
+            time.sleep(timeout)
+            return None
+        if os.name == "nt":
+            import msvcrt
+            if msvcrt.kbhit():
+                return msvcrt.getwch()
+            time.sleep(timeout)
+            return None
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        return sys.stdin.read(1) if ready else None
+
+
+class HeadlessApplication:
+    """Timer, VOX audio and (optionally) clickstream tracking in a terminal."""
+
+    def __init__(
+        self,
+        time_str: str = Config.DEFAULT_POMODORO_TIME,
+        tracking: bool = Config.CLICKSTREAM_ENABLED,
+        stream: Optional[TextIO] = None
+    ):
+        """
+        Initialize the components the GUI build uses, minus the UI.
+
+        Args:
+            time_str: Countdown length in HH:MM:SS format
+            tracking: Whether to record clickstream events
+            stream: Output stream for the status line (defaults to stdout)
+        """
+        self.time_str = time_str
+        self.engine = TimerEngine(tracking)
+        self.runtime = self.engine.runtime
+        self.event_bus = self.engine.event_bus
+        self.timer = self.engine.timer
+        self.audio_manager = self.engine.audio_manager
+        self.clickstream_tracker = self.engine.clickstream_tracker
+        # Cleared while the countdown plays, so exit can wait for it
+        self.countdown_done = self.engine.countdown_done
+
+        self.renderer = TerminalRenderer(stream)
+        self.finished = False
+        self.quit_requested = False
+
+        self._setup_callbacks()
+
+    def _setup_callbacks(self):
+        """Subscribe the status line, redrawn by the main loop."""
+        self.event_bus.subscribe(
+            (TICK, PAUSED, RESUMED, RESET, FINISHED),
+            self._on_timer_event,
+            delivery=DELIVERY_RENDER,
+            capacity=4,
+            name="terminal_display"
+        )
+
+    def _on_timer_event(self, event: TimerEvent):
+        """
+        Redraw the status line.
+
+        Args:
+            event: Timer event (delivered on the main thread by pump())
+        """
+        state = ""
+        if event.kind == FINISHED:
+            state = "  finished"
+            self.finished = True
+        elif event.kind == RESET:
+            state = "  reset"
+        elif self.timer.is_paused:
+            state = "  paused"
+        important = (event.kind != TICK or event.seconds % 60 == 0 or
+                     event.seconds <= Config.COUNTDOWN_THRESHOLD)
+        self.renderer.render(f"TimeLEFT {event.time_str}{state}", important)
+
+    def _on_key(self, key: str):
+        """
+        Handle a key press like the matching GUI button.
+
+        Args:
+            key: Key pressed
+        """
+        key = key.lower()
+        if key in ("p", " "):
+            self.clickstream_tracker.track_event(
+                "key_press", "pause_button", {"is_paused": not self.timer.is_paused}
+            )
+            self.audio_manager.play_sound_async(self.audio_manager.pause_sound)
+            self.timer.pause()
+        elif key == "t":
+            remaining_time = self.timer.get_formatted_time()
+            self.clickstream_tracker.track_event(
+                "key_press", "timeleft_button", {"remaining_time": remaining_time}
+            )
+            self.audio_manager.play_timeleft_async(remaining_time)
+        elif key == "r":
+            self.start(restart=True)
+        elif key == "q":
+            self.quit_requested = True
+
+    def start(self, restart: bool = False) -> bool:
+        """
+        Start (or restart) the countdown.
+
+        Args:
+            restart: Whether this is a restart requested with a key
+
+        Returns:
+            True if the time string was valid
+        """
+        self.clickstream_tracker.track_event(
+            "key_press" if restart else "cli_start", "start_button", {"time_input": self.time_str}
+        )
+        self.audio_manager.play_sound_async(self.audio_manager.start_sound)
+        self.finished = False
+        return self.timer.start(self.time_str)
+
+    def run(self) -> int:
+        """
+        Run until the countdown finishes or the user quits.
+
+        Returns:
+            Process exit code
+        """
+        self.clickstream_tracker.track_event("app_start", "application", {"mode": "headless"})
+        if not self.start():
+            print(f"Invalid time: {self.time_str} (expected HH:MM:SS)", file=sys.stderr)
+            self.shutdown()
+            return 2
+
+        try:
+            with _KeyReader() as keys:
+                if keys.available:
+                    self.renderer.message(KEY_HELP)
+                while not (self.finished or self.quit_requested):
+                    key = keys.read(Config.HEADLESS_POLL_INTERVAL)
+                    if key:
+                        self._on_key(key)
+                    self.event_bus.pump(DELIVERY_RENDER)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.renderer.finish()
+            if self.finished:
+                self.countdown_done.wait(Config.HEADLESS_AUDIO_GRACE)
+            self.shutdown()
+        return 0
+
+    def shutdown(self):
+        """Stop the components like Application.run."""
+        self.engine.shutdown()
+
+def main(time_str: Optional[str] = None, tracking: bool = True) -> int:
+    """
+    Entry point for main.py --headless.
+
+    Args:
+        time_str: Countdown length in HH:MM:SS (defaults to the Pomodoro time)
+        tracking: False to turn clickstream events off (they are always off
+            when Config.CLICKSTREAM_ENABLED is False)
+
+    Returns:
+        Process exit code
+    """
+    return HeadlessApplication(
+        time_str or Config.DEFAULT_POMODORO_TIME, tracking and Config.CLICKSTREAM_ENABLED
+    ).run()
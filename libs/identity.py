@@ -0,0 +1,95 @@
+"""
+Identity cache for Half-Life VOX TimeLEFT application.
+Keeps the hashed machine ID in the user cache dir so it is resolved once per machine.
+"""
+
+import json
+import os
+import platform
+from pathlib import Path
+from typing import Optional, Tuple
+
+from libs.cache_dir import get_cache_dir
+from libs.machine_id import get_machine_id
+from libs.version import get_version
+
+IDENTITY_FILENAME = "identity.json"
+IDENTITY_VERSION = 1
+
+
+def load_cached_machine_id(cache_path: Optional[Path] = None) -> Optional[str]:
+    """
+    Read the machine ID cached by an earlier run.
+
+    The cache is ignored if it was written on a different host (e.g. a
+    copied home directory).
+
+    Args:
+        cache_path: Cache file (defaults to identity.json in the user cache dir)
+
+    Returns:
+        Cached machine ID, or None if there is no usable cache
+    """
+    try:
+        cache_path = cache_path or get_cache_dir() / IDENTITY_FILENAME
+        with open(cache_path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (not isinstance(data, dict) or data.get("version") != IDENTITY_VERSION or
+            data.get("node") != platform.node()):
+        return None
+    machine_id = data.get("machine_id")
+    return machine_id if isinstance(machine_id, str) and machine_id else None
+
+
+def save_machine_id(machine_id: str, cache_path: Optional[Path] = None):
+    """
+    Cache the machine ID atomically.
+
+    Args:
+        machine_id: Hashed machine identifier
+        cache_path: Cache file (defaults to identity.json in the user cache dir)
+    """
+    cache_path = cache_path or get_cache_dir() / IDENTITY_FILENAME
+    data = {
+        "version": IDENTITY_VERSION,
+        "node": platform.node(),
+        "machine_id": machine_id,
+    }
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, cache_path)
+
+
+def resolve_identity(cache_path: Optional[Path] = None) -> Tuple[str, str]:
+    """
+    Get the machine ID and application version.
+
+    The machine ID comes from the cache when possible; otherwise it is
+    computed with get_machine_id() (which may run a subprocess) and cached.
+    Call this off the UI thread.
+
+    Args:
+        cache_path: Cache file (defaults to identity.json in the user cache dir)
+
+    Returns:
+        (machine_id, app_version)
+    """
+    machine_id = load_cached_machine_id(cache_path)
+    if machine_id is None:
+        machine_id = get_machine_id()
+        try:
+            save_machine_id(machine_id, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not cache machine ID: {e}")
+    return machine_id, get_version()
+
+
+if __name__ == "__main__":
+    machine_id, app_version = resolve_identity()
+    print(f"Machine ID: {machine_id}")
+    print(f"Version:    {app_version}")
+    print(f"Cache:      {get_cache_dir() / IDENTITY_FILENAME}")
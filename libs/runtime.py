@@ -0,0 +1,215 @@
+"""
+Runtime class for Half-Life VOX TimeLEFT application.
+Owns the worker threads shared by the timer, audio and clickstream subsystems.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, Optional
+
+from libs.config import Config
+
+# What submit() does when a queue is full
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST)
+
+
+class _WorkQueue:
+    """A bounded task queue and the fixed set of threads working it."""
+
+    def __init__(self, name: str, workers: int, capacity: int, overflow: str):
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.overflow = overflow
+        self.condition = threading.Condition()
+        self.tasks = deque()
+        self.closed = False
+        self.busy = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.threads = [
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, fn: Callable, args: tuple) -> Optional[Future]:
+        future = Future()
+        with self.condition:
+            if self.closed:
+                return None
+            if len(self.tasks) >= self.capacity:
+                self.dropped += 1
+                if self.overflow == OVERFLOW_DROP_NEWEST:
+                    return None
+                self.tasks.popleft()[0].cancel()
+            self.tasks.append((future, fn, args))
+            self.submitted += 1
+            self.condition.notify()
+        return future
+
+    def close(self) -> int:
+        """Stop accepting tasks and cancel the queued ones."""
+        with self.condition:
+            self.closed = True
+            cancelled = len(self.tasks)
+            for future, fn, args in self.tasks:
+                future.cancel()
+            self.tasks.clear()
+            self.condition.notify_all()
+        return cancelled
+
+    def _work(self):
+        while True:
+            with self.condition:
+                while not self.tasks and not self.closed:
+                    self.condition.wait()
+                if not self.tasks:
+                    return
+                future, fn, args = self.tasks.popleft()
+                self.busy += 1
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    self.failed += 1
+                    print(f"Error in {self.name} task: {e}")
+                    future.set_exception(e)
+
+            with self.condition:
+                self.busy -= 1
+                self.completed += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.condition:
+            return {
+                "threads": sum(1 for thread in self.threads if thread.is_alive()),
+                "busy": self.busy,
+                "queued": len(self.tasks),
+                "capacity": self.capacity,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "dropped": self.dropped,
+            }
+
+
+class Runtime:
+    """
+    Fixed worker threads behind named, bounded task queues.
+
+    Each subsystem registers its queue once with a worker count and a
+    capacity, then submits work to it by name. Threads are started when
+    a queue is added and never per task, so the thread count does not
+    grow with how fast the user clicks; a full queue drops the oldest (or
+    the newest) task instead of blocking the caller. Worker threads are
+    daemons, so a task stuck on audio or the network never delays exit.
+
+    Not every thread is a runtime thread: the EventBus starts one thread
+    per pushed delivery (event-bus-audio, event-bus-tracker) and the
+    ClickstreamTracker runs its worker and uploader threads, so a running
+    application has four threads beyond runtime_threads (five with a
+    load-job sink, which submits files on its own thread). A GUI attached
+    to a timer daemon starts neither delivery thread and runs one
+    daemon-watch thread instead (libs/daemon_attach.py).
+    """
+
+    def __init__(self):
+        """Initialize a runtime without queues."""
+        self.lock = threading.Lock()
+        self._queues: Dict[str, _WorkQueue] = {}
+
+    def add_queue(
+        self,
+        name: str,
+        workers: int = 1,
+        capacity: int = 16,
+        overflow: str = OVERFLOW_DROP_OLDEST
+    ):
+        """
+        Register a queue and start its workers (no-op if it exists).
+
+        Args:
+            name: Queue name (also the worker thread name prefix)
+            workers: Worker threads serving the queue
+            capacity: Maximum number of tasks waiting to run
+            overflow: One of OVERFLOW_POLICIES, applied when the queue is full
+
+        Raises:
+            ValueError: If overflow is unknown
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        with self.lock:
+            if name not in self._queues:
+                self._queues[name] = _WorkQueue(name, workers, capacity, overflow)
+
+    def submit(self, queue: str, fn: Callable, *args) -> Optional[Future]:
+        """
+        Queue a task without blocking.
+
+        Args:
+            queue: Name of a registered queue
+            fn: Function to run on a worker thread
+            *args: Arguments for fn
+
+        Returns:
+            Future for the result, or None if the task was dropped because
+            the queue is full (drop_newest) or shut down
+
+        Raises:
+            KeyError: If the queue was never registered
+        """
+        return self._queues[queue].submit(fn, args)
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get live thread and queue counts.
+
+        Returns:
+            Dictionary with per-queue counts (threads, busy, queued,
+            capacity, submitted, completed, failed, dropped), the number of
+            runtime threads and the number of live threads in the process
+        """
+        with self.lock:
+            queues = {name: queue.get_stats() for name, queue in self._queues.items()}
+        return {
+            "queues": queues,
+            "runtime_threads": sum(queue["threads"] for queue in queues.values()),
+            "process_threads": threading.active_count(),
+        }
+
+    def shutdown(self, timeout: float = Config.RUNTIME_SHUTDOWN_TIMEOUT,
+                 order: Optional[List[str]] = None, abandon: Iterable[str] = ()):
+        """
+        Stop the queues in order.
+
+        Queued tasks are cancelled; running tasks get until the deadline to
+        finish, after which their daemon threads are left behind.
+
+        Args:
+            timeout: Seconds to wait for all running tasks in total
+            order: Queue names to stop first (the rest follow in the order
+                they were added)
+            abandon: Queues closed without waiting for their running tasks
+                (e.g. inserts the tracker has already given up on)
+        """
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            names = [name for name in (order or []) if name in self._queues]
+            names += [name for name in self._queues if name not in names]
+            queues = [self._queues[name] for name in names]
+
+        for queue in queues:
+            queue.close()
+            if queue.name in abandon:
+                continue
+            for thread in queue.threads:
+                thread.join(timeout=max(0.0, deadline - time.monotonic()))
@@ -0,0 +1,366 @@
+"""
+SkyboxPanorama class for Half-Life VOX TimeLEFT application.
+Renders a slowly panning view of a full six-face skybox into a texture.
+"""
+
+import math
+import re
+import time
+from typing import Dict, Optional
+
+import dearpygui.dearpygui as dpg
+import numpy as np
+
+from libs.asset_manager import AssetManager
+from libs.config import Config
+
+
+class SkyboxPanorama:
+    """
+    Pans a perspective camera around a Half-Life skybox.
+
+    The six faces are projected once into an azimuth/elevation map. Because
+    the camera only rotates around the vertical axis, every view angle is
+    then a per-column shift into that map, so the lookup table for each
+    angle is a single row of column indices and a frame is one gather.
+    """
+
+    # Side faces in the order they appear when turning right
+    FACE_SUFFIXES = ("ft", "lf", "bk", "rt", "up", "dn")
+    SIDE_SUFFIXES = ("ft", "lf", "bk", "rt")
+    # Half-Life ships most faces twice: a true-colour .tga and an 8-bit
+    # paletted .bmp of the same size. Earlier formats win at equal size.
+    FORMAT_PREFERENCE = ("tga", "png", "bmp", "pcx")
+    FACE_PATTERN = re.compile(r"^(?P<name>.+?)(?P<face>bk|ft|lf|rt|up|dn)\.[^.]+$",
+                              re.IGNORECASE)
+
+    def __init__(
+        self,
+        asset_manager: AssetManager,
+        width: int,
+        height: int,
+        aspect: float = Config.IMAGE_WIDTH / Config.IMAGE_HEIGHT,
+        fov: float = Config.PANORAMA_FOV,
+        speed: float = Config.PANORAMA_SPEED,
+        frame_budget_ms: float = Config.PANORAMA_FRAME_BUDGET_MS,
+        azimuth_steps: int = Config.PANORAMA_AZIMUTH_STEPS
+    ):
+        """
+        Initialize the panorama renderer.
+
+        Args:
+            asset_manager: AssetManager instance for background lookups
+            width: Output texture width in pixels
+            height: Output texture height in pixels
+            aspect: Display aspect ratio the texture is stretched to
+            fov: Horizontal field of view in degrees
+            speed: Pan speed in degrees per second
+            frame_budget_ms: Target upper bound for rendering one frame
+            azimuth_steps: Number of precomputed view angles per revolution
+        """
+        self.asset_manager = asset_manager
+        self.width = width
+        self.height = height
+        self.speed = speed
+        self.frame_budget_ms = frame_budget_ms
+        self.azimuth_steps = azimuth_steps
+        self.name = None
+
+        self.last_frame_ms = 0.0
+        self._frame_stride = 1
+        self._frames_skipped = 0
+        self._last_shift = None
+        self._start_time = None
+        self._panorama = None
+
+        self._build_view_tables(aspect, fov)
+
+        # Output buffers reused for every frame
+        self._index = np.empty((height, width), dtype=np.int32)
+        self._frame_rgba = np.empty(height * width, dtype=np.uint32)
+        self._frame = np.empty(height * width * 4, dtype=np.float32)
+
+    @classmethod
+    def skybox_name(cls, filename: str) -> Optional[str]:
+        """
+        Get the skybox set name for a face filename.
+
+        Args:
+            filename: Background filename (e.g. "alien1bk.bmp")
+
+        Returns:
+            Skybox name (e.g. "alien1") or None if not a skybox face
+        """
+        match = cls.FACE_PATTERN.match(filename)
+        return match.group("name") if match else None
+
+    def find_faces(self, name: str) -> Dict[str, str]:
+        """
+        Find the face image paths that make up a skybox.
+
+        When a face exists in several files, the largest image (by the
+        manifest's dimensions) is used, then the preferred format.
+
+        Args:
+            name: Skybox set name
+
+        Returns:
+            Dictionary of face suffix to full image path
+        """
+        faces = {}
+        ranks = {}
+        for filename in self.asset_manager.get_background_names():
+            match = self.FACE_PATTERN.match(filename)
+            if not match or match.group("name") != name:
+                continue
+            face = match.group("face").lower()
+            path = self.asset_manager.get_background_texture_path(filename)
+            rank = self._face_rank(path)
+            if face not in faces or rank > ranks[face]:
+                faces[face] = path
+                ranks[face] = rank
+        return faces
+
+    def _face_rank(self, path: str) -> tuple:
+        """Rank a face image: larger first, then by FORMAT_PREFERENCE."""
+        size = self.asset_manager.get_image_size(path)
+        pixels = size[0] * size[1] if size else 0
+        extension = path.rsplit(".", 1)[-1].lower()
+        if extension in self.FORMAT_PREFERENCE:
+            preference = -self.FORMAT_PREFERENCE.index(extension)
+        else:
+            preference = -len(self.FORMAT_PREFERENCE)
+        return pixels, preference
+
+    def is_complete(self, name: Optional[str]) -> bool:
+        """
+        Check whether a skybox has all four side faces.
+
+        Args:
+            name: Skybox set name
+
+        Returns:
+            True if the skybox can be rendered as a panorama
+        """
+        if not name:
+            return False
+        faces = self.find_faces(name)
+        return all(face in faces for face in self.SIDE_SUFFIXES)
+
+    def load(self, name: str) -> bool:
+        """
+        Load a skybox and project it into the panorama map.
+
+        Args:
+            name: Skybox set name
+
+        Returns:
+            True if loaded successfully, False otherwise
+        """
+        if name == self.name and self._panorama is not None:
+            return True
+
+        panorama = self.prepare(name)
+        if panorama is None:
+            return False
+        self.show(name, panorama)
+        return True
+
+    def prepare(self, name: str) -> Optional[np.ndarray]:
+        """
+        Load a skybox and project it into a panorama map.
+
+        Nothing that render() uses is changed, so this can run on another
+        thread while the current panorama is still being rendered.
+
+        Args:
+            name: Skybox set name
+
+        Returns:
+            Panorama map for show(), or None if the skybox cannot be loaded
+        """
+        faces = self._load_faces(name)
+        if faces is None:
+            return None
+        return self._project_cubemap(faces)
+
+    def show(self, name: str, panorama: np.ndarray):
+        """
+        Render a panorama map from prepare() from now on.
+
+        Call on the thread that calls render().
+
+        Args:
+            name: Skybox set name
+            panorama: Result of prepare(name)
+        """
+        self._panorama = panorama
+        self.name = name
+        self._start_time = None
+        self._last_shift = None
+
+    def render(
+        self,
+        now: Optional[float] = None,
+        force: bool = False
+    ) -> Optional[np.ndarray]:
+        """
+        Render the view for the current pan angle.
+
+        Frames are skipped when the view has not moved, and the renderer
+        backs off to every other (fourth, ...) frame if a frame exceeds
+        the budget.
+
+        Args:
+            now: Current time in seconds (defaults to time.perf_counter())
+            force: Render even if the view has not moved
+
+        Returns:
+            Flat RGBA float32 texture data, or None if nothing changed
+        """
+        if self._panorama is None:
+            return None
+
+        if now is None:
+            now = time.perf_counter()
+        if self._start_time is None:
+            self._start_time = now
+
+        if not force and self._frames_skipped + 1 < self._frame_stride:
+            self._frames_skipped += 1
+            return None
+        self._frames_skipped = 0
+
+        angle = (now - self._start_time) * self.speed
+        shift = int(angle / 360.0 * self.azimuth_steps) % self.azimuth_steps
+        if shift == self._last_shift and not force:
+            return None
+
+        started = time.perf_counter()
+        np.add(self._row_offsets, self._column_luts[shift], out=self._index)
+        np.take(self._panorama, self._index.ravel(), out=self._frame_rgba)
+        np.multiply(self._frame_rgba.view(np.uint8), 1.0 / 255.0, out=self._frame)
+        self.last_frame_ms = (time.perf_counter() - started) * 1000.0
+
+        self._last_shift = shift
+        self._adjust_frame_stride()
+        return self._frame
+
+    def _adjust_frame_stride(self):
+        """Back off or recover the render rate based on the frame budget."""
+        if self.last_frame_ms > self.frame_budget_ms:
+            self._frame_stride = min(self._frame_stride * 2, 8)
+        elif self.last_frame_ms < self.frame_budget_ms / 2 and self._frame_stride > 1:
+            self._frame_stride //= 2
+
+    def _build_view_tables(self, aspect: float, fov: float):
+        """
+        Precompute the camera rays and per-angle column lookup tables.
+
+        Args:
+            aspect: Display aspect ratio
+            fov: Horizontal field of view in degrees
+        """
+        half_width = math.tan(math.radians(fov) / 2)
+        half_height = half_width / aspect
+
+        x = half_width * ((np.arange(self.width) + 0.5) / self.width * 2 - 1)
+        y = half_height * (1 - (np.arange(self.height) + 0.5) / self.height * 2)
+
+        # Each ray is described by its azimuth offset and elevation tangent
+        azimuth = np.arctan(x)
+        elevation = y[:, None] / np.sqrt(1 + x[None, :] ** 2)
+
+        # Panorama map rows cover the elevation range at double resolution
+        self._map_rows = self.height * 2
+        self._max_elevation = half_height
+        rows = np.rint(
+            (elevation + half_height) / (2 * half_height) * (self._map_rows - 1)
+        ).astype(np.int32)
+        self._row_offsets = rows * self.azimuth_steps
+
+        columns = np.rint(azimuth / (2 * math.pi) * self.azimuth_steps).astype(np.int32)
+        shifts = np.arange(self.azimuth_steps, dtype=np.int32)
+        self._column_luts = (shifts[:, None] + columns[None, :]) % self.azimuth_steps
+
+    def _load_faces(self, name: str) -> Optional[np.ndarray]:
+        """
+        Load skybox faces into a stacked RGBA uint8 array.
+
+        Missing up/down faces are filled with the average colour of the
+        adjacent edge of the side faces.
+
+        Args:
+            name: Skybox set name
+
+        Returns:
+            Array of shape (6, size, size, 4), or None if sides are missing
+        """
+        paths = self.find_faces(name)
+        loaded = {}
+        for face, path in paths.items():
+            image = dpg.load_image(path)
+            if image is None:
+                print(f"Could not load skybox face: {path}")
+                continue
+            width, height, channels, data = image
+            pixels = np.asarray(data, dtype=np.float32).reshape(height, width, 4)
+            loaded[face] = np.rint(pixels * 255).astype(np.uint8)
+
+        if not all(face in loaded for face in self.SIDE_SUFFIXES):
+            return None
+
+        size = loaded["ft"].shape[0]
+        sides = [self._resample(loaded[face], size) for face in self.SIDE_SUFFIXES]
+        stack = sides[:]
+        for face, edge in (("up", 0), ("dn", -1)):
+            if face in loaded:
+                stack.append(self._resample(loaded[face], size))
+            else:
+                colour = np.mean([side[edge] for side in sides], axis=(0, 1))
+                stack.append(np.broadcast_to(colour.astype(np.uint8), (size, size, 4)))
+        return np.stack(stack)
+
+    @staticmethod
+    def _resample(image: np.ndarray, size: int) -> np.ndarray:
+        """Nearest-neighbour resample an image to a square of the given size."""
+        if image.shape[0] == size and image.shape[1] == size:
+            return image
+        rows = np.arange(size) * image.shape[0] // size
+        cols = np.arange(size) * image.shape[1] // size
+        return image[rows[:, None], cols[None, :]]
+
+    def _project_cubemap(self, faces: np.ndarray) -> np.ndarray:
+        """
+        Project cubemap faces into the azimuth/elevation panorama map.
+
+        Args:
+            faces: Stacked faces in FACE_SUFFIXES order
+
+        Returns:
+            Flat uint32 array of packed RGBA pixels, rows by azimuth
+        """
+        size = faces.shape[1]
+        alpha = np.arange(self.azimuth_steps) / self.azimuth_steps * 2 * math.pi
+        elevation = np.linspace(-self._max_elevation, self._max_elevation, self._map_rows)
+
+        # Ray directions: x right, y up, z forward (towards "ft")
+        x = np.broadcast_to(np.sin(alpha)[None, :], (self._map_rows, self.azimuth_steps))
+        z = np.broadcast_to(np.cos(alpha)[None, :], (self._map_rows, self.azimuth_steps))
+        y = np.broadcast_to(elevation[:, None], (self._map_rows, self.azimuth_steps))
+        ax, ay, az = np.abs(x), np.abs(y), np.abs(z)
+
+        face = np.where(az >= ax, np.where(z > 0, 0, 2), np.where(x > 0, 1, 3))
+        major = np.maximum(ax, az)
+        u = np.select([face == 0, face == 1, face == 2], [x, -z, -x], z) / major
+        v = -y / major
+
+        vertical = ay > major
+        face = np.where(vertical, np.where(y > 0, 4, 5), face)
+        u = np.where(vertical, z / np.maximum(ay, 1e-9), u)
+        v = np.where(vertical, np.where(y > 0, -x, x) / np.maximum(ay, 1e-9), v)
+
+        col = np.clip(((u + 1) / 2 * size).astype(np.int32), 0, size - 1)
+        row = np.clip(((v + 1) / 2 * size).astype(np.int32), 0, size - 1)
+        texels = np.ascontiguousarray(faces).view(np.uint32).reshape(-1)
+        return np.ascontiguousarray(texels[(face * size + row) * size + col].ravel())
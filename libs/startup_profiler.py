@@ -0,0 +1,165 @@
+"""
+Startup profiling for Half-Life VOX TimeLEFT application.
+Reports per-module import time and per-phase Application init time.
+
+Usage:
+    python main.py --profile-startup
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from libs.config import Config
+
+RESULT_MARKER = "STARTUP_PROFILE "
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+class StartupProfiler:
+    """Records how long each named startup phase takes."""
+
+    def __init__(self):
+        """Initialize an empty profile."""
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a block of startup work.
+
+        Args:
+            name: Phase name shown in the report
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - started) * 1000))
+
+    @property
+    def total_ms(self) -> float:
+        """Get the total time of all recorded phases in milliseconds."""
+        return sum(ms for name, ms in self.phases)
+
+
+def parse_import_times(stderr: str) -> List[dict]:
+    """
+    Parse the output of python -X importtime.
+
+    Args:
+        stderr: Captured standard error of the profiled process
+
+    Returns:
+        List of dicts with module, self_ms, cumulative_ms and depth
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            modules.append({
+                "module": match.group(4),
+                "self_ms": int(match.group(1)) / 1000,
+                "cumulative_ms": int(match.group(2)) / 1000,
+                "depth": len(match.group(3)) // 2,
+            })
+    return modules
+
+
+def summarize_packages(modules: List[dict]) -> List[Tuple[str, float]]:
+    """
+    Add up import self time per top-level package.
+
+    Args:
+        modules: Result of parse_import_times()
+
+    Returns:
+        (package, milliseconds) pairs, slowest first
+    """
+    totals: Dict[str, float] = {}
+    for module in modules:
+        package = module["module"].split(".", 1)[0]
+        totals[package] = totals.get(package, 0.0) + module["self_ms"]
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def _measure_in_process():
+    """Import and construct the Application, then print the measurements."""
+    started = time.perf_counter()
+    from libs.application import Application
+    import_ms = (time.perf_counter() - started) * 1000
+
+    profiler = StartupProfiler()
+    Application(profiler=profiler)
+
+    print(RESULT_MARKER + json.dumps({
+        "import_ms": import_ms,
+        "phases": profiler.phases,
+    }), flush=True)
+
+
+def profile_startup(budget_ms: float = Config.STARTUP_BUDGET_MS, top: int = 15) -> int:
+    """
+    Profile application startup in a fresh interpreter and print a report.
+
+    Args:
+        budget_ms: Startup budget for imports plus Application init
+        top: Number of packages and modules to list
+
+    Returns:
+        Process exit code: 0 within budget, 1 over budget or on failure
+    """
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "from libs.startup_profiler import _measure_in_process; _measure_in_process()"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        env=env
+    )
+
+    measured = _find_result(result.stdout)
+    if measured is None:
+        print("Startup profile failed:")
+        print(result.stdout + result.stderr)
+        return 1
+
+    modules = parse_import_times(result.stderr)
+    print("Import time by package (ms, summed over its modules):")
+    for package, ms in summarize_packages(modules)[:top]:
+        print(f"  {ms:9.1f}  {package}")
+
+    # Self time at every depth, so the libraries imported under
+    # libs.application (pygame, numpy, dearpygui, ...) show up by name
+    slowest = sorted(modules, key=lambda m: m["self_ms"], reverse=True)[:top]
+    print("\nSlowest modules (self ms, cumulative ms):")
+    for module in slowest:
+        print(f"  {module['self_ms']:9.1f} {module['cumulative_ms']:9.1f}  {module['module']}")
+
+    print("\nApplication.__init__ phases (ms):")
+    for name, ms in measured["phases"]:
+        print(f"  {ms:9.1f}  {name}")
+
+    init_ms = sum(ms for name, ms in measured["phases"])
+    total_ms = measured["import_ms"] + init_ms
+    print(f"\nImport libs.application: {measured['import_ms']:.1f} ms")
+    print(f"Application.__init__:    {init_ms:.1f} ms")
+    print(f"Total:                   {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+
+    if total_ms > budget_ms:
+        print("Startup is over budget")
+        return 1
+    return 0
+
+
+def _find_result(stdout: str) -> Optional[dict]:
+    for line in stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    return None
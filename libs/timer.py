@@ -5,20 +5,42 @@ Encapsulates timer logic and state management.
 
 import time
 import threading
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
+
+from libs.event_bus import (
+    FINISHED, MILESTONE, PAUSED, RESET, RESUMED, STARTED, TICK, EventBus, TimerEvent
+)
+from libs import tracing
+from libs.runtime import OVERFLOW_DROP_OLDEST, Runtime
+
+TIMER_QUEUE = "timer"
 
 
 class Timer:
     """Manages countdown timer state and operations."""
 
-    def __init__(self, countdown_threshold: int = 5):
+    def __init__(
+        self,
+        countdown_threshold: int = 5,
+        event_bus: Optional[EventBus] = None,
+        milestones: Optional[Iterable[int]] = None,
+        runtime: Optional[Runtime] = None
+    ):
         """
         Initialize the timer.
 
         Args:
             countdown_threshold: Seconds before playing countdown audio
+            event_bus: Bus receiving timer events (optional)
+            milestones: Seconds left at which a milestone event is published
+                (defaults to the countdown threshold)
+            runtime: Runtime whose "timer" queue runs the countdown (a
+                private one is created if omitted)
         """
         self.countdown_threshold = countdown_threshold
+        self.event_bus = event_bus
+        self.milestones = frozenset(milestones if milestones is not None
+                                    else (countdown_threshold,))
         self._total_seconds = 0
         self._is_running = False
         self._is_paused = False
@@ -26,7 +48,12 @@ class Timer:
         self._countdown_sound_played = False
         self._update_callback = None
         self._countdown_callback = None
-        self._timer_thread = None
+
+        # One worker runs the countdown; start() supersedes a running one
+        self.runtime = runtime or Runtime()
+        self.runtime.add_queue(TIMER_QUEUE, workers=1, capacity=1, overflow=OVERFLOW_DROP_OLDEST)
+        self._generation = 0
+        self._wake = threading.Event()
 
     @property
     def is_running(self) -> bool:
@@ -83,27 +110,33 @@ class Timer:
         self._is_paused = False
         self._reset_requested = False
 
-        # Start timer in a new thread
-        self._timer_thread = threading.Thread(
-            target=self._run_timer,
-            args=(total_seconds,),
-            daemon=True
-        )
-        self._timer_thread.start()
+        # Stop a countdown in progress; the new one runs once it has returned
+        self._generation += 1
+        self._wake.set()
+        # Report the new countdown right away, before its worker picks it up
+        self._total_seconds = total_seconds
+        self._is_running = True
+        self.runtime.submit(TIMER_QUEUE, self._run_timer, total_seconds, self._generation)
         return True
 
     def pause(self):
         """Toggle pause state."""
         self._is_paused = not self._is_paused
+        if self._is_running:
+            self._publish(PAUSED if self._is_paused else RESUMED)
 
     def resume(self):
         """Resume the timer if paused."""
+        was_paused = self._is_paused
         self._is_paused = False
+        if was_paused and self._is_running:
+            self._publish(RESUMED)
 
     def reset(self):
         """Request timer reset."""
         self._reset_requested = True
         self._total_seconds = 0
+        self._wake.set()
 
     def get_formatted_time(self, seconds: Optional[int] = None) -> str:
         """
@@ -123,44 +156,82 @@ class Timer:
         s = seconds % 60
         return f"{h:02}:{m:02}:{s:02}"
 
-    def _run_timer(self, total_seconds: int):
+    def _run_timer(self, total_seconds: int, generation: int):
         """
         Internal method to run the timer loop.
 
         Args:
             total_seconds: Starting time in seconds
+            generation: start() call this run belongs to; the run stops
+                quietly once a later start() supersedes it
         """
+        if generation != self._generation:
+            return
+        self._wake.clear()
         self._total_seconds = total_seconds
         self._is_running = True
         self._countdown_sound_played = False
+        self._publish(STARTED)
 
-        while self._total_seconds >= 0 and self._is_running:
+        while self._total_seconds >= 0 and self._is_running and generation == self._generation:
             # Check for reset
             if self._reset_requested:
                 self._reset_requested = False
+                self._publish(RESET)
                 break
 
             # Check for pause
             if self._is_paused:
-                time.sleep(0.1)
+                self._wake.wait(0.1)
+                self._wake.clear()
                 continue
 
-            # Update display
-            formatted = self.get_formatted_time()
-            if self._update_callback:
-                self._update_callback(formatted)
-
-            # Trigger countdown audio at threshold
-            if (self._total_seconds == self.countdown_threshold and
-                    not self._countdown_sound_played):
-                self._countdown_sound_played = True
-                if self._countdown_callback:
-                    self._countdown_callback()
+            with tracing.span("timer.tick", "timer", seconds=self._total_seconds):
+                # Update display
+                formatted = self.get_formatted_time()
+                if self._update_callback:
+                    self._update_callback(formatted)
+                self._publish(TICK)
+                if self._total_seconds in self.milestones:
+                    self._publish(MILESTONE)
+
+                # Trigger countdown audio at threshold
+                if (self._total_seconds == self.countdown_threshold and
+                        not self._countdown_sound_played):
+                    self._countdown_sound_played = True
+                    if self._countdown_callback:
+                        self._countdown_callback()
+
+            # Sleep a second, waking early for reset() or a new start()
+            self._wake.wait(1)
+            self._wake.clear()
+            if generation == self._generation:
+                self._total_seconds -= 1
+
+        if generation != self._generation:
+            # Superseded by start(); the next run takes over
+            return
+        if self._reset_requested:
+            # Reset while sleeping ended the loop
+            self._reset_requested = False
+            self._total_seconds = 0
+            self._publish(RESET)
+        elif self._total_seconds < 0:
+            self._total_seconds = 0
+            self._publish(FINISHED)
+        self._is_running = False
 
-            time.sleep(1)
-            self._total_seconds -= 1
+    def _publish(self, kind: str):
+        """
+        Publish a timer event if a bus is attached.
 
-        self._is_running = False
+        Args:
+            kind: Event kind (see libs.event_bus.EVENT_KINDS)
+        """
+        if self.event_bus is not None:
+            self.event_bus.publish(TimerEvent(
+                kind, self._total_seconds, self.get_formatted_time(), time.monotonic()
+            ))
 
     def parse_time_string(self, time_str: str) -> Optional[int]:
         """
@@ -0,0 +1,154 @@
+"""
+TimerEngine class for Half-Life VOX TimeLEFT application.
+Builds the timer, audio and tracking components every front end shares.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from libs.asset_manager import AssetManager
+from libs.audio_manager import AUDIO_QUEUE, VOICE_QUEUE, AudioManager
+from libs.clickstream_tracker import INSERT_QUEUE, ClickstreamTracker
+from libs.config import Config
+from libs.event_bus import DELIVERY_AUDIO, DELIVERY_TRACKER, FINISHED, MILESTONE, EventBus, TimerEvent
+from libs.runtime import Runtime
+from libs.startup_profiler import StartupProfiler
+from libs.timer import TIMER_QUEUE, Timer
+
+
+class TimerEngine:
+    """
+    Runtime, event bus, timer, audio and clickstream tracker, wired together.
+
+    Application (GUI), HeadlessApplication and TimerDaemon each build one
+    and add their own display on top. With attach=True and a timer daemon
+    listening, the timer and its sounds are the daemon's (see
+    libs/daemon_attach.py): the daemon plays the countdown and records
+    finished timers, so this engine does not.
+    """
+
+    def __init__(
+        self,
+        tracking: bool = Config.CLICKSTREAM_ENABLED,
+        attach: bool = False,
+        profiler: Optional[StartupProfiler] = None
+    ):
+        """
+        Build and wire the components.
+
+        Args:
+            tracking: Whether to record clickstream events
+            attach: Use a running timer daemon's timer if one is listening
+            profiler: StartupProfiler recording init phases (optional)
+        """
+        profiler = profiler or StartupProfiler()
+        daemon = self._connect_daemon() if attach else None
+
+        # Worker threads shared by the components below
+        self.runtime = Runtime()
+
+        with profiler.phase("asset_manager"):
+            self.asset_manager = AssetManager()
+        with profiler.phase("timer"):
+            self.event_bus = EventBus()
+            if daemon is not None:
+                from libs.daemon_attach import RemoteTimer
+                self.timer = RemoteTimer(daemon, self.event_bus)
+            else:
+                self.timer = Timer(
+                    countdown_threshold=Config.COUNTDOWN_THRESHOLD,
+                    event_bus=self.event_bus,
+                    runtime=self.runtime
+                )
+        with profiler.phase("audio_manager"):
+            if daemon is not None:
+                from libs.daemon_attach import RemoteAudioManager
+                self.audio_manager = RemoteAudioManager(self.asset_manager, self.runtime, self.timer)
+            else:
+                self.audio_manager = AudioManager(self.asset_manager, self.runtime)
+        with profiler.phase("clickstream_tracker"):
+            self.clickstream_tracker = ClickstreamTracker(
+                project_id=Config.CLICKSTREAM_PROJECT_ID,
+                dataset_id=Config.CLICKSTREAM_DATASET_ID,
+                table_id=Config.CLICKSTREAM_TABLE_ID,
+                batch_size=Config.CLICKSTREAM_BATCH_SIZE,
+                max_in_flight=Config.CLICKSTREAM_MAX_IN_FLIGHT,
+                queue_capacity=Config.CLICKSTREAM_QUEUE_CAPACITY,
+                overflow_policy=Config.CLICKSTREAM_OVERFLOW_POLICY,
+                enabled=tracking,
+                runtime=self.runtime
+            )
+
+        self.attached = daemon is not None
+        # Cleared while the countdown plays, so a front end can wait for it
+        self.countdown_done = threading.Event()
+        self.countdown_done.set()
+
+        if not self.attached:
+            self._setup_callbacks()
+
+    @staticmethod
+    def _connect_daemon():
+        """Connect to a listening timer daemon, or return None."""
+        from libs.daemon_client import DaemonClient
+
+        try:
+            return DaemonClient()
+        except OSError:
+            return None
+
+    def _setup_callbacks(self):
+        """Subscribe the countdown audio and finished-timer tracking."""
+        # Countdown audio, played on the audio delivery thread
+        self.event_bus.subscribe(
+            (MILESTONE,), self._on_milestone, delivery=DELIVERY_AUDIO, name="countdown_audio"
+        )
+
+        # Completed timers, which no button click records
+        self.event_bus.subscribe(
+            (FINISHED,),
+            lambda event: self.clickstream_tracker.track_event("timer_finished", "timer"),
+            delivery=DELIVERY_TRACKER,
+            name="clickstream"
+        )
+
+    def _on_milestone(self, event: TimerEvent):
+        """
+        Play the countdown when the timer reaches the countdown threshold.
+
+        Args:
+            event: Milestone event
+        """
+        if event.seconds == Config.COUNTDOWN_THRESHOLD:
+            self.countdown_done.clear()
+            try:
+                self.audio_manager.play_countdown()
+            finally:
+                self.countdown_done.set()
+
+    def shutdown(self, timeout: float = Config.SHUTDOWN_TIMEOUT):
+        """
+        Stop the components within one deadline, producers first.
+
+        An attached daemon's timer keeps running; only the connection closes.
+
+        Args:
+            timeout: Seconds all steps may take together
+        """
+        deadline = time.monotonic() + timeout
+
+        def remaining() -> float:
+            return max(0.0, deadline - time.monotonic())
+
+        if self.attached:
+            self.timer.close()
+        else:
+            self.timer.reset()
+        self.audio_manager.shutdown()
+        self.event_bus.shutdown(timeout=remaining())
+        self.clickstream_tracker.shutdown(timeout=remaining())
+        # The tracker has already given up on inserts still running
+        self.runtime.shutdown(timeout=remaining(),
+                              order=[TIMER_QUEUE, VOICE_QUEUE, AUDIO_QUEUE, INSERT_QUEUE],
+                              abandon=[INSERT_QUEUE])
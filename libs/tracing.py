@@ -0,0 +1,253 @@
+"""
+Span tracing for Half-Life VOX TimeLEFT application.
+Records what each thread was doing, and for how long, as a Chrome trace.
+
+Tracing is off by default. While it is off, span() returns a shared no-op
+context manager and traced() functions call straight through, so the
+hooks can stay in the UI callbacks, audio paths, timer loop and tracker.
+
+Enable it with `python main.py --trace trace.json` (or tracing.enable())
+and open the file in https://ui.perfetto.dev or chrome://tracing.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from libs.config import Config
+
+
+class _NullSpan:
+    """Context manager used while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Times a block and records it as a complete ("X") trace event."""
+
+    __slots__ = ("tracer", "name", "category", "args", "started", "cpu_started")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.cpu_started = time.thread_time_ns()
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ended = time.perf_counter_ns()
+        # Wall time well above CPU time means the thread was waiting
+        # (I/O, a lock or the GIL) inside the span
+        self.args["cpu_us"] = (time.thread_time_ns() - self.cpu_started) // 1000
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record("X", self.name, self.category, self.started, ended - self.started,
+                           self.args)
+        return False
+
+
+class Tracer:
+    """
+    Bounded in-memory buffer of trace events.
+
+    Events are appended to a ring buffer from any thread without locking;
+    once it is full the oldest events are overwritten, so a long session
+    keeps its most recent Config.TRACE_CAPACITY events.
+    """
+
+    def __init__(self, capacity: int = Config.TRACE_CAPACITY):
+        """
+        Initialize an empty tracer.
+
+        Args:
+            capacity: Maximum number of events kept
+        """
+        self.events = deque(maxlen=max(1, capacity))
+        self.thread_names = {}
+        self.pid = os.getpid()
+
+    def record(self, phase: str, name: str, category: str, started_ns: int,
+               duration_ns: int = 0, args: Optional[dict] = None):
+        """
+        Add an event.
+
+        Args:
+            phase: Chrome trace phase ("X" complete, "i" instant)
+            name: Event name
+            category: Event category (the subsystem)
+            started_ns: time.perf_counter_ns() at the start
+            duration_ns: Duration for complete events
+            args: Extra values shown with the event
+        """
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        self.events.append((phase, name, category, started_ns, duration_ns, tid, args))
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Convert the buffered events to the Chrome trace event format.
+
+        Returns:
+            Dictionary with a "traceEvents" list (timestamps in microseconds)
+        """
+        trace_events = [
+            {"ph": "M", "name": "process_name", "pid": self.pid, "tid": 0,
+             "args": {"name": "hl-vox-timeleft"}}
+        ]
+        trace_events += [
+            {"ph": "M", "name": "thread_name", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self.thread_names.items())
+        ]
+        for phase, name, category, started_ns, duration_ns, tid, args in list(self.events):
+            event = {
+                "ph": phase,
+                "name": name,
+                "cat": category,
+                "ts": started_ns / 1000,
+                "pid": self.pid,
+                "tid": tid,
+            }
+            if phase == "X":
+                event["dur"] = duration_ns / 1000
+            else:
+                event["s"] = "t"
+            if args:
+                event["args"] = args
+            trace_events.append(event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str):
+        """
+        Write the trace as JSON.
+
+        Args:
+            path: Output file
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable(path: Optional[str] = None, capacity: int = Config.TRACE_CAPACITY) -> Tracer:
+    """
+    Start recording spans.
+
+    Args:
+        path: File the trace is written to at exit (optional)
+        capacity: Maximum number of events kept
+
+    Returns:
+        The active Tracer
+    """
+    global _tracer
+    _tracer = Tracer(capacity)
+    if path:
+        atexit.register(_write_at_exit, _tracer, path)
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """
+    Stop recording spans.
+
+    Returns:
+        The Tracer that was active (its events are kept), or None
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def is_enabled() -> bool:
+    """Check whether spans are being recorded."""
+    return _tracer is not None
+
+
+def _write_at_exit(tracer: Tracer, path: str):
+    try:
+        tracer.write(path)
+        print(f"Trace with {len(tracer.events)} events written to {path}")
+    except OSError as e:
+        print(f"Warning: Could not write trace {path}: {e}")
+
+
+def span(name: str, category: str = "app", **args):
+    """
+    Time a block of code.
+
+        with tracing.span("decode", "ui", file=path):
+            ...
+
+    Args:
+        name: Span name
+        category: Subsystem
+        **args: Extra values shown with the span
+
+    Returns:
+        Context manager (a shared no-op while tracing is off)
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def instant(name: str, category: str = "app", **args):
+    """
+    Record a point in time (e.g. a dropped task).
+
+    Args:
+        name: Event name
+        category: Subsystem
+        **args: Extra values shown with the event
+    """
+    tracer = _tracer
+    if tracer is not None:
+        tracer.record("i", name, category, time.perf_counter_ns(), 0, args)
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable:
+    """
+    Decorator recording every call of a function as a span.
+
+    Args:
+        name: Span name (defaults to the function's qualified name)
+        category: Subsystem
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with _Span(tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
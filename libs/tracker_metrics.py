@@ -0,0 +1,209 @@
+"""
+Self-metrics for the Half-Life VOX TimeLEFT clickstream tracker.
+Histograms and counters describing how the tracking pipeline keeps up.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+# Bucket upper bounds: 1-2-5 steps from 0.1 to 1,000,000
+DEFAULT_BOUNDS = [m * 10 ** e for e in range(-1, 7) for m in (1, 2, 5)]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with count, sum and max.
+
+    Percentiles are estimated as the upper bound of the bucket holding
+    them (capped at the largest value seen).
+    """
+
+    def __init__(self, bounds: Optional[List[float]] = None):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            bounds: Ascending bucket upper bounds (values above the last
+                one go into an overflow bucket)
+        """
+        self.bounds = list(bounds or DEFAULT_BOUNDS)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        """
+        Record one value.
+
+        Args:
+            value: Observed value
+        """
+        index = bisect_left(self.bounds, value)
+        with self.lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Estimated value, or 0.0 if nothing was recorded
+        """
+        with self.lock:
+            if not self.count:
+                return 0.0
+            rank = q / 100 * self.count
+            seen = 0
+            for index, bucket in enumerate(self.buckets):
+                seen += bucket
+                if seen >= rank and bucket:
+                    if index == len(self.bounds):
+                        return self.max
+                    return min(self.bounds[index], self.max)
+            return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dictionary with count, mean, p50, p90, p99 and max
+        """
+        with self.lock:
+            count, total, maximum = self.count, self.total, self.max
+        return {
+            "count": count,
+            "mean": total / count if count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": maximum,
+        }
+
+
+class TrackerMetrics:
+    """
+    Instrumentation shared by the tracker's threads.
+
+    Histograms:
+    - track_event_us: time spent in track_event (every sample_every-th call)
+    - queue_wait_ms: time the oldest record of each group waited in the queue
+    - spool_commit_ms: time to append and fsync a group
+    - batch_size: events per insert
+    - insert_ms: insert latency
+
+    Counters: inserts, insert failures (each one causes a retry) and
+    rewound batches; gauges: maximum spool depth seen.
+    """
+
+    def __init__(self, sample_every: int = 64):
+        """
+        Initialize the metrics.
+
+        Args:
+            sample_every: Time one in this many track_event calls
+        """
+        self.sample_every = sample_every
+        self.track_event_us = Histogram()
+        self.queue_wait_ms = Histogram()
+        self.spool_commit_ms = Histogram()
+        self.batch_size = Histogram([1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000])
+        self.insert_ms = Histogram()
+
+        self.lock = threading.Lock()
+        self.inserts = 0
+        self.insert_failures = 0
+        self.rewound_batches = 0
+        self.max_spool_depth = 0
+
+    def record_insert(self, events: int, latency_ms: float, delivered: bool):
+        """
+        Record one insert.
+
+        Args:
+            events: Batch size
+            latency_ms: Insert latency in milliseconds
+            delivered: Whether the insert succeeded
+        """
+        self.batch_size.observe(events)
+        self.insert_ms.observe(latency_ms)
+        with self.lock:
+            self.inserts += 1
+            if not delivered:
+                self.insert_failures += 1
+
+    def record_rewind(self, batches: int):
+        """
+        Record batches returned to the spool after a failed insert.
+
+        Args:
+            batches: Number of batches re-read later
+        """
+        with self.lock:
+            self.rewound_batches += batches
+
+    def record_spool_depth(self, depth: int):
+        """
+        Record the current spool depth.
+
+        Args:
+            depth: Events waiting in the spool
+        """
+        if depth > self.max_spool_depth:
+            self.max_spool_depth = depth
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Summarize all metrics.
+
+        Returns:
+            Dictionary of histogram summaries and counters
+        """
+        with self.lock:
+            counters = {
+                "inserts": self.inserts,
+                "insert_failures": self.insert_failures,
+                "rewound_batches": self.rewound_batches,
+                "max_spool_depth": self.max_spool_depth,
+            }
+        return {
+            "track_event_us": self.track_event_us.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "spool_commit_ms": self.spool_commit_ms.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+            "insert_ms": self.insert_ms.snapshot(),
+            **counters,
+        }
+
+
+def format_stats(stats: dict) -> str:
+    """
+    Format tracker statistics as one log line.
+
+    Args:
+        stats: Result of ClickstreamTracker.get_stats()
+
+    Returns:
+        Log line
+    """
+    metrics = stats["metrics"]
+    return (
+        f"clickstream: queue={stats['queue_size']} spool={stats['buffer_size']} "
+        f"in_flight={stats['in_flight']} batch_size={stats['batch_size']} "
+        f"track_event_p99={metrics['track_event_us']['p99']:.1f}us "
+        f"queue_wait_p99={metrics['queue_wait_ms']['p99']:.0f}ms "
+        f"insert_p50={metrics['insert_ms']['p50']:.0f}ms "
+        f"insert_p99={metrics['insert_ms']['p99']:.0f}ms "
+        f"inserts={metrics['inserts']} failures={metrics['insert_failures']} "
+        f"dropped={stats['dropped_total'] + stats['spool_dropped'] + stats['shutdown_dropped']}"
+    )
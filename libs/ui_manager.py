@@ -3,7 +3,8 @@ UIManager class for Half-Life VOX TimeLEFT application.
 Handles all GUI creation, updates, and event callbacks.
 """
 
-import os
+import functools
+import threading
 import dearpygui.dearpygui as dpg
 from typing import Callable, Optional
 
@@ -12,6 +13,26 @@ from libs.asset_manager import AssetManager
 from libs.timer import Timer
 from libs.audio_manager import AudioManager
 from libs.clickstream_tracker import ClickstreamTracker
+from libs.event_bus import DELIVERY_RENDER, EventBus
+from libs.skybox import SkyboxPanorama
+from libs.crossfade import BackgroundCrossfade
+from libs import tracing
+
+
+def _traced_callback(func: Callable) -> Callable:
+    """
+    Record each call of a DearPyGUI callback as a span.
+
+    The wrapper keeps the (sender, app_data, user_data) parameters because
+    DearPyGUI counts a callback's parameters to decide what to pass.
+    """
+    name = "ui." + func.__name__.replace("_callback_", "", 1)
+
+    @functools.wraps(func)
+    def wrapper(self, sender=None, app_data=None, user_data=None):
+        with tracing.span(name, "ui"):
+            return func(self, sender, app_data, user_data)
+    return wrapper
 
 
 class UIManager:
@@ -22,7 +43,8 @@ class UIManager:
         asset_manager: AssetManager,
         audio_manager: AudioManager,
         timer: Timer,
-        clickstream_tracker: ClickstreamTracker
+        clickstream_tracker: ClickstreamTracker,
+        event_bus: Optional[EventBus] = None
     ):
         """
         Initialize the UI manager.
@@ -32,15 +54,28 @@ class UIManager:
             audio_manager: AudioManager instance
             timer: Timer instance
             clickstream_tracker: ClickstreamTracker instance
+            event_bus: EventBus whose render-thread subscribers are pumped
+                every frame (optional)
         """
         self.asset_manager = asset_manager
         self.audio_manager = audio_manager
         self.timer = timer
         self.clickstream_tracker = clickstream_tracker
+        self.event_bus = event_bus
 
         # UI state
         self.bg_texture_path = None
         self.large_font = None
+        self.texture_width = None
+        self.texture_height = None
+        self.panorama = None
+        self.panorama_enabled = False
+        self.crossfade = None
+        self.displayed_texture = None
+
+        # Background change requested by a callback, applied on the render thread
+        self._pending_lock = threading.Lock()
+        self._pending_background = None
 
     def initialize_gui(self):
         """Initialize DearPyGUI context and create all GUI elements."""
@@ -49,10 +84,15 @@ class UIManager:
         # Load initial background texture
         self.bg_texture_path = self.asset_manager.get_background_texture_path()
         width, height, channels, data = dpg.load_image(self.bg_texture_path)
+        self.texture_width = width
+        self.texture_height = height
+        self.panorama = SkyboxPanorama(self.asset_manager, width, height)
+        self.crossfade = BackgroundCrossfade(width, height)
+        self.displayed_texture = self.crossfade.load(self.bg_texture_path)
 
         # Register assets
         self._register_fonts()
-        self._register_textures(width, height, data)
+        self._register_textures(width, height, self.displayed_texture)
         self._create_drawlist()
         self._create_main_window()
         self._setup_viewport()
@@ -76,7 +116,8 @@ class UIManager:
             dpg.draw_image(
                 Config.IMAGE_TAG,
                 pmin=(0, 0),
-                pmax=(Config.IMAGE_WIDTH, Config.IMAGE_HEIGHT)
+                pmax=(Config.IMAGE_WIDTH, Config.IMAGE_HEIGHT),
+                tag=Config.BG_IMAGE_TAG
             )
 
             bg_name = self.bg_texture_path.rsplit('/', 1)[-1]
@@ -84,7 +125,8 @@ class UIManager:
                 text=bg_name,
                 pos=(2, Config.IMAGE_HEIGHT - 15),
                 size=14,
-                color=(255, 255, 255, 255)
+                color=(255, 255, 255, 255),
+                tag=Config.BG_LABEL_TAG
             )
 
     def _create_main_window(self):
@@ -95,7 +137,13 @@ class UIManager:
 
             # Background selection group
             with dpg.group(horizontal=False):
-                dpg.add_text("Select Background")
+                with dpg.group(horizontal=True):
+                    dpg.add_text("Select Background")
+                    dpg.add_checkbox(
+                        label="Pan",
+                        tag=Config.PANORAMA_TAG,
+                        callback=self._callback_panorama
+                    )
                 bg_options = ["Random"] + self.asset_manager.get_background_names()
                 dpg.add_combo(
                     tag=Config.BACKGROUND_TAG,
@@ -184,6 +232,7 @@ class UIManager:
         dpg.set_primary_window("Timer Window", True)
 
     # Callback methods
+    @_traced_callback
     def _callback_start(self, sender, app_data, user_data):
         """Callback for start button."""
         # Track click
@@ -204,6 +253,7 @@ class UIManager:
         if not self.timer.start(input_value):
             dpg.set_value(Config.TIMER_TAG, "Invalid time")
 
+    @_traced_callback
     def _callback_pause(self, sender, app_data, user_data):
         """Callback for pause button."""
         # Track click
@@ -223,6 +273,7 @@ class UIManager:
         label = "Resume" if self.timer.is_paused else "Pause"
         dpg.set_item_label(Config.PAUSE_TAG, label)
 
+    @_traced_callback
     def _callback_reset(self, sender, app_data, user_data):
         """Callback for reset button."""
         # Track click
@@ -235,6 +286,7 @@ class UIManager:
         self.timer.reset()
         dpg.set_value(Config.TIMER_TAG, "00:00:00")
 
+    @_traced_callback
     def _callback_timeleft(self, sender, app_data, user_data):
         """Callback for time-left button."""
         # Get remaining time
@@ -253,6 +305,7 @@ class UIManager:
         # Play announcement
         self.audio_manager.play_timeleft_async(remaining_time)
 
+    @_traced_callback
     def _callback_shootgun(self, sender, app_data, user_data):
         """Callback for shoot gun button."""
         gun_prefix = dpg.get_value(Config.GUN_TAG)
@@ -266,6 +319,7 @@ class UIManager:
 
         self.audio_manager.play_shootgun_async(gun_prefix)
 
+    @_traced_callback
     def _callback_weapon_select(self, sender, app_data, user_data):
         """Callback for weapon selection."""
         selected_gun = dpg.get_value(Config.GUN_TAG)
@@ -279,6 +333,7 @@ class UIManager:
 
         self.audio_manager.play_weapon_deploy_async(selected_gun)
 
+    @_traced_callback
     def _callback_change_bg(self, sender, app_data, user_data):
         """Callback for background selection dropdown."""
         selected_bg = dpg.get_value(Config.BACKGROUND_TAG)
@@ -301,35 +356,122 @@ class UIManager:
 
         bg_texture_name = bg_texture_path.rsplit('/', 1)[-1]
 
-        if not os.path.isfile(bg_texture_path):
+        if not self.asset_manager.has_file(bg_texture_path):
             print(f"Image not found: {bg_texture_path}")
             return
 
-        # Update texture
-        width, height, channels, data = dpg.load_image(bg_texture_path)
-        dpg.set_value(Config.IMAGE_TAG, data)
-        dpg.configure_item(
-            Config.IMAGE_TAG,
-            width=Config.IMAGE_WIDTH,
-            height=Config.IMAGE_HEIGHT
-        )
+        with tracing.span("ui.load_background", "ui", file=bg_texture_name):
+            target = self.crossfade.load(bg_texture_path)
+        if target is None:
+            print(f"Could not load image: {bg_texture_path}")
+            return
 
-        # Clear and redraw drawlist
-        dpg.delete_item(Config.DRAWLIST_TAG, children_only=True)
-        dpg.draw_image(
-            Config.IMAGE_TAG,
-            pmin=(0, 0),
-            pmax=(Config.IMAGE_WIDTH, Config.IMAGE_HEIGHT),
-            parent=Config.DRAWLIST_TAG
-        )
-        dpg.draw_text(
-            text=bg_texture_name,
-            pos=(2, Config.IMAGE_HEIGHT - 15),
-            size=14,
-            color=(255, 255, 255, 255),
-            parent=Config.DRAWLIST_TAG
+        # Update label in place
+        self.bg_texture_path = bg_texture_path
+        dpg.configure_item(Config.BG_LABEL_TAG, text=bg_texture_name)
+
+        # Keep panning if the new background is part of a full skybox
+        if dpg.get_value(Config.PANORAMA_TAG):
+            self._enable_panorama()
+        else:
+            self._request_background(target=target)
+
+    @_traced_callback
+    def _callback_panorama(self, sender, app_data, user_data):
+        """Callback for skybox panorama checkbox."""
+        enabled = dpg.get_value(Config.PANORAMA_TAG)
+
+        # Track toggle
+        self.clickstream_tracker.track_event(
+            "panorama_toggle",
+            "panorama_checkbox",
+            {"enabled": enabled}
         )
 
+        # Play sound
+        self.audio_manager.play_sound_async(self.audio_manager.bg_sound)
+
+        if enabled:
+            self._enable_panorama()
+        else:
+            self._disable_panorama()
+
+    def _enable_panorama(self):
+        """Start panning across the skybox of the current background."""
+        bg_name = self.bg_texture_path.rsplit('/', 1)[-1]
+        skybox_name = SkyboxPanorama.skybox_name(bg_name)
+
+        complete = self.panorama.is_complete(skybox_name)
+        panorama = None
+        if complete and skybox_name != self.panorama.name:
+            # Projected here, off the render thread, which only swaps it in
+            panorama = self.panorama.prepare(skybox_name)
+            complete = panorama is not None
+        if not complete:
+            print(f"No complete skybox for background: {bg_name}")
+            self._disable_panorama()
+            return
+
+        self._request_background(skybox=(skybox_name, panorama))
+
+    def _disable_panorama(self):
+        """Stop panning and fade back to the static background image."""
+        dpg.set_value(Config.PANORAMA_TAG, False)
+        self._request_background(target=self.crossfade.load(self.bg_texture_path))
+
+    def _request_background(self, target=None, skybox=None):
+        """
+        Hand a background change to the render thread.
+
+        Callbacks run on DearPyGUI's callback thread while _update_frame
+        steps the crossfade and panorama buffers, so callbacks only decode
+        images and leave a request here; a newer request replaces one not
+        yet applied.
+
+        Args:
+            target: Texture data of a static background to fade to
+            skybox: (name, map from SkyboxPanorama.prepare(), or None if
+                that skybox is already loaded) to pan across instead
+        """
+        with self._pending_lock:
+            self._pending_background = (target, skybox)
+
+    def _apply_background_request(self):
+        """Start the fade for a pending background change (render thread)."""
+        with self._pending_lock:
+            request, self._pending_background = self._pending_background, None
+        if request is None:
+            return
+
+        target, skybox = request
+        if skybox is None:
+            self.panorama_enabled = False
+            if target is not None and target is not self.displayed_texture:
+                self.crossfade.start(self.displayed_texture, target)
+            return
+
+        name, panorama = skybox
+        if panorama is not None:
+            self.panorama.show(name, panorama)
+        # The displayed texture may be the panorama's own frame buffer
+        self.panorama_enabled = True
+        self.crossfade.capture(self.displayed_texture)
+        self.crossfade.fade_to(self.panorama.render(force=True))
+
+    def _update_frame(self):
+        """Per-frame texture updates that run on the render thread."""
+        self._apply_background_request()
+        if self.crossfade.active:
+            frame = self.crossfade.step()
+        elif self.panorama_enabled:
+            frame = self.panorama.render()
+        else:
+            return
+
+        if frame is not None:
+            dpg.set_value(Config.IMAGE_TAG, frame)
+            self.displayed_texture = frame
+
     def update_timer_display(self, time_str: str):
         """
         Update timer display with new time.
@@ -342,7 +484,12 @@ class UIManager:
     def start(self):
         """Show viewport and start the DearPyGUI event loop."""
         dpg.show_viewport()
-        dpg.start_dearpygui()
+        while dpg.is_dearpygui_running():
+            with tracing.span("ui.frame", "render"):
+                if self.event_bus is not None:
+                    self.event_bus.pump(DELIVERY_RENDER)
+                self._update_frame()
+                dpg.render_dearpygui_frame()
 
     def shutdown(self):
         """Shutdown and destroy DearPyGUI context."""
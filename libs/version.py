@@ -1,20 +1,31 @@
 """
 Version management for HL-VOX-TimeLEFT.
 
-Reads version from pyproject.toml to ensure single source of truth.
+Reads the installed package version through importlib.metadata, falling
+back to pyproject.toml in a source checkout that is not installed.
 """
 
+from functools import lru_cache
+from importlib import metadata
 from pathlib import Path
 import re
 
+PACKAGE_NAME = "hl-vox-timeleft"
 
+
+@lru_cache(maxsize=None)
 def get_version() -> str:
     """
-    Get application version from pyproject.toml.
+    Get application version.
 
     Returns:
         Version string (e.g., "0.1.0")
     """
+    try:
+        return metadata.version(PACKAGE_NAME)
+    except metadata.PackageNotFoundError:
+        pass
+
     pyproject_path = Path(__file__).parent.parent / "pyproject.toml"
 
     try:
@@ -35,5 +46,8 @@ def get_version() -> str:
         return "unknown"
 
 
-# Cache version for performance
-__version__ = get_version()
+def __getattr__(name):
+    """Resolve __version__ on first access rather than at import."""
+    if name == "__version__":
+        return get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
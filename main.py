@@ -11,9 +11,71 @@ into a well-structured object-oriented architecture with the following component
 - AudioManager: Sound playback and sequences
 - UIManager: GUI creation and event handling
 - Application: Component orchestration and lifecycle management
+
+Usage:
+    python main.py                     # Run the timer (attaches to a running daemon)
+    python main.py --profile-startup   # Report import and init times
+    python main.py --trace trace.json  # Record a Chrome/Perfetto trace of the session
+    python main.py --headless 00:25:00 # Terminal countdown with VOX audio, no GUI
+    python main.py --daemon            # Shared timer daemon (control: python -m libs.daemon_client)
 """
 
-from libs.application import main
+import argparse
+import sys
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Half-Life VOX TimeLEFT")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report per-module import time and per-phase init time, then exit"
+    )
+    parser.add_argument(
+        "--headless",
+        nargs="?",
+        const="",
+        metavar="HH:MM:SS",
+        help="Run the countdown in the terminal without the GUI (default 00:30:00)"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run the timer, audio and tracker as a daemon controlled over a Unix socket"
+    )
+    parser.add_argument(
+        "--no-tracking",
+        action="store_true",
+        help="Do not record clickstream events in headless or daemon mode"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Record spans from UI callbacks, audio, timer and tracker to a Chrome trace file"
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
+    args = parse_args()
+
+    if args.profile_startup:
+        from libs.startup_profiler import profile_startup
+        sys.exit(profile_startup())
+
+    if args.trace:
+        from libs import tracing
+        tracing.enable(args.trace)
+
+    if args.daemon:
+        from libs.daemon import main as daemon_main
+        sys.exit(daemon_main(["--no-tracking"] if args.no_tracking else []))
+
+    if args.headless is not None:
+        # Never imports dearpygui
+        from libs.headless import main as headless_main
+        sys.exit(headless_main(args.headless or None, tracking=not args.no_tracking))
+
+    from libs.application import main
     main()
@@ -15,6 +15,8 @@ Requirements:
 from google.cloud import bigquery
 from google.api_core import exceptions
 
+from libs.clickstream_schema import CLUSTERING_FIELDS, PARTITION_FIELD, bigquery_schema
+
 
 def setup_bigquery_clickstream(
     project_id: str = "experiment-476518",
@@ -50,23 +52,8 @@ def setup_bigquery_clickstream(
         print(f"✗ Error creating dataset: {e}")
         return False
 
-    # Define table schema
-    schema = [
-        bigquery.SchemaField("user_id", "STRING", mode="REQUIRED",
-                           description="Hashed machine identifier for user tracking"),
-        bigquery.SchemaField("session_id", "STRING", mode="REQUIRED",
-                           description="UUID identifying the application session"),
-        bigquery.SchemaField("app_version", "STRING", mode="REQUIRED",
-                           description="Application version (SemVer format)"),
-        bigquery.SchemaField("timestamp", "TIMESTAMP", mode="REQUIRED",
-                           description="Event timestamp (UTC)"),
-        bigquery.SchemaField("event_type", "STRING", mode="REQUIRED",
-                           description="Type of event (e.g., button_click, timer_start)"),
-        bigquery.SchemaField("component", "STRING", mode="REQUIRED",
-                           description="UI component that triggered the event"),
-        bigquery.SchemaField("metadata", "STRING", mode="NULLABLE",
-                           description="Additional event metadata (JSON string)"),
-    ]
+    # Table schema shared with the clickstream uploaders
+    schema = bigquery_schema()
 
     # Create table
     table_ref = f"{project_id}.{dataset_id}.{table_id}"
@@ -76,11 +63,11 @@ def setup_bigquery_clickstream(
     # Set partitioning by day on timestamp for better query performance
     table.time_partitioning = bigquery.TimePartitioning(
         type_=bigquery.TimePartitioningType.DAY,
-        field="timestamp"
+        field=PARTITION_FIELD
     )
 
     # Set clustering for better performance
-    table.clustering_fields = ["user_id", "session_id", "event_type"]
+    table.clustering_fields = CLUSTERING_FIELDS
 
     try:
         table = client.create_table(table, exists_ok=True)